@@ -0,0 +1,116 @@
+import multiprocessing as mp
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from config.settings import SENTIMENT_CHUNK_SIZE, SENTIMENT_WORKERS
+
+# One analyzer per worker process, built once by the pool initializer
+_worker_analyzer = None
+
+
+def _init_worker() -> None:
+    global _worker_analyzer
+    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+    _worker_analyzer = SentimentIntensityAnalyzer()
+
+
+def _score_chunk(texts: List[str]) -> List[float]:
+    if _worker_analyzer is None:
+        _init_worker()
+    return [_worker_analyzer.polarity_scores(text)["compound"] for text in texts]
+
+
+def _chunks(iterable: Iterable, size: int) -> Iterator[List]:
+    it = iter(iterable)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class BulkSentimentScorer:
+    """
+    Streams VADER compound scores for large numbers of texts through a process pool.
+
+    Texts are read lazily from any iterable in chunks of `chunk_size`; at most
+    `max_pending` chunks are in flight, so memory stays bounded no matter how
+    long the input is. Scores come back in input order as soon as each chunk is
+    done. With workers=0 everything is scored in the calling process.
+
+        with BulkSentimentScorer(workers=4) as scorer:
+            for score in scorer.score(headlines):
+                ...
+    """
+
+    def __init__(
+        self,
+        workers: int = SENTIMENT_WORKERS,
+        chunk_size: int = SENTIMENT_CHUNK_SIZE,
+        max_pending: Optional[int] = None
+    ):
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.max_pending = max_pending or 2 * max(workers, 1)
+        self._executor: Optional[Executor] = None
+
+    def __enter__(self) -> "BulkSentimentScorer":
+        if self.workers > 0:
+            # spawn: the dashboard process may already hold TensorFlow threads
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=mp.get_context("spawn"),
+                initializer=_init_worker
+            )
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    def score(self, texts: Iterable[str]) -> Iterator[float]:
+        """Compound score for each text, in order."""
+        chunks = _chunks(("" if text is None else str(text) for text in texts), self.chunk_size)
+        if self._executor is None:
+            for chunk in chunks:
+                yield from _score_chunk(chunk)
+            return
+
+        pending = deque()
+        for chunk in chunks:
+            pending.append(self._executor.submit(_score_chunk, chunk))
+            if len(pending) >= self.max_pending:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+    def score_records(self, records: Iterable[Dict], text_key: str = "title") -> Iterator[Dict]:
+        """
+        Adds a "sentiment" key to each record (e.g. articles or tweets) from its
+        `text_key` field, yielding records in order.
+        """
+        buffered = deque()
+
+        def texts():
+            for record in records:
+                buffered.append(record)
+                yield record.get(text_key) or ""
+
+        for score in self.score(texts()):
+            record = buffered.popleft()
+            yield {**record, "sentiment": score}
+
+
+def score_texts(texts: Iterable[str], workers: int = SENTIMENT_WORKERS, chunk_size: int = SENTIMENT_CHUNK_SIZE) -> Iterator[float]:
+    """
+    One-off streaming scorer: starts a pool, yields scores in order and shuts it down.
+    """
+    with BulkSentimentScorer(workers=workers, chunk_size=chunk_size) as scorer:
+        yield from scorer.score(texts)
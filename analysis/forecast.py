@@ -1,46 +1,262 @@
+"""
+Batch LSTM + Prophet forecasts for a ticker universe.
+
+    python -m analysis.forecast --universe all --days 30 --workers 4
+    python -m analysis.forecast --tickers AAPL MSFT --models prophet --update
+
+Tickers are spread over a process pool. Each worker caps its TensorFlow and
+BLAS threads (--threads-per-worker) so workers x threads stays within the
+cores available. Results go to the forecast store (data.forecast_store), and
+each run's per-ticker status and timings are saved next to them. A failure in
+one ticker or model never stops the others.
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, List, Sequence
+
 import pandas as pd
-import matplotlib.pyplot as plt
-from models.lstm_model import forecast_next_days
-from models.prophet_model import forecast_prophet
-
-# Load historical price data
-price_df = pd.read_csv("data/price_data.csv", parse_dates=["Date"], index_col="Date")
-price_series = price_df["Close"]
-
-# Forecast parameters
-MODEL_PATH_LSTM = "models/lstm_model.h5"
-MODEL_PATH_PROPHET = "models/prophet_model.pkl"
-FORECAST_DAYS = 30
-
-# Generate LSTM forecast
-lstm_forecast = forecast_next_days(
-    price_series=price_series,
-    model_path=MODEL_PATH_LSTM,
-    days=FORECAST_DAYS
-)
 
-# Generate Prophet forecast
-prophet_df = forecast_prophet(
-    price_series=price_series,
-    days=FORECAST_DAYS,
-    model_path=MODEL_PATH_PROPHET
+from config.settings import (
+    CRYPTO_TICKERS,
+    FORECAST_DAYS,
+    FORECAST_THREADS_PER_WORKER,
+    LSTM_WINDOW_SIZE,
+    STOCK_TICKERS,
 )
-prophet_forecast = prophet_df["yhat"].values
-prophet_dates = prophet_df["ds"]
-
-# Align dates for LSTM forecast
-forecast_start_date = price_series.index[-1] + pd.Timedelta(days=1)
-lstm_dates = pd.date_range(start=forecast_start_date, periods=FORECAST_DAYS, freq="D")
-
-# Plot comparison
-plt.figure(figsize=(12, 6))
-plt.plot(price_series, label="Historical", color="black")
-plt.plot(prophet_dates, prophet_forecast, label="Prophet Forecast", linestyle="--", color="blue")
-plt.plot(lstm_dates, lstm_forecast, label="LSTM Forecast", linestyle="--", color="green")
-plt.title("LSTM vs. Prophet Forecast Comparison")
-plt.xlabel("Date")
-plt.ylabel("Price")
-plt.legend()
-plt.grid(True)
-plt.tight_layout()
-plt.show()
+
+MODELS = ("lstm", "prophet")
+THREAD_ENV_VARS = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS", "NUMEXPR_NUM_THREADS")
+
+
+def _init_worker(threads: int) -> None:
+    """
+    Caps this worker's threads, in its own environment only. TensorFlow is
+    imported later by the models and reads the variables. numpy's BLAS and
+    OpenMP pools are already loaded (a spawned worker imports the parent's
+    __main__ and this module before the initializer runs), so they are
+    capped through threadpoolctl instead.
+    """
+    import logging
+
+    from threadpoolctl import threadpool_limits
+
+    for var in THREAD_ENV_VARS:
+        os.environ[var] = str(threads)
+    os.environ["TF_NUM_INTRAOP_THREADS"] = str(threads)
+    os.environ["TF_NUM_INTEROP_THREADS"] = "1"
+    os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "2")
+    threadpool_limits(threads)
+    logging.getLogger("cmdstanpy").setLevel(logging.WARNING)
+
+
+def _lstm_forecast(ticker: str, series: pd.Series, days: int, window_size: int, train: bool) -> pd.Series:
+    from models.lstm_model import forecast_next_days
+    from models.lstm_registry import fresh_version, latest_version
+
+    # Under the ticker's registry lock, so concurrent batches train it once
+    version = fresh_version(ticker, series, window_size) if train else latest_version(ticker, window_size)
+    if version is None:
+        raise RuntimeError("no trained LSTM model (run with --train)")
+
+    values = forecast_next_days(series, version.model_path, days=days, window_size=window_size)
+    index = pd.date_range(series.index[-1] + pd.Timedelta(days=1), periods=days, freq="D")
+    return pd.Series(values, index=index, name="lstm")
+
+
+def _prophet_forecast(ticker: str, series: pd.Series, days: int) -> pd.DataFrame:
+    from models.prophet_model import get_prophet_model, predict_horizon
+
+    forecast = predict_horizon(get_prophet_model(ticker, series), days)
+    return forecast.set_index("ds").rename(
+        columns={"yhat": "prophet", "yhat_lower": "prophet_lower", "yhat_upper": "prophet_upper"}
+    )
+
+
+def forecast_ticker(
+    ticker: str,
+    days: int = FORECAST_DAYS,
+    models: Sequence[str] = MODELS,
+    window_size: int = LSTM_WINDOW_SIZE,
+    train: bool = False,
+    update: bool = False
+) -> Dict:
+    """
+    Runs the requested models for one ticker and writes the forecast store.
+    Returns {ticker, status, errors, timings}; never raises.
+    """
+    from data.forecast_store import write_forecast
+    from data.price_store import needs_update, read_prices, update_prices
+
+    result = {"ticker": ticker, "status": "ok", "errors": {}, "timings": {}}
+    start = time.perf_counter()
+    try:
+        df = read_prices(ticker)
+        if update and needs_update(df):
+            df = update_prices(ticker)
+        series = df["Close"].dropna()
+        if series.empty:
+            raise ValueError("no stored prices")
+    except Exception as e:
+        result.update(status="failed", errors={"prices": repr(e)})
+        result["timings"]["total"] = round(time.perf_counter() - start, 3)
+        return result
+    result["timings"]["prices"] = round(time.perf_counter() - start, 3)
+
+    columns = []
+    for name in models:
+        model_start = time.perf_counter()
+        try:
+            if name == "lstm":
+                columns.append(_lstm_forecast(ticker, series, days, window_size, train))
+            elif name == "prophet":
+                columns.append(_prophet_forecast(ticker, series, days))
+            else:
+                raise ValueError(f"unknown model {name!r}")
+        except Exception as e:
+            result["errors"][name] = repr(e)
+        result["timings"][name] = round(time.perf_counter() - model_start, 3)
+
+    if columns:
+        forecast = pd.concat(columns, axis=1)
+        forecast["generated_at"] = datetime.utcnow().isoformat()
+        write_forecast(ticker, forecast)
+    if result["errors"]:
+        result["status"] = "partial" if columns else "failed"
+    result["timings"]["total"] = round(time.perf_counter() - start, 3)
+    return result
+
+
+def run_batch(
+    tickers: Sequence[str],
+    days: int = FORECAST_DAYS,
+    models: Sequence[str] = MODELS,
+    workers: int = None,
+    threads_per_worker: int = FORECAST_THREADS_PER_WORKER,
+    window_size: int = LSTM_WINDOW_SIZE,
+    train: bool = False,
+    update: bool = False,
+    progress: bool = True
+) -> Dict:
+    """
+    Forecasts all tickers on a process pool and returns the run report.
+    """
+    from tqdm import tqdm
+
+    from data.forecast_store import write_run_report
+
+    tickers = list(dict.fromkeys(t.upper() for t in tickers))
+    if workers is None:
+        workers = max(1, (os.cpu_count() or 1) // max(threads_per_worker, 1))
+    workers = max(1, min(workers, len(tickers)))
+
+    report = {
+        "started_at": datetime.utcnow().isoformat(timespec="seconds"),
+        "days": days,
+        "models": list(models),
+        "workers": workers,
+        "threads_per_worker": threads_per_worker,
+        "tickers": {},
+    }
+    start = time.perf_counter()
+    # spawn: each worker imports TensorFlow fresh, after its initializer has set the thread caps
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(threads_per_worker,),
+    ) as executor:
+        futures = {
+            executor.submit(forecast_ticker, ticker, days, models, window_size, train, update): ticker
+            for ticker in tickers
+        }
+        for future in tqdm(as_completed(futures), total=len(futures), desc="forecasting", disable=not progress):
+            ticker = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # Only a crashed worker process ends up here
+                result = {"ticker": ticker, "status": "failed", "errors": {"worker": repr(e)}, "timings": {}}
+            report["tickers"][ticker] = result
+
+    report["elapsed"] = round(time.perf_counter() - start, 3)
+    report["report_path"] = write_run_report(report)
+    return report
+
+
+def plot_comparison(price_series: pd.Series, forecast: pd.DataFrame):
+    """
+    Historical prices with the stored LSTM and Prophet forecasts for one ticker.
+    The figure is built without pyplot, so it is not kept in pyplot's figure
+    registry and is freed with its last reference.
+    """
+    from matplotlib.figure import Figure
+    from plots.downsample import downsample, figure_width_px
+
+    fig = Figure(figsize=(12, 6))
+    ax = fig.subplots()
+    # Long histories are thinned to the figure's pixel width before drawing
+    ax.plot(downsample(price_series, figure_width_px(fig)), label="Historical", color="black")
+    if "prophet" in forecast:
+        ax.plot(forecast.index, forecast["prophet"], label="Prophet Forecast", linestyle="--", color="blue")
+    if "lstm" in forecast:
+        ax.plot(forecast.index, forecast["lstm"], label="LSTM Forecast", linestyle="--", color="green")
+    ax.set_title("LSTM vs. Prophet Forecast Comparison")
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Price")
+    ax.legend()
+    ax.grid(True)
+    fig.tight_layout()
+    return fig
+
+
+def _print_report(report: Dict) -> None:
+    results: List[Dict] = sorted(report["tickers"].values(), key=lambda r: r["ticker"])
+    print(f"{'ticker':<10} {'status':<8} " + " ".join(f"{m:>8}" for m in report["models"]) + f" {'total':>8}")
+    for r in results:
+        times = " ".join(f"{r['timings'].get(m, float('nan')):>8.2f}" for m in report["models"])
+        print(f"{r['ticker']:<10} {r['status']:<8} {times} {r['timings'].get('total', float('nan')):>8.2f}")
+        for source, error in r["errors"].items():
+            print(f"{'':<10} {source}: {error}")
+    ok = sum(r["status"] == "ok" for r in results)
+    print(f"{ok}/{len(results)} tickers ok in {report['elapsed']:.1f}s with {report['workers']} workers")
+    print(f"report: {report['report_path']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickers", nargs="*", default=[])
+    parser.add_argument("--universe", choices=["stocks", "crypto", "all"])
+    parser.add_argument("--days", type=int, default=FORECAST_DAYS)
+    parser.add_argument("--models", nargs="+", choices=MODELS, default=list(MODELS))
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--threads-per-worker", type=int, default=FORECAST_THREADS_PER_WORKER)
+    parser.add_argument("--window-size", type=int, default=LSTM_WINDOW_SIZE)
+    parser.add_argument("--train", action="store_true", help="train LSTM models that are missing or stale")
+    parser.add_argument("--update", action="store_true", help="refresh stored prices before forecasting")
+    args = parser.parse_args()
+
+    tickers = list(args.tickers)
+    if args.universe in ("stocks", "all"):
+        tickers += STOCK_TICKERS
+    if args.universe in ("crypto", "all"):
+        tickers += CRYPTO_TICKERS
+    if not tickers:
+        parser.error("give --tickers and/or --universe")
+
+    report = run_batch(
+        tickers,
+        days=args.days,
+        models=args.models,
+        workers=args.workers,
+        threads_per_worker=args.threads_per_worker,
+        window_size=args.window_size,
+        train=args.train,
+        update=args.update,
+    )
+    _print_report(report)
+    sys.exit(0 if any(r["status"] != "failed" for r in report["tickers"].values()) else 1)
@@ -1,13 +1,26 @@
+from typing import Tuple
+
 import pandas as pd
 import ta
 import streamlit as st
 
-def add_indicators(df: pd.DataFrame) -> pd.DataFrame:
+from config.settings import LEAN_MEMORY
+from utils.memory import lean_frame
+
+INDICATOR_COLUMNS = [
+    "SMA_20", "SMA_50", "EMA_20", "MACD", "RSI",
+    "BB_upper", "BB_lower", "ADX", "CCI", "MFI"
+]
+
+
+def prepare_price_columns(df: pd.DataFrame, copy: bool = True) -> Tuple[pd.DataFrame, bool]:
     """
-    Adds technical indicators to a price DataFrame.
-    Requires columns: 'Open', 'High', 'Low', 'Close' (or 'Adj Close' or 'Price'), and 'Volume'.
+    Returns a copy of `df` with numeric 'Open', 'High', 'Low', 'Close' and 'Volume'
+    columns, and whether indicators can be computed on it (False if no close column).
+    With copy=False `df` itself is fixed up, for callers that own the frame.
     """
-    df = df.copy()
+    if copy:
+        df = df.copy()
     
     # Ensure we have a valid 'Close' column
     if 'Close' not in df.columns:
@@ -17,7 +30,7 @@ def add_indicators(df: pd.DataFrame) -> pd.DataFrame:
             df['Close'] = df['Price']
         else:
             st.warning("No 'Close', 'Adj Close', or 'Price' column found.")
-            return df
+            return df, False
 
     # Define required numeric columns
     numeric_columns = ["Open", "High", "Low", "Close", "Volume"]
@@ -42,9 +55,24 @@ def add_indicators(df: pd.DataFrame) -> pd.DataFrame:
         # Optionally return df early if you don't want to compute indicators on fallback data
         # return df
 
-    # Convert required columns to numeric (safeguard)
+    # Convert required columns to numeric (safeguard); numeric columns are left as they are
     for col in numeric_columns:
-        df[col] = pd.to_numeric(df[col], errors="coerce")
+        if not pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+
+    return df, True
+
+
+def add_indicators(df: pd.DataFrame, inplace: bool = False, lean: bool = LEAN_MEMORY) -> pd.DataFrame:
+    """
+    Adds technical indicators to a price DataFrame.
+    Requires columns: 'Open', 'High', 'Low', 'Close' (or 'Adj Close' or 'Price'), and 'Volume'.
+    With inplace=True the columns are added to `df` itself instead of a copy;
+    with lean=True float columns are stored as float32.
+    """
+    df, ok = prepare_price_columns(df, copy=not inplace)
+    if not ok:
+        return df
 
     # Compute technical indicators
     df["SMA_20"] = ta.trend.sma_indicator(df["Close"], window=20)
@@ -63,5 +91,5 @@ def add_indicators(df: pd.DataFrame) -> pd.DataFrame:
     df["CCI"] = ta.trend.cci(df["High"], df["Low"], df["Close"], window=20)
     df["MFI"] = ta.volume.money_flow_index(df["High"], df["Low"], df["Close"], df["Volume"], window=14)
 
-    return df
+    return lean_frame(df) if lean else df
 
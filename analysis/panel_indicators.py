@@ -0,0 +1,296 @@
+"""
+Vectorized versions of the `add_indicators` indicators for a whole universe at once.
+
+Every kernel takes 2D float arrays shaped (tickers, bars) and returns arrays of
+the same shape. Bars a ticker does not have (shorter histories) are NaN; windows
+only produce a value once they hold `window` valid bars, matching the
+`min_periods=window` behaviour of `ta`. Recursive indicators (EMA, RSI, ADX) are
+solved a block of bars at a time for all tickers together.
+"""
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from analysis.indicators import INDICATOR_COLUMNS
+
+# Bars per closed-form step of _linear_filter; keeps decay**-k well inside float64 range
+_FILTER_BLOCK = 64
+
+
+def _rolling_sum(x: np.ndarray, window: int) -> np.ndarray:
+    """Windowed sum along bars; NaN unless all `window` values are valid."""
+    out = np.full(x.shape, np.nan)
+    if x.shape[1] < window:
+        return out
+
+    valid = ~np.isnan(x)
+    all_valid = valid.all()
+    csum = np.cumsum(x if all_valid else np.where(valid, x, 0.0), axis=1)
+    sums = out[:, window - 1:]
+    sums[:] = csum[:, window - 1:]
+    sums[:, 1:] -= csum[:, :-window]
+    if not all_valid:
+        ccount = np.cumsum(valid, axis=1)
+        counts = ccount[:, window - 1:].copy()
+        counts[:, 1:] -= ccount[:, :-window]
+        sums[counts < window] = np.nan
+    return out
+
+
+def _rolling_deviation(x: np.ndarray, rolling_mean: np.ndarray, window: int, power: int) -> np.ndarray:
+    """
+    Mean of |x - window mean| ** power over each window, accumulated one window
+    offset at a time so every step is a contiguous (tickers, bars) operation.
+    """
+    out = np.full(x.shape, np.nan)
+    n_bars = x.shape[1]
+    if n_bars < window:
+        return out
+    mean = rolling_mean[:, window - 1:]
+    acc = np.zeros_like(mean)
+    dev = np.empty_like(mean)
+    # Reuse one scratch buffer; fresh temporaries of this size dominate the runtime
+    for k in range(window):
+        np.subtract(x[:, k:n_bars - window + 1 + k], mean, out=dev)
+        if power == 1:
+            np.abs(dev, out=dev)
+        else:
+            np.square(dev, out=dev)
+        acc += dev
+    out[:, window - 1:] = acc / window
+    return out
+
+
+def _linear_filter(x: np.ndarray, decay: float, gain: float, y_prev: np.ndarray) -> np.ndarray:
+    """
+    Solves y[t] = decay * y[t-1] + gain * x[t] along bars, starting from `y_prev`.
+    Each block of bars uses the closed form
+    y[j] = decay**(j+1) * (y_prev + gain * sum_{k<=j} x[k] / decay**(k+1)),
+    so the Python loop runs once per block instead of once per bar.
+    """
+    out = np.empty_like(x)
+    powers = decay ** np.arange(1, _FILTER_BLOCK + 1)
+    prev = np.asarray(y_prev, dtype=np.float64)
+    for start in range(0, x.shape[1], _FILTER_BLOCK):
+        block = x[:, start:start + _FILTER_BLOCK]
+        p = powers[:block.shape[1]]
+        y = p * (prev[:, np.newaxis] + gain * np.cumsum(block / p, axis=1))
+        out[:, start:start + block.shape[1]] = y
+        prev = y[:, -1]
+    return out
+
+
+def _first_valid(x: np.ndarray) -> np.ndarray:
+    valid = ~np.isnan(x)
+    return np.where(valid.any(axis=1), valid.argmax(axis=1), x.shape[1])
+
+
+def _align_left(x: np.ndarray, first: np.ndarray) -> np.ndarray:
+    """
+    Shifts each row so its first valid bar is in column 0, NaN-padding the end.
+    Returns `x` itself when every row already starts at column 0.
+    """
+    n_bars = x.shape[1]
+    if n_bars == 0 or not first.any():
+        return x
+    cols = first[:, np.newaxis] + np.arange(n_bars)
+    out = np.take_along_axis(x, np.minimum(cols, n_bars - 1), axis=1)
+    out[cols >= n_bars] = np.nan
+    return out
+
+
+def _align_back(x: np.ndarray, first: np.ndarray) -> np.ndarray:
+    """Inverse of _align_left."""
+    n_bars = x.shape[1]
+    if n_bars == 0 or not first.any():
+        return x
+    cols = np.arange(n_bars) - first[:, np.newaxis]
+    out = np.take_along_axis(x, np.clip(cols, 0, n_bars - 1), axis=1)
+    out[cols < 0] = np.nan
+    return out
+
+
+def _ffill(x: np.ndarray) -> np.ndarray:
+    missing = np.isnan(x)
+    if not missing.any():
+        return x
+    idx = np.where(~missing, np.arange(x.shape[1]), 0)
+    np.maximum.accumulate(idx, axis=1, out=idx)
+    return np.take_along_axis(x, idx, axis=1)
+
+
+def _shift(x: np.ndarray) -> np.ndarray:
+    out = np.full(x.shape, np.nan)
+    out[:, 1:] = x[:, :-1]
+    return out
+
+
+def _ewm(x: np.ndarray, alpha: float, min_periods: int) -> np.ndarray:
+    """
+    pandas `ewm(alpha=..., adjust=False, min_periods=...)` per ticker, seeded with
+    each ticker's first valid value. NaN bars carry the average forward and
+    are NaN in the output.
+    """
+    first = _first_valid(x)
+    aligned = _align_left(x, first)
+    valid = ~np.isnan(aligned)
+    # Bars past the end of a ticker's history are NaN after alignment; zero them
+    # so they cannot leak into the block sums (the output there is masked anyway)
+    filled = np.nan_to_num(_ffill(aligned))
+    y = _linear_filter(filled, 1 - alpha, alpha, filled[:, 0] if filled.shape[1] else filled[:, :0])
+    if valid.all():
+        y[:, :min_periods - 1] = np.nan
+    else:
+        y[(np.cumsum(valid, axis=1) < min_periods) | ~valid] = np.nan
+    return _align_back(y, first)
+
+
+def sma(close: np.ndarray, window: int) -> np.ndarray:
+    return _rolling_sum(close, window) / window
+
+
+def ema(close: np.ndarray, window: int) -> np.ndarray:
+    return _ewm(close, 2 / (window + 1), window)
+
+
+def macd(close: np.ndarray, window_fast: int = 12, window_slow: int = 26) -> np.ndarray:
+    return ema(close, window_fast) - ema(close, window_slow)
+
+
+def rsi(close: np.ndarray, window: int = 14) -> np.ndarray:
+    diff = close - _shift(close)
+    # A ticker's first bar has no diff and counts as no gain / no loss, as in `ta`
+    diff[np.isnan(diff) & ~np.isnan(close)] = 0.0
+    avg_up = _ewm(np.maximum(diff, 0.0), 1 / window, window)
+    avg_down = _ewm(np.maximum(-diff, 0.0), 1 / window, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = 100 - 100 / (1 + avg_up / avg_down)
+    out[avg_down == 0] = 100.0
+    return out
+
+
+def bollinger_bands(close: np.ndarray, window: int = 20, window_dev: float = 2) -> Tuple[np.ndarray, np.ndarray]:
+    mavg = sma(close, window)
+    mstd = np.sqrt(_rolling_deviation(close, mavg, window, power=2))
+    return mavg + window_dev * mstd, mavg - window_dev * mstd
+
+
+def cci(high: np.ndarray, low: np.ndarray, close: np.ndarray, window: int = 20, constant: float = 0.015) -> np.ndarray:
+    typical = (high + low + close) / 3.0
+    mean = sma(typical, window)
+    mad = _rolling_deviation(typical, mean, window, power=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (typical - mean) / (constant * mad)
+
+
+def mfi(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray, window: int = 14) -> np.ndarray:
+    typical = (high + low + close) / 3.0
+    prev = _shift(typical)
+    # +1 / -1 / 0; the first bar of a ticker has no previous price and counts as 0
+    direction = np.nan_to_num(np.sign(typical - prev))
+    flow = typical * volume * direction
+    positive = _rolling_sum(np.maximum(flow, 0.0), window)
+    negative = np.abs(_rolling_sum(np.minimum(flow, 0.0), window))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100 - 100 / (1 + positive / negative)
+
+
+def adx(high: np.ndarray, low: np.ndarray, close: np.ndarray, window: int = 14) -> np.ndarray:
+    """
+    ADX with the same warm-up as `ta`: 0.0 for the first 2*window-1 bars of each
+    ticker, then the mean of the first `window` DX values and Wilder smoothing.
+    Assumes each ticker's bars are contiguous after its first valid bar.
+    """
+    w = window
+    first = _first_valid(close)
+    high, low, close = (_align_left(a, first) for a in (high, low, close))
+    # 0.0 on every bar a ticker has, NaN elsewhere
+    out = close * 0.0
+    if close.shape[1] < 2 * w:
+        return _align_back(out, first)
+
+    prev_close, prev_high, prev_low = _shift(close), _shift(high), _shift(low)
+    true_range = np.fmax(high, prev_close) - np.fmin(low, prev_close)
+    diff_up = high - prev_high
+    diff_down = prev_low - low
+    plus_dm = ((diff_up > diff_down) & (diff_up > 0)) * diff_up
+    minus_dm = ((diff_down > diff_up) & (diff_down > 0)) * diff_down
+
+    # Wilder sums of TR, +DM and -DM solved together: the sum of bars 1..w,
+    # then S[t] = S[t-1] - S[t-1] / w + x[t]
+    stacked = np.concatenate([true_range, plus_dm, minus_dm])
+    sums = np.empty((stacked.shape[0], stacked.shape[1] - w))
+    sums[:, 0] = stacked[:, 1:w + 1].sum(axis=1)
+    sums[:, 1:] = _linear_filter(np.nan_to_num(stacked[:, w + 1:]), 1 - 1 / w, 1.0, sums[:, 0])
+    s_tr, s_pos, s_neg = np.split(sums, 3)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        di_pos = 100 * s_pos / s_tr
+        di_neg = 100 * s_neg / s_tr
+        di_pos[s_tr == 0] = 0.0
+        di_neg[s_tr == 0] = 0.0
+        di_sum = di_pos + di_neg
+        dx = 100 * np.abs((di_pos - di_neg) / di_sum)
+        dx[di_sum == 0] = 0.0
+
+    # dx[:, 0] belongs to bar w; ADX starts at bar 2w-1 with the mean of the first w DX values
+    seed = dx[:, :w].mean(axis=1)
+    adx_values = out[:, 2 * w - 1:]
+    adx_values[:, 0] += seed
+    adx_values[:, 1:] += _linear_filter(dx[:, w:], (w - 1) / w, 1 / w, seed)
+    return _align_back(out, first)
+
+
+def compute_panel_indicators(
+    open_: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    volume: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """
+    Computes every `add_indicators` column for a (tickers, bars) panel.
+    Returns a dict keyed by the same column names.
+    """
+    bb_upper, bb_lower = bollinger_bands(close, window=20, window_dev=2)
+    return {
+        "SMA_20": sma(close, 20),
+        "SMA_50": sma(close, 50),
+        "EMA_20": ema(close, 20),
+        "MACD": macd(close),
+        "RSI": rsi(close, 14),
+        "BB_upper": bb_upper,
+        "BB_lower": bb_lower,
+        "ADX": adx(high, low, close, 14),
+        "CCI": cci(high, low, close, 20),
+        "MFI": mfi(high, low, close, volume, 14),
+    }
+
+
+def frames_to_panel(frames: Dict[str, pd.DataFrame]) -> Tuple[List[str], pd.DatetimeIndex, Dict[str, np.ndarray]]:
+    """
+    Aligns per-ticker OHLCV frames on the union of their dates.
+    Returns (tickers, index, {column: (tickers, bars) array}).
+    """
+    tickers = list(frames)
+    index = pd.DatetimeIndex(sorted(set().union(*(df.index for df in frames.values()))))
+    panel = {}
+    for col in ["Open", "High", "Low", "Close", "Volume"]:
+        panel[col] = np.empty((len(tickers), len(index)))
+        for i, ticker in enumerate(tickers):
+            panel[col][i] = frames[ticker][col].reindex(index).to_numpy(dtype=np.float64)
+    return tickers, index, panel
+
+
+def panel_to_frames(
+    tickers: List[str],
+    index: pd.DatetimeIndex,
+    indicators: Dict[str, np.ndarray]
+) -> Dict[str, pd.DataFrame]:
+    """
+    Splits panel indicator arrays back into one frame per ticker.
+    """
+    return {
+        ticker: pd.DataFrame({col: indicators[col][i] for col in INDICATOR_COLUMNS}, index=index)
+        for i, ticker in enumerate(tickers)
+    }
@@ -0,0 +1,332 @@
+"""
+Keeps every dashboard result warm for the ticker universe.
+
+    python -m analysis.precompute --universe all
+    python -m analysis.precompute --universe crypto --once --stages prices indicators
+
+Stages run on their own cadences (PRECOMPUTE_CADENCE_SECONDS):
+
+    prices          grouped daily downloads plus intraday base bars
+    indicators      streaming indicators for every bar size
+    sentiment       news sentiment, also appended to the sentiment history
+    forecasts       LSTM (retrained when stale) and Prophet via analysis.forecast
+    recommendation  explain_recommendation on the stored indicators and sentiment
+
+Results go to the results store (data.results_store) and the forecast
+store, so the dashboard only reads. Stages that are due together run in
+the order above, except that the scheduler loop runs the long forecasts
+stage on its own thread (BACKGROUND_STAGES) so the one-minute stages keep
+their cadence. A failing ticker is reported and skipped. The dashboard
+runs the same scheduler on a background thread when PRECOMPUTE_IN_APP is
+set.
+"""
+import argparse
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from config.settings import (
+    BAR_SIZES,
+    CRYPTO_TICKERS,
+    INTRADAY_BASE_INTERVAL,
+    PRECOMPUTE_CADENCE_SECONDS,
+    PRECOMPUTE_FORECAST_WORKERS,
+    PRECOMPUTE_REFRESH_WORKERS,
+    STOCK_TICKERS,
+)
+from data.results_store import ResultsStore
+from utils.metrics import span
+
+STAGES = ("prices", "indicators", "sentiment", "forecasts", "recommendation")
+# Stages that can take far longer than the shortest cadence
+BACKGROUND_STAGES = ("forecasts",)
+
+# Per-ticker errors of one stage run
+StageErrors = Dict[str, str]
+
+
+def _prices(tickers: Sequence[str], store: ResultsStore) -> StageErrors:
+    from data.prefetch import prefetch_prices
+    from data.price_store import update_intraday_prices
+
+    errors = {}
+    written = prefetch_prices(tickers, only_stale=False)
+    for ticker in tickers:
+        start = time.perf_counter()
+        try:
+            intraday = update_intraday_prices(ticker)
+        except Exception as e:
+            errors[ticker] = repr(e)
+            continue
+        store.put(
+            ticker, "prices",
+            {"daily_bars": written.get(ticker.upper(), 0), "intraday_bars": len(intraday)},
+            seconds=round(time.perf_counter() - start, 3),
+        )
+    return errors
+
+
+_resampler = None
+
+
+def _indicators(tickers: Sequence[str], store: ResultsStore) -> StageErrors:
+    from analysis.resample import IncrementalResampler
+    from analysis.streaming_indicators import get_indicator_engine
+    from data.price_store import bar_key, read_prices
+
+    global _resampler
+    if _resampler is None:
+        _resampler = IncrementalResampler()
+    # The dashboard's engine when running in the app: one writer per ticker's state files
+    engine = get_indicator_engine()
+
+    errors = {}
+    for ticker in tickers:
+        try:
+            base = read_prices(bar_key(ticker, INTRADAY_BASE_INTERVAL))
+            for bar_size in BAR_SIZES:
+                start = time.perf_counter()
+                if bar_size == "1d":
+                    bars = read_prices(ticker)
+                elif base.empty:
+                    continue
+                else:
+                    bars = _resampler.update(ticker, base, bar_size)
+                if bars.empty:
+                    continue
+                key = bar_key(ticker, bar_size)
+                store.put_frame(key, "indicators", engine.update(key, bars), seconds=round(time.perf_counter() - start, 3))
+        except Exception as e:
+            errors[ticker] = repr(e)
+    return errors
+
+
+def _sentiment(tickers: Sequence[str], store: ResultsStore) -> StageErrors:
+    from analysis.sentiment import get_sentiment_history, save_sentiment_summary, summarize_sentiment_many
+
+    errors = {}
+    history = get_sentiment_history()
+    try:
+        for ticker, (score, summary) in summarize_sentiment_many(list(tickers)).items():
+            if not summary["total"]:
+                # Like the sentiment cache: no articles (e.g. a failed fetch) never replaces a stored result
+                errors[ticker] = "no articles returned"
+                continue
+            try:
+                store.put(ticker, "sentiment", {"score": score, "summary": summary})
+                save_sentiment_summary(ticker, summary, store=history)
+            except Exception as e:
+                errors[ticker] = repr(e)
+    finally:
+        # One transaction per run, not left buffered until the next run (or lost if the process is killed)
+        history.flush()
+    return errors
+
+
+def _forecasts(tickers: Sequence[str], store: ResultsStore) -> StageErrors:
+    from analysis.forecast import run_batch
+
+    report = run_batch(tickers, workers=PRECOMPUTE_FORECAST_WORKERS, train=True, progress=False)
+    errors = {}
+    for ticker, result in report["tickers"].items():
+        store.put(
+            ticker, "forecasts", {"status": result["status"], "errors": result["errors"]},
+            seconds=result["timings"].get("total"),
+        )
+        if result["status"] == "failed":
+            errors[ticker] = "; ".join(f"{k}: {v}" for k, v in result["errors"].items())
+    return errors
+
+
+def _recommendation(tickers: Sequence[str], store: ResultsStore) -> StageErrors:
+    from analysis.recommendation import explain_recommendation
+
+    errors = {}
+    for ticker in tickers:
+        try:
+            indicators = store.get_frame(ticker, "indicators")
+            if indicators is None or indicators.empty:
+                raise ValueError("no stored indicators")
+            sentiment = store.get(ticker, "sentiment")
+            score = sentiment["score"] if sentiment else 0.0
+            store.put(ticker, "recommendation", {**explain_recommendation(indicators, score), "sentiment_score": score})
+        except Exception as e:
+            errors[ticker] = repr(e)
+    return errors
+
+
+STAGE_FUNCTIONS: Dict[str, Callable[[Sequence[str], ResultsStore], StageErrors]] = {
+    "prices": _prices,
+    "indicators": _indicators,
+    "sentiment": _sentiment,
+    "forecasts": _forecasts,
+    "recommendation": _recommendation,
+}
+
+
+def run_stage(stage: str, tickers: Sequence[str], store: ResultsStore) -> StageErrors:
+    """Runs one stage for all tickers and records the attempt per ticker; never raises."""
+    try:
+        with span(stage, family="precompute"):
+            errors = STAGE_FUNCTIONS[stage](tickers, store)
+    except Exception as e:
+        errors = {"*": repr(e)}
+    for ticker, error in errors.items():
+        print(f"[Precompute ERROR] {stage} {ticker} - {error}")
+    try:
+        store.record_attempts(stage, tickers, errors)
+    except Exception as e:
+        print(f"[Precompute ERROR] {stage} - could not record the attempt: {e}")
+    return errors
+
+
+class Scheduler:
+    """
+    Runs each stage whenever its cadence has elapsed. Last run times are
+    seeded from the results store with the oldest of the tickers' latest
+    attempts, so a restart does not redo the nightly forecasts, and a
+    dashboard refresh of one ticker does not postpone the others.
+    """
+
+    def __init__(
+        self,
+        tickers: Sequence[str],
+        store: Optional[ResultsStore] = None,
+        cadences: Dict[str, float] = PRECOMPUTE_CADENCE_SECONDS,
+        stages: Sequence[str] = STAGES
+    ):
+        self.tickers = list(dict.fromkeys(t.upper() for t in tickers))
+        self.store = store if store is not None else ResultsStore()
+        self.cadences = cadences
+        self.stages = [stage for stage in STAGES if stage in stages]
+        self.last_run: Dict[str, float] = {}
+        for stage in self.stages:
+            last = self.store.oldest_attempt(stage, self.tickers)
+            if last is not None:
+                self.last_run[stage] = last.timestamp()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Dict[Tuple[str, str], Future] = {}
+        self._background_executor: Optional[ThreadPoolExecutor] = None
+        self._background: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def due(self, now: Optional[float] = None) -> List[str]:
+        now = time.time() if now is None else now
+        return [s for s in self.stages if now - self.last_run.get(s, 0.0) >= self.cadences[s]]
+
+    def run_once(self, force: bool = False, background: bool = False) -> Dict[str, StageErrors]:
+        """
+        Runs the due stages (every stage if `force`) in pipeline order. With
+        `background`, BACKGROUND_STAGES are started on their own thread instead
+        (not again while the previous run is going) and have no result here.
+        """
+        results = {}
+        for stage in (self.stages if force else self.due()):
+            started = time.time()
+            if background and stage in BACKGROUND_STAGES:
+                self._start_background(stage)
+            else:
+                results[stage] = run_stage(stage, self.tickers, self.store)
+            self.last_run[stage] = started
+        return results
+
+    def _start_background(self, stage: str) -> None:
+        with self._lock:
+            future = self._background.get(stage)
+            if future is not None and not future.done():
+                print(f"[INFO] Precompute {stage} is still running, not started again")
+                return
+            if self._background_executor is None:
+                self._background_executor = ThreadPoolExecutor(
+                    len(BACKGROUND_STAGES), thread_name_prefix="precompute-background"
+                )
+            self._background[stage] = self._background_executor.submit(run_stage, stage, self.tickers, self.store)
+
+    def is_stale(self, ticker: str, stage: str) -> bool:
+        """
+        True if the ticker's last result or attempt for the stage is past its
+        cadence. A failed attempt counts, so failures are retried once per cadence.
+        """
+        last = self.store.last_attempt(ticker, stage)
+        if last is None:
+            return True
+        age = datetime.now(timezone.utc) - datetime.fromisoformat(last[0]).replace(tzinfo=timezone.utc)
+        return age.total_seconds() > self.cadences[stage]
+
+    def refresh(self, ticker: str, stage: str) -> Future:
+        """
+        Recomputes one stage for one ticker on a worker thread, ahead of the
+        schedule. At most one refresh per (ticker, stage) is in flight, and
+        none while the stage's background run covers the ticker: that run's
+        future is returned instead.
+        """
+        key = (ticker.upper(), stage)
+        with self._lock:
+            background = self._background.get(stage)
+            if background is not None and not background.done() and key[0] in self.tickers:
+                return background
+            future = self._pending.get(key)
+            if future is None or future.done():
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(PRECOMPUTE_REFRESH_WORKERS, thread_name_prefix="refresh")
+                future = self._pending[key] = self._executor.submit(run_stage, stage, [key[0]], self.store)
+            return future
+
+    def refreshing(self, ticker: str, stage: str) -> bool:
+        futures = [self._pending.get((ticker.upper(), stage))]
+        if ticker.upper() in self.tickers:
+            futures.append(self._background.get(stage))
+        return any(future is not None and not future.done() for future in futures)
+
+    def seconds_until_due(self) -> float:
+        now = time.time()
+        return max(0.0, min(self.last_run.get(s, 0.0) + self.cadences[s] - now for s in self.stages))
+
+    def run_forever(self) -> None:
+        while not self._stop.is_set():
+            self.run_once(background=True)
+            self._stop.wait(max(1.0, self.seconds_until_due()))
+
+    def start(self) -> threading.Thread:
+        """Runs the scheduler on a daemon thread."""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self.run_forever, name="precompute", daemon=True)
+            self._thread.start()
+        return self._thread
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+def universe_tickers(universe: str) -> List[str]:
+    tickers = []
+    if universe in ("stocks", "all"):
+        tickers += STOCK_TICKERS
+    if universe in ("crypto", "all"):
+        tickers += CRYPTO_TICKERS
+    return tickers
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--universe", choices=["stocks", "crypto", "all"], default="all")
+    parser.add_argument("--tickers", nargs="*", default=[], metavar="TICKER", help="extra tickers")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument("--once", action="store_true", help="run the selected stages once and exit")
+    args = parser.parse_args()
+
+    scheduler = Scheduler(universe_tickers(args.universe) + args.tickers, stages=args.stages)
+    if args.once:
+        results = scheduler.run_once(force=True)
+        n = len(scheduler.tickers)
+        print(", ".join(f"{stage}: {n - len(errors)}/{n} ok" for stage, errors in results.items()))
+    else:
+        print(f"Precomputing {', '.join(scheduler.stages)} for {len(scheduler.tickers)} tickers (Ctrl+C to stop)")
+        try:
+            scheduler.run_forever()
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,92 @@
+import re
+import threading
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+PRICE_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+
+def interval_to_rule(interval: str) -> str:
+    """
+    yfinance-style interval ('5m', '1h', '1d') to a pandas frequency ('5min', '1h', '1D').
+    """
+    match = re.fullmatch(r"(\d+)(m|h|d)", interval.strip().lower())
+    if match is None:
+        raise ValueError(f"Unsupported bar size: {interval}")
+    count, unit = match.groups()
+    return count + {"m": "min", "h": "h", "d": "D"}[unit]
+
+
+def resample_ohlcv(df: pd.DataFrame, interval: str) -> pd.DataFrame:
+    """
+    Aggregates sorted OHLCV bars into `interval` bars (first open, max high,
+    min low, last close, summed volume), labelled by bin start. Same result
+    as `df.resample(rule).agg(...)` without empty bins, computed with numpy
+    reductions over bin boundaries. Column dtypes are kept, so float32
+    prices stay float32.
+    """
+    if df.empty:
+        return df[PRICE_COLUMNS].copy()
+
+    # Bin start per bar as int64 ticks of the index's unit; same as index.floor(rule) but cheaper
+    unit = df.index.unit
+    step = pd.Timedelta(interval_to_rule(interval)) // pd.Timedelta(1, unit=unit)
+    keys = df.index.asi8 // step * step
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    ends = np.r_[starts[1:], len(df)] - 1
+
+    volume = df["Volume"].to_numpy()
+    if volume.dtype.kind == "f":
+        volume = np.nan_to_num(volume)
+    out = pd.DataFrame(
+        {
+            "Open": df["Open"].to_numpy()[starts],
+            "High": np.fmax.reduceat(df["High"].to_numpy(), starts),
+            "Low": np.fmin.reduceat(df["Low"].to_numpy(), starts),
+            "Close": df["Close"].to_numpy()[ends],
+            "Volume": np.add.reduceat(volume, starts),
+        },
+        index=pd.DatetimeIndex(keys[starts].astype(f"datetime64[{unit}]"), name=df.index.name),
+    )
+    return out
+
+
+class IncrementalResampler:
+    """
+    Keeps resampled bars per (ticker, interval). Each update only aggregates
+    base bars from the start of the last (possibly still open) output bar
+    onward. Base history that no longer starts where it used to is
+    resampled from scratch.
+    """
+
+    def __init__(self):
+        self._bars: Dict[Tuple[str, str], pd.DataFrame] = {}
+        self._first_base: Dict[Tuple[str, str], pd.Timestamp] = {}
+        self._lock = threading.Lock()
+
+    def update(self, ticker: str, base: pd.DataFrame, interval: str) -> pd.DataFrame:
+        key = (ticker.upper(), interval)
+        if base.empty:
+            return resample_ohlcv(base, interval)
+
+        with self._lock:
+            bars: Optional[pd.DataFrame] = self._bars.get(key)
+            if bars is None or bars.empty or self._first_base.get(key) != base.index[0]:
+                bars = resample_ohlcv(base, interval)
+            else:
+                # Re-aggregate the last output bar, it may have been partial
+                last_bin = bars.index[-1]
+                tail = base.iloc[base.index.searchsorted(last_bin):]
+                bars = pd.concat([bars.iloc[:-1], resample_ohlcv(tail, interval)])
+            self._bars[key] = bars
+            self._first_base[key] = base.index[0]
+            # Copy-on-write: callers may add columns without touching the kept bars, and no data is copied
+            return bars.copy(deep=False)
+
+    def reset(self, ticker: Optional[str] = None) -> None:
+        with self._lock:
+            for key in [k for k in self._bars if ticker is None or k[0] == ticker.upper()]:
+                self._bars.pop(key)
+                self._first_base.pop(key, None)
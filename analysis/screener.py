@@ -0,0 +1,129 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from analysis.panel_indicators import rsi as panel_rsi
+from config.settings import SCREENER_LOOKBACK
+
+ACTION_ORDER = {"Buy": 0, "Hold": 1, "Sell": 2}
+
+
+def _last_valid(x: np.ndarray, default: float = np.nan) -> np.ndarray:
+    """Last non-NaN value of each row."""
+    if x.ndim == 1:
+        return np.where(np.isnan(x), default, x)
+    valid = ~np.isnan(x)
+    last = x.shape[1] - 1 - valid[:, ::-1].argmax(axis=1)
+    values = x[np.arange(len(x)), last]
+    return np.where(valid.any(axis=1), values, default)
+
+
+def _window_ends(x: np.ndarray, lookback: int):
+    """
+    First and last value among the last `lookback` valid entries of each row,
+    plus how many valid entries that window holds.
+    """
+    valid = ~np.isnan(x)
+    # Valid entries at or after each position
+    remaining = np.cumsum(valid[:, ::-1], axis=1)[:, ::-1]
+    in_window = valid & (remaining <= lookback)
+    rows = np.arange(len(x))
+    start = np.where(in_window.any(axis=1), x[rows, in_window.argmax(axis=1)], np.nan)
+    return start, _last_valid(x), in_window.sum(axis=1)
+
+
+def screen(
+    tickers: List[str],
+    closes: np.ndarray,
+    rsi: np.ndarray,
+    sentiment: np.ndarray,
+    lookback: int = SCREENER_LOOKBACK
+) -> pd.DataFrame:
+    """
+    Applies the `recommend_stock_action` rules to a whole universe at once.
+
+    closes:    (tickers, bars) closing prices, NaN where a ticker has no bar
+    rsi:       (tickers,) latest RSI or (tickers, bars) RSI history
+    sentiment: (tickers,) compound sentiment scores
+
+    Like `explain_recommendation` without a forecast column, the trend is taken
+    from the last `lookback` closes of each ticker. Returns one row per ticker, ranked Buy,
+    Hold, Sell and then by a conviction score (stronger trend, sentiment and RSI
+    agreement first).
+    """
+    columns = [
+        "Ticker", "Recommendation", "Forecast Trend", "Sentiment", "RSI",
+        "Change %", "Sentiment Score", "RSI Value", "Score"
+    ]
+    if len(tickers) == 0:
+        return pd.DataFrame(columns=columns)
+
+    closes = np.asarray(closes, dtype=np.float64)
+    start, end, n_valid = _window_ends(closes, lookback)
+    # Fewer than two closes in the window means no trend, like forecast_trend
+    slope = np.where(n_valid >= 2, end - start, 0.0)
+
+    rsi_value = _last_valid(np.asarray(rsi, dtype=np.float64), default=50.0)
+    sentiment = np.asarray(sentiment, dtype=np.float64)
+
+    trend = np.select([slope > 0, slope < 0], ["up", "down"], "neutral")
+    sentiment_label = np.select([sentiment >= 0.05, sentiment <= -0.05], ["positive", "negative"], "neutral")
+    rsi_label = np.select([rsi_value < 30, rsi_value > 70], ["oversold", "overbought"], "neutral")
+
+    buy = (trend == "up") & (sentiment_label == "positive") & (rsi_label == "oversold")
+    sell = (trend == "down") & (sentiment_label == "negative") & (rsi_label == "overbought")
+    action = np.select([buy, sell], ["Buy", "Sell"], "Hold")
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        change = np.nan_to_num(slope / start)
+    score = change + sentiment + (50.0 - rsi_value) / 100.0
+
+    table = pd.DataFrame(dict(zip(columns, [
+        tickers,
+        action,
+        trend,
+        sentiment_label,
+        rsi_label,
+        np.round(change * 100, 2),
+        sentiment,
+        np.round(rsi_value, 2),
+        np.round(score, 4),
+    ])))
+    # Sell ranks last; within Sell the most bearish come last
+    rank = np.array([ACTION_ORDER[a] for a in action])
+    order = np.lexsort((-score, rank))
+    return table.iloc[order].reset_index(drop=True)
+
+
+def _closes_by_bar(frames: Dict[str, pd.DataFrame]) -> np.ndarray:
+    """
+    (tickers, bars) closes on each ticker's own bars, aligned at the newest bar
+    and NaN-padded in front. A stock's weekends and holidays are not bars of its
+    own, so unlike a shared date index they never enter its RSI as flat days.
+    """
+    closes = np.full((len(frames), max(len(df) for df in frames.values())), np.nan)
+    for i, df in enumerate(frames.values()):
+        closes[i, closes.shape[1] - len(df):] = df["Close"].to_numpy(dtype=np.float64)
+    return closes
+
+
+def screen_frames(
+    frames: Dict[str, pd.DataFrame],
+    sentiment: Optional[Dict[str, float]] = None,
+    lookback: int = SCREENER_LOOKBACK
+) -> pd.DataFrame:
+    """
+    Screens per-ticker price frames: aligns them into a panel, computes RSI for
+    all tickers in one pass and ranks them. Missing sentiment counts as neutral.
+    Tickers on different calendars (stocks and crypto) can be mixed.
+    """
+    frames = {ticker: df for ticker, df in frames.items() if not df.empty and "Close" in df.columns}
+    if not frames:
+        return screen([], np.empty((0, 0)), np.empty(0), np.empty(0), lookback)
+
+    tickers = list(frames)
+    closes = _closes_by_bar(frames)
+    sentiment = sentiment or {}
+    scores = np.array([sentiment.get(ticker, 0.0) for ticker in tickers], dtype=np.float64)
+    return screen(tickers, closes, panel_rsi(closes, 14), scores, lookback)
@@ -1,38 +1,38 @@
 import os
-import csv
-from datetime import datetime
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 
-import pandas as pd
-import matplotlib.pyplot as plt
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 from utils.news_api import fetch_news
+from utils.async_news import fetch_news_many
+from analysis.sentiment_cache import SentimentCache
+from analysis.sentiment_history import SentimentHistoryStore
+from config.settings import LEGACY_SENTIMENT_LOG
 
 analyzer = SentimentIntensityAnalyzer()
+# Shared by every caller in the process: per-ticker article TTL plus memoized headline scores
+sentiment_cache = SentimentCache(lambda text: analyzer.polarity_scores(text).get("compound", 0.0))
+_history_store: Optional[SentimentHistoryStore] = None
 
 def prepare_sentiment_data_from_news(ticker: str, limit: int = 5) -> List[Dict]:
     """
     Fetches news articles for the given ticker using utils.news_api.fetch_news,
     analyzes headline sentiment, and returns a list of dicts with keys:
     'title', 'url', 'publishedAt', 'sentiment'.
+
+    Results are reused for SENTIMENT_TTL_SECONDS (see sentiment_cache).
+    """
+    cached = sentiment_cache.get_articles(ticker, limit)
+    if cached is not None:
+        return cached
+    return sentiment_cache.put_articles(ticker, limit, fetch_news(ticker, limit=limit))
+
+
+def score_articles(raw: List[Dict]) -> List[Dict]:
     """
-    raw = fetch_news(ticker, limit=limit)
-    if not isinstance(raw, list):
-        raise TypeError(f"fetch_news returned {type(raw)}, expected List[Dict].")
-
-    results: List[Dict] = []
-    for entry in raw:
-        if not isinstance(entry, dict):
-            continue
-        title = entry.get("title") or entry.get("description") or ""
-        score = analyzer.polarity_scores(title).get("compound", 0.0)
-        results.append({
-            "title": title,
-            "url": entry.get("url", ""),
-            "publishedAt": entry.get("publishedAt", ""),
-            "sentiment": score
-        })
-    return results
+    Scores headline sentiment for articles as returned by utils.news_api.
+    Duplicate articles are dropped and each headline is only ever scored once.
+    """
+    return sentiment_cache.score_articles(raw)
 
 
 def summarize_sentiment(ticker: str, limit: int = 5) -> Tuple[float, Dict[str, float]]:
@@ -42,7 +42,26 @@ def summarize_sentiment(ticker: str, limit: int = 5) -> Tuple[float, Dict[str, f
 
     summary_dict has keys: average, positive, neutral, negative, total.
     """
-    data = prepare_sentiment_data_from_news(ticker, limit=limit)
+    return summarize_scored_articles(prepare_sentiment_data_from_news(ticker, limit=limit))
+
+
+def summarize_sentiment_many(tickers: List[str], limit: int = 5) -> Dict[str, Tuple[float, Dict[str, float]]]:
+    """
+    Like summarize_sentiment for many tickers, with all news requests made concurrently.
+    Only tickers without fresh cached articles are fetched.
+    """
+    scored = {ticker: sentiment_cache.get_articles(ticker, limit) for ticker in dict.fromkeys(tickers)}
+    missing = [ticker for ticker, data in scored.items() if data is None]
+    if missing:
+        # Stories shared between tickers are scored once for the whole batch
+        scored.update(sentiment_cache.put_articles_many(fetch_news_many(missing, limit=limit), limit))
+    return {ticker: summarize_scored_articles(scored[ticker]) for ticker in tickers}
+
+
+def summarize_scored_articles(data: List[Dict]) -> Tuple[float, Dict[str, float]]:
+    """
+    Reduces scored articles to (average_sentiment_score, summary_dict).
+    """
     if not data:
         summary = {"average": 0.0, "positive": 0, "neutral": 0, "negative": 0, "total": 0}
         return 0.0, summary
@@ -87,44 +106,56 @@ def summarize_combined_sentiment(news_data: List[Dict], tweet_data: List[Dict])
     }
 
 
-def save_sentiment_summary(ticker: str, summary: Dict[str, float], filepath: str = "sentiment_log.csv") -> None:
+def get_sentiment_history() -> SentimentHistoryStore:
+    """Process-wide sentiment history store, opened on first use."""
+    global _history_store
+    if _history_store is None:
+        _history_store = SentimentHistoryStore()
+        # One-time import of the old CSV log
+        if os.path.isfile(LEGACY_SENTIMENT_LOG) and _history_store.is_empty():
+            _history_store.migrate_csv(LEGACY_SENTIMENT_LOG)
+    return _history_store
+
+
+def save_sentiment_summary(
+    ticker: str,
+    summary: Dict[str, float],
+    filepath: Optional[str] = None,
+    *,
+    store: Optional[SentimentHistoryStore] = None
+) -> None:
     """
-    Appends a summary row to a CSV log with timestamp and counts.
+    Records a summary with the current UTC timestamp in the sentiment history
+    (`store`, default get_sentiment_history()). Writes are buffered by the store.
+    `filepath` is no longer used: the CSV log was replaced by the history
+    store, and the argument is only kept so existing positional calls work.
     """
-    file_exists = os.path.isfile(filepath)
-    with open(filepath, mode="a", newline="") as f:
-        writer = csv.writer(f)
-        if not file_exists:
-            writer.writerow(["timestamp", "ticker", "average", "positive", "neutral", "negative", "total"])
-        writer.writerow([
-            datetime.utcnow().isoformat(),
-            ticker,
-            summary.get("average", 0.0),
-            summary.get("positive", 0),
-            summary.get("neutral", 0),
-            summary.get("negative", 0),
-            summary.get("total", 0)
-        ])
+    (store or get_sentiment_history()).append(ticker, summary)
 
 
-def plot_sentiment_trend(filepath: str = "sentiment_log.csv", ticker: str = None):
+def plot_sentiment_trend(
+    filepath: Optional[str] = None,
+    ticker: str = None,
+    *,
+    days: Optional[int] = None,
+    store: Optional[SentimentHistoryStore] = None
+):
     """
-    Reads the sentiment log CSV and plots average sentiment and volume over time.
-    If ticker is provided, filters log for that ticker.
+    Plots average sentiment and volume over time from the sentiment history.
+    If ticker is provided only that ticker's rows are read; `days` limits the
+    plot to the most recent days. `filepath` is no longer used (see
+    save_sentiment_summary); a legacy CSV is imported with
+    SentimentHistoryStore.migrate_csv.
     """
-    if not os.path.isfile(filepath):
-        print(f"[INFO] No sentiment log found at {filepath}.")
-        return None
-
-    df = pd.read_csv(filepath, parse_dates=["timestamp"])
-    if ticker:
-        df = df[df["ticker"].str.upper() == ticker.upper()]
+    store = store or get_sentiment_history()
+    df = store.recent(ticker, days) if days else store.query(ticker)
 
     if df.empty:
         print(f"[INFO] No sentiment data available for {ticker}.")
         return None
 
-    df = df.sort_values("timestamp")
+    import matplotlib.pyplot as plt
+
     fig, ax1 = plt.subplots(figsize=(10, 5))
     ax1.plot(df["timestamp"], df["average"], marker="o", label="Avg Sentiment")
     ax1.set_xlabel("Timestamp")
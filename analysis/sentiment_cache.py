@@ -0,0 +1,203 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from config.settings import SENTIMENT_SCORE_DB, SENTIMENT_TTL_SECONDS
+
+
+def title_key(title: str) -> str:
+    """Hash of a headline, case and whitespace insensitive; for deduping stories."""
+    normalized = " ".join(title.lower().split())
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+def score_key(title: str) -> str:
+    """Hash of the exact headline text. VADER reads case ("GREAT" vs "great"), so scores key on this."""
+    return hashlib.sha1(title.encode("utf-8")).hexdigest()
+
+
+def article_key(article: Dict) -> str:
+    """Articles are the same story if they share a URL, or a headline when there is no URL."""
+    url = (article.get("url") or "").strip()
+    return f"url:{url}" if url else f"title:{title_key(article.get('title') or '')}"
+
+
+def dedupe_articles(articles: Iterable[Dict]) -> List[Dict]:
+    seen = set()
+    unique = []
+    for article in articles:
+        key = article_key(article)
+        if key not in seen:
+            seen.add(key)
+            unique.append(article)
+    return unique
+
+
+def _headline(article: Dict) -> str:
+    return article.get("title") or article.get("description") or ""
+
+
+class SentimentCache:
+    """
+    Two-level cache in front of news fetching and VADER scoring.
+
+    - Fetched articles are kept per (ticker, limit) for `ttl` seconds, so
+      Streamlit reruns within the TTL do no network calls at all.
+    - Headline scores are memoized by a hash of the exact title in memory and
+      in a SQLite table, so a headline seen under several tickers, or in a
+      later session, is scored exactly once.
+
+    `stats()` returns hit/miss counters for both levels.
+    """
+
+    def __init__(
+        self,
+        score: Callable[[str], float],
+        db_path: Optional[str] = SENTIMENT_SCORE_DB,
+        ttl: float = SENTIMENT_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self._score = score
+        self.ttl = ttl
+        self._clock = clock
+        self._articles: Dict[Tuple[str, int], Tuple[float, List[Dict]]] = {}
+        self._scores: Dict[str, float] = {}
+        self._counts = {"ticker_hits": 0, "ticker_misses": 0, "score_hits": 0, "score_misses": 0}
+        self._lock = threading.Lock()
+        self._db = None
+        if db_path:
+            os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+            # Streamlit serves reruns from several threads; access is serialized by _lock
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS title_scores (key TEXT PRIMARY KEY, title TEXT, score REAL)"
+            )
+            if self._db.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'headline_scores'"
+            ).fetchone():
+                # Older table keyed by the normalized title: re-key each score on the title it was computed from
+                rows = self._db.execute("SELECT title, score FROM headline_scores").fetchall()
+                self._db.executemany(
+                    "INSERT OR IGNORE INTO title_scores VALUES (?, ?, ?)",
+                    [(score_key(title), title, score) for title, score in rows]
+                )
+                self._db.execute("DROP TABLE headline_scores")
+            self._db.commit()
+
+    # --- Articles ---
+    def get_articles(self, ticker: str, limit: int) -> Optional[List[Dict]]:
+        """Scored articles for a ticker if fetched within the TTL, else None."""
+        with self._lock:
+            cached = self._articles.get((ticker, limit))
+            if cached is not None and self._clock() - cached[0] < self.ttl:
+                self._counts["ticker_hits"] += 1
+                return cached[1]
+            self._counts["ticker_misses"] += 1
+            return None
+
+    def put_articles(self, ticker: str, limit: int, raw: List[Dict]) -> List[Dict]:
+        """
+        Dedupes and scores freshly fetched articles and caches them for the TTL.
+        Empty results (usually a failed fetch) are not cached.
+        """
+        return self.put_articles_many({ticker: raw}, limit)[ticker]
+
+    def put_articles_many(self, raw: Dict[str, List[Dict]], limit: int) -> Dict[str, List[Dict]]:
+        """put_articles for several tickers, scoring each headline in the batch once."""
+        scored = self.score_articles_many(raw)
+        with self._lock:
+            now = self._clock()
+            for ticker, articles in scored.items():
+                if articles:
+                    self._articles[(ticker, limit)] = (now, articles)
+        return scored
+
+    def invalidate(self, ticker: Optional[str] = None) -> None:
+        with self._lock:
+            if ticker is None:
+                self._articles.clear()
+            else:
+                for key in [k for k in self._articles if k[0] == ticker]:
+                    del self._articles[key]
+
+    # --- Scores ---
+    def score_titles(self, titles: List[str]) -> List[float]:
+        """Compound scores for headlines, running the scorer only on ones never seen before."""
+        keys = [score_key(t) for t in titles]
+        with self._lock:
+            missing = {k: t for k, t in zip(keys, titles) if k not in self._scores}
+            if missing and self._db is not None:
+                self._load_scores(list(missing))
+                missing = {k: t for k, t in missing.items() if k not in self._scores}
+
+            new_rows = [(k, t, self._score(t)) for k, t in missing.items()]
+            for k, _, s in new_rows:
+                self._scores[k] = s
+            if new_rows and self._db is not None:
+                self._db.executemany("INSERT OR REPLACE INTO title_scores VALUES (?, ?, ?)", new_rows)
+                self._db.commit()
+
+            self._counts["score_misses"] += len(new_rows)
+            self._counts["score_hits"] += len(keys) - len(new_rows)
+            return [self._scores[k] for k in keys]
+
+    def _load_scores(self, keys: List[str]) -> None:
+        # SQLite caps bound parameters per statement
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._db.execute(
+                f"SELECT key, score FROM title_scores WHERE key IN ({placeholders})", chunk
+            ).fetchall()
+            self._scores.update(rows)
+
+    def score_articles(self, raw: List[Dict]) -> List[Dict]:
+        """Same output as analysis.sentiment.score_articles, with duplicates dropped and scores memoized."""
+        return self.score_articles_many({None: raw})[None]
+
+    def score_articles_many(self, raw: Dict[str, List[Dict]]) -> Dict[str, List[Dict]]:
+        """
+        score_articles for each ticker's articles. Each distinct headline in
+        the batch is scored once, so a story carried under several tickers is
+        not scored again for each of them.
+        """
+        articles = {}
+        for ticker, entries in raw.items():
+            if not isinstance(entries, list):
+                raise TypeError(f"fetch_news returned {type(entries)}, expected List[Dict].")
+            articles[ticker] = dedupe_articles(entry for entry in entries if isinstance(entry, dict))
+
+        # Deduped by story above, but scored by exact headline: copies differing only in case can score differently
+        titles = list(dict.fromkeys(_headline(entry) for entries in articles.values() for entry in entries))
+        scores = dict(zip(titles, self.score_titles(titles)))
+        return {
+            ticker: [
+                {
+                    "title": _headline(entry),
+                    "url": entry.get("url", ""),
+                    "publishedAt": entry.get("publishedAt", ""),
+                    "sentiment": scores[_headline(entry)]
+                }
+                for entry in entries
+            ]
+            for ticker, entries in articles.items()
+        }
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            stats = dict(self._counts)
+            stats["cached_tickers"] = len(self._articles)
+            stats["known_headlines"] = len(self._scores)
+        for level in ("ticker", "score"):
+            total = stats[f"{level}_hits"] + stats[f"{level}_misses"]
+            stats[f"{level}_hit_rate"] = round(stats[f"{level}_hits"] / total, 4) if total else 0.0
+        return stats
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,210 @@
+import argparse
+import atexit
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from config.settings import (
+    LEGACY_SENTIMENT_LOG,
+    SENTIMENT_HISTORY_DB,
+    SENTIMENT_HISTORY_FLUSH_ROWS,
+    SENTIMENT_HISTORY_FLUSH_SECONDS,
+)
+
+HISTORY_COLUMNS = ["timestamp", "ticker", "average", "positive", "neutral", "negative", "total"]
+
+Timestamp = Union[str, datetime, pd.Timestamp]
+
+
+def _iso(ts: Timestamp) -> str:
+    # Stored as UTC ISO-8601 strings, which sort and compare like the timestamps they encode
+    ts = pd.Timestamp(ts)
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert("UTC").tz_localize(None)
+    return ts.isoformat()
+
+
+class SentimentHistoryStore:
+    """
+    Sentiment summaries per ticker over time, in an indexed SQLite table.
+
+    Writes are buffered and flushed in one transaction once
+    SENTIMENT_HISTORY_FLUSH_ROWS rows are waiting or, on the next append,
+    the oldest buffered row is SENTIMENT_HISTORY_FLUSH_SECONDS old (and at
+    interpreter exit). Batch writers call flush() when done, since a killed
+    process loses whatever is still buffered. Reads flush first, so they
+    always see every appended row. The (ticker,
+    timestamp) index means a range query only touches that ticker's rows in
+    that window. It is unique, so re-importing a CSV adds no duplicate rows.
+    """
+
+    def __init__(
+        self,
+        db_path: str = SENTIMENT_HISTORY_DB,
+        flush_rows: int = SENTIMENT_HISTORY_FLUSH_ROWS,
+        flush_seconds: float = SENTIMENT_HISTORY_FLUSH_SECONDS
+    ):
+        self.db_path = db_path
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self._buffer: List[Tuple] = []
+        self._buffer_started = 0.0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS sentiment_history ("
+            "ticker TEXT NOT NULL, timestamp TEXT NOT NULL, average REAL, "
+            "positive INTEGER, neutral INTEGER, negative INTEGER, total INTEGER)"
+        )
+        if not self._db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_sentiment_ticker_time_key'"
+        ).fetchone():
+            # Databases from before the unique key: drop duplicate rows first, keeping the earliest insert
+            self._db.execute(
+                "DELETE FROM sentiment_history WHERE rowid NOT IN "
+                "(SELECT MIN(rowid) FROM sentiment_history GROUP BY ticker, timestamp)"
+            )
+            self._db.execute("DROP INDEX IF EXISTS idx_sentiment_ticker_time")
+            self._db.execute(
+                "CREATE UNIQUE INDEX idx_sentiment_ticker_time_key ON sentiment_history (ticker, timestamp)"
+            )
+        self._db.commit()
+        atexit.register(self.close)
+
+    def append(self, ticker: str, summary: Dict[str, float], timestamp: Optional[Timestamp] = None) -> None:
+        row = (
+            ticker.upper(),
+            _iso(timestamp if timestamp is not None else datetime.utcnow()),
+            summary.get("average", 0.0),
+            summary.get("positive", 0),
+            summary.get("neutral", 0),
+            summary.get("negative", 0),
+            summary.get("total", 0),
+        )
+        with self._lock:
+            if not self._buffer:
+                self._buffer_started = time.monotonic()
+            self._buffer.append(row)
+            due = (
+                len(self._buffer) >= self.flush_rows
+                or time.monotonic() - self._buffer_started >= self.flush_seconds
+            )
+            if due:
+                self._flush_locked()
+
+    def flush(self) -> int:
+        """Writes buffered rows; returns how many were written."""
+        with self._lock:
+            return self._flush_locked()
+
+    def _flush_locked(self) -> int:
+        if self._db is None or not self._buffer:
+            return 0
+        rows, self._buffer = self._buffer, []
+        with self._db:
+            self._db.executemany(
+                "INSERT OR IGNORE INTO sentiment_history "
+                "(ticker, timestamp, average, positive, neutral, negative, total) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+        return len(rows)
+
+    def query(
+        self,
+        ticker: Optional[str] = None,
+        start: Optional[Timestamp] = None,
+        end: Optional[Timestamp] = None
+    ) -> pd.DataFrame:
+        """
+        Rows for one ticker (or all) with start <= timestamp <= end, oldest first.
+        """
+        clauses, params = [], []
+        if ticker:
+            clauses.append("ticker = ?")
+            params.append(ticker.upper())
+        if start is not None:
+            clauses.append("timestamp >= ?")
+            params.append(_iso(start))
+        if end is not None:
+            clauses.append("timestamp <= ?")
+            params.append(_iso(end))
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self._lock:
+            self._flush_locked()
+            rows = self._db.execute(
+                f"SELECT {', '.join(HISTORY_COLUMNS)} FROM sentiment_history{where} ORDER BY timestamp",
+                params
+            ).fetchall()
+        df = pd.DataFrame(rows, columns=HISTORY_COLUMNS)
+        df["timestamp"] = pd.to_datetime(df["timestamp"])
+        return df
+
+    def is_empty(self) -> bool:
+        """True if nothing is stored or buffered, without reading any rows."""
+        with self._lock:
+            if self._buffer:
+                return False
+            return self._db.execute("SELECT 1 FROM sentiment_history LIMIT 1").fetchone() is None
+
+    def recent(self, ticker: Optional[str] = None, days: int = 30) -> pd.DataFrame:
+        return self.query(ticker, start=datetime.utcnow() - timedelta(days=days))
+
+    def migrate_csv(self, csv_path: str = LEGACY_SENTIMENT_LOG, chunksize: int = 50_000) -> int:
+        """
+        Imports a sentiment_log.csv written by the old save_sentiment_summary.
+        Rows already stored (same ticker and timestamp) are skipped, so an
+        interrupted import can simply be run again. Returns the number of rows added.
+        """
+        imported = 0
+        for chunk in pd.read_csv(csv_path, chunksize=chunksize):
+            timestamps = pd.to_datetime(chunk["timestamp"], utc=True).dt.tz_localize(None)
+            rows = list(zip(
+                chunk["ticker"].astype(str).str.upper(),
+                timestamps.map(pd.Timestamp.isoformat),
+                chunk["average"].astype(float),
+                chunk["positive"].astype(int),
+                chunk["neutral"].astype(int),
+                chunk["negative"].astype(int),
+                chunk["total"].astype(int),
+            ))
+            with self._lock, self._db:
+                before = self._db.total_changes
+                self._db.executemany(
+                    "INSERT OR IGNORE INTO sentiment_history "
+                    "(ticker, timestamp, average, positive, neutral, negative, total) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+                imported += self._db.total_changes - before
+        return imported
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is None:
+                return
+            self._flush_locked()
+            self._db.close()
+            self._db = None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sentiment history store maintenance")
+    parser.add_argument("--migrate", nargs="?", const=LEGACY_SENTIMENT_LOG, metavar="CSV",
+                        help="import a legacy sentiment_log.csv")
+    parser.add_argument("--db", default=SENTIMENT_HISTORY_DB)
+    args = parser.parse_args()
+
+    store = SentimentHistoryStore(args.db)
+    if args.migrate:
+        print(f"Imported {store.migrate_csv(args.migrate)} rows from {args.migrate}")
+    store.close()
@@ -0,0 +1,466 @@
+import glob
+import json
+import os
+import threading
+from collections import deque
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from analysis.indicators import INDICATOR_COLUMNS, prepare_price_columns
+from config.settings import INDICATOR_STATE_DIR, INDICATOR_STATE_MAX_PARTS, LEAN_MEMORY
+
+NAN = float("nan")
+
+
+def _divide(a: float, b: float) -> float:
+    # Same inf/NaN results as the pandas division used by `ta`
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return float(np.float64(a) / np.float64(b))
+
+
+class _Rolling:
+    """Fixed-size window with a running sum. Like pandas rolling(...).mean(), a NaN in the window makes the mean NaN."""
+
+    def __init__(self, window: int, values: Optional[List[float]] = None, total: float = 0.0):
+        self.window = window
+        self.values = deque(values or [], maxlen=window)
+        self.nans = sum(1 for v in self.values if v != v)
+        # State saved before NaN handling may carry a NaN total
+        self.total = total if total == total else sum(v for v in self.values if v == v)
+
+    def push(self, value: float) -> None:
+        if len(self.values) == self.window:
+            old = self.values[0]
+            if old != old:
+                self.nans -= 1
+            else:
+                self.total -= old
+        self.values.append(value)
+        if value != value:
+            self.nans += 1
+        else:
+            self.total += value
+
+    @property
+    def full(self) -> bool:
+        return len(self.values) == self.window
+
+    def mean(self) -> float:
+        return self.total / self.window if self.full and not self.nans else NAN
+
+    def to_dict(self) -> Dict:
+        return {"window": self.window, "values": list(self.values), "total": self.total}
+
+    @classmethod
+    def from_dict(cls, d: Dict) -> "_Rolling":
+        return cls(d["window"], d["values"], d["total"])
+
+
+class _Ema:
+    """
+    adjust=False exponential average seeded with the first value, like pandas ewm.
+    NaN inputs are skipped the way pandas does (ignore_na=False): the last
+    average is repeated and the next value's weight grows with the gap.
+    `min_periods` counts non-NaN values.
+    """
+
+    def __init__(self, alpha: float, min_periods: int, value: float = NAN, count: int = 0, old_weight: float = 1.0):
+        self.alpha = alpha
+        self.min_periods = min_periods
+        self.value = value
+        self.count = count
+        self.old_weight = old_weight
+
+    def push(self, x: float) -> float:
+        if x != x:
+            if self.value == self.value:
+                self.old_weight *= 1 - self.alpha
+        elif self.value != self.value:
+            self.value = x
+            self.count += 1
+        else:
+            old_weight = self.old_weight * (1 - self.alpha)
+            if self.value != x:
+                self.value = (old_weight * self.value + self.alpha * x) / (old_weight + self.alpha)
+            self.old_weight = 1.0
+            self.count += 1
+        return self.value if self.count >= self.min_periods else NAN
+
+    def to_dict(self) -> Dict:
+        return {
+            "alpha": self.alpha, "min_periods": self.min_periods, "value": self.value,
+            "count": self.count, "old_weight": self.old_weight
+        }
+
+    @classmethod
+    def from_dict(cls, d: Dict) -> "_Ema":
+        return cls(**d)
+
+
+class IndicatorState:
+    """
+    Running state for the indicators produced by `add_indicators`, so each new
+    bar costs O(1) (O(window) for Bollinger/CCI/MFI) instead of a full recompute.
+    Windows and smoothing follow the `ta` defaults used by `add_indicators`.
+    """
+
+    ADX_WINDOW = 14
+
+    def __init__(self):
+        self.n_bars = 0
+        self.last_timestamp: Optional[str] = None
+        self.last_bar: Optional[List[float]] = None
+        # State as it was before `last_bar`, so a revised last bar can be replayed
+        self.checkpoint: Optional[Dict] = None
+
+        self.sma_20 = _Rolling(20)
+        self.sma_50 = _Rolling(50)
+        self.ema_20 = _Ema(2 / 21, 20)
+        self.ema_12 = _Ema(2 / 13, 12)
+        self.ema_26 = _Ema(2 / 27, 26)
+        self.rsi_up = _Ema(1 / 14, 14)
+        self.rsi_down = _Ema(1 / 14, 14)
+        self.boll = deque(maxlen=20)
+        self.cci = deque(maxlen=20)
+        self.money_flow = deque(maxlen=14)
+        self.prev_typical: float = NAN
+
+        # Wilder smoothing for ADX: true range, +DM, -DM sums and the DX warm-up buffer
+        self.adx_tr = 0.0
+        self.adx_pos = 0.0
+        self.adx_neg = 0.0
+        self.adx_dx: List[float] = []
+        self.adx: float = 0.0
+
+    def update_bar(self, open_: float, high: float, low: float, close: float, volume: float) -> List[float]:
+        """
+        Consumes one bar and returns its indicator values in INDICATOR_COLUMNS order.
+        """
+        p = self.n_bars
+        prev = self.last_bar
+
+        # Moving averages
+        self.sma_20.push(close)
+        self.sma_50.push(close)
+        ema_20 = self.ema_20.push(close)
+        ema_12 = self.ema_12.push(close)
+        ema_26 = self.ema_26.push(close)
+        macd = ema_12 - ema_26
+
+        # RSI (Wilder smoothing of gains and losses)
+        diff = close - prev[3] if prev else NAN
+        avg_up = self.rsi_up.push(diff if diff > 0 else 0.0)
+        avg_down = self.rsi_down.push(-diff if diff < 0 else 0.0)
+        rsi = 100.0 if avg_down == 0 else 100 - _divide(100, 1 + _divide(avg_up, avg_down))
+
+        # Bollinger Bands
+        self.boll.append(close)
+        if len(self.boll) == self.boll.maxlen:
+            window = np.fromiter(self.boll, dtype=np.float64, count=len(self.boll))
+            mavg, mstd = window.mean(), window.std()
+            bb_upper, bb_lower = mavg + 2 * mstd, mavg - 2 * mstd
+        else:
+            bb_upper = bb_lower = NAN
+
+        # CCI
+        typical = (high + low + close) / 3.0
+        self.cci.append(typical)
+        if len(self.cci) == self.cci.maxlen:
+            window = np.fromiter(self.cci, dtype=np.float64, count=len(self.cci))
+            mean = window.mean()
+            mad = np.abs(window - mean).mean()
+            cci = _divide(typical - mean, 0.015 * mad)
+        else:
+            cci = NAN
+
+        # MFI
+        direction = 1 if typical > self.prev_typical else (-1 if typical < self.prev_typical else 0)
+        self.money_flow.append(typical * volume * direction)
+        self.prev_typical = typical
+        # Like ta's rolling(min_periods=window): a NaN in the window gives NaN
+        if len(self.money_flow) == self.money_flow.maxlen and not any(x != x for x in self.money_flow):
+            positive = sum(x for x in self.money_flow if x >= 0.0)
+            negative = abs(sum(x for x in self.money_flow if x < 0.0))
+            mfi = 100 - _divide(100, 1 + _divide(positive, negative))
+        else:
+            mfi = NAN
+
+        adx = self._update_adx(p, high, low, close, prev)
+
+        self.n_bars += 1
+        self.last_bar = [open_, high, low, close, volume]
+        return [
+            self.sma_20.mean(), self.sma_50.mean(), ema_20, macd, rsi,
+            bb_upper, bb_lower, adx, cci, mfi
+        ]
+
+    def _update_adx(self, p: int, high: float, low: float, close: float, prev: Optional[List[float]]) -> float:
+        w = self.ADX_WINDOW
+        if prev is None:
+            return 0.0
+
+        _, prev_high, prev_low, prev_close, _ = prev
+        # NaN-propagating like ta's np.amax/np.amin: after a NaN close ADX stays NaN, as in ta
+        true_range = float(np.maximum(high, prev_close) - np.minimum(low, prev_close))
+        diff_up = high - prev_high
+        diff_down = prev_low - low
+        plus_dm = diff_up if (diff_up > diff_down and diff_up > 0) else 0.0
+        minus_dm = diff_down if (diff_down > diff_up and diff_down > 0) else 0.0
+
+        if p <= w:
+            # Initial sums over bars 1..w; ta drops NaN here
+            if true_range == true_range:
+                self.adx_tr += true_range
+            self.adx_pos += plus_dm
+            self.adx_neg += minus_dm
+            if p < w:
+                return 0.0
+        else:
+            self.adx_tr = self.adx_tr - self.adx_tr / w + true_range
+            self.adx_pos = self.adx_pos - self.adx_pos / w + plus_dm
+            self.adx_neg = self.adx_neg - self.adx_neg / w + minus_dm
+
+        di_pos = 100 * (self.adx_pos / self.adx_tr) if self.adx_tr != 0 else 0.0
+        di_neg = 100 * (self.adx_neg / self.adx_tr) if self.adx_tr != 0 else 0.0
+        dx = 100 * abs((di_pos - di_neg) / (di_pos + di_neg)) if di_pos + di_neg != 0 else 0.0
+
+        if p < 2 * w - 1:
+            self.adx_dx.append(dx)
+            return 0.0
+        if p == 2 * w - 1:
+            self.adx_dx.append(dx)
+            self.adx = sum(self.adx_dx) / w
+            self.adx_dx = []
+        else:
+            self.adx = (self.adx * (w - 1) + dx) / w
+        return self.adx
+
+    def update(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Consumes the bars of `df` (prepared OHLCV columns) in order.
+        Returns an array of shape (len(df), len(INDICATOR_COLUMNS)).
+        """
+        out = np.empty((len(df), len(INDICATOR_COLUMNS)), dtype=np.float64)
+        bars = df[["Open", "High", "Low", "Close", "Volume"]].to_numpy(dtype=np.float64)
+        for i, bar in enumerate(bars):
+            if i == len(bars) - 1:
+                self.checkpoint = self.to_dict(include_checkpoint=False)
+            out[i] = self.update_bar(*bar.tolist())
+        if len(df):
+            self.last_timestamp = str(df.index[-1])
+        return out
+
+    def to_dict(self, include_checkpoint: bool = True) -> Dict:
+        return {
+            "n_bars": self.n_bars,
+            "last_timestamp": self.last_timestamp,
+            "last_bar": self.last_bar,
+            "checkpoint": self.checkpoint if include_checkpoint else None,
+            "sma_20": self.sma_20.to_dict(),
+            "sma_50": self.sma_50.to_dict(),
+            "ema_20": self.ema_20.to_dict(),
+            "ema_12": self.ema_12.to_dict(),
+            "ema_26": self.ema_26.to_dict(),
+            "rsi_up": self.rsi_up.to_dict(),
+            "rsi_down": self.rsi_down.to_dict(),
+            "boll": list(self.boll),
+            "cci": list(self.cci),
+            "money_flow": list(self.money_flow),
+            "prev_typical": self.prev_typical,
+            "adx_tr": self.adx_tr,
+            "adx_pos": self.adx_pos,
+            "adx_neg": self.adx_neg,
+            "adx_dx": list(self.adx_dx),
+            "adx": self.adx,
+        }
+
+    @classmethod
+    def from_dict(cls, d: Dict) -> "IndicatorState":
+        state = cls()
+        state.n_bars = d["n_bars"]
+        state.last_timestamp = d["last_timestamp"]
+        state.last_bar = d["last_bar"]
+        state.checkpoint = d["checkpoint"]
+        for name in ("sma_20", "sma_50"):
+            setattr(state, name, _Rolling.from_dict(d[name]))
+        for name in ("ema_20", "ema_12", "ema_26", "rsi_up", "rsi_down"):
+            setattr(state, name, _Ema.from_dict(d[name]))
+        state.boll.extend(d["boll"])
+        state.cci.extend(d["cci"])
+        state.money_flow.extend(d["money_flow"])
+        state.prev_typical = d["prev_typical"]
+        state.adx_tr, state.adx_pos, state.adx_neg = d["adx_tr"], d["adx_pos"], d["adx_neg"]
+        state.adx_dx = list(d["adx_dx"])
+        state.adx = d["adx"]
+        return state
+
+
+class StreamingIndicatorEngine:
+    """
+    Per-ticker incremental replacement for `add_indicators`.
+
+    Keeps each ticker's IndicatorState and computed indicator history, so an
+    update with one new bar only runs one step. If the last known bar was
+    revised (e.g. a partial intraday bar), it is replayed from the checkpoint;
+    any other mismatch with the stored history triggers a full recompute.
+    State and history are saved under `state_dir` and survive restarts: each
+    update rewrites the small state file and appends only the new history rows
+    as a part file, which are merged back into one file every
+    INDICATOR_STATE_MAX_PARTS parts. With `lean` the history is kept as float32; the running state stays float64.
+    """
+
+    def __init__(self, state_dir: Optional[str] = INDICATOR_STATE_DIR, lean: bool = LEAN_MEMORY):
+        self.state_dir = state_dir
+        self.dtype = np.float32 if lean else np.float64
+        self._states: Dict[str, IndicatorState] = {}
+        self._history: Dict[str, pd.DataFrame] = {}
+        # Leading history rows per ticker already on disk
+        self._saved_rows: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _paths(self, ticker: str):
+        base = os.path.join(self.state_dir, ticker.upper())
+        return base + ".json", base + ".parquet"
+
+    def _delta_paths(self, ticker: str) -> List[str]:
+        base = os.path.join(self.state_dir, ticker.upper())
+        return sorted(glob.glob(glob.escape(base) + ".delta-*.parquet"))
+
+    def _load(self, ticker: str) -> None:
+        if ticker in self._states or self.state_dir is None:
+            return
+        state_path, history_path = self._paths(ticker)
+        if os.path.exists(state_path) and os.path.exists(history_path):
+            try:
+                with open(state_path) as f:
+                    self._states[ticker] = IndicatorState.from_dict(json.load(f))
+                history = pd.concat([pd.read_parquet(path) for path in [history_path] + self._delta_paths(ticker)])
+                # A replayed (revised) last bar is appended again; the later row wins
+                history = history[~history.index.duplicated(keep="last")]
+                self._history[ticker] = history.astype(self.dtype, copy=False)
+                self._saved_rows[ticker] = len(history)
+            except Exception as e:
+                print(f"[Indicators ERROR] Could not restore state for {ticker} - {e}")
+                self._states.pop(ticker, None)
+                self._history.pop(ticker, None)
+
+    @staticmethod
+    def _replace(path: str, write) -> None:
+        # Unique temp name so concurrent writers never move each other's file
+        tmp_path = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+        write(tmp_path)
+        os.replace(tmp_path, path)
+
+    def save(self, ticker: str) -> None:
+        if self.state_dir is None or ticker not in self._states:
+            return
+        os.makedirs(self.state_dir, exist_ok=True)
+        state_path, history_path = self._paths(ticker)
+        history = self._history[ticker]
+        saved = self._saved_rows.get(ticker, 0)
+        deltas = self._delta_paths(ticker)
+
+        # History first: a state file never refers to rows that are not on disk
+        if saved == 0 or len(deltas) >= INDICATOR_STATE_MAX_PARTS:
+            self._replace(history_path, history.to_parquet)
+            for path in deltas:
+                os.remove(path)
+        elif saved < len(history):
+            next_part = int(deltas[-1].rsplit("-", 1)[1][:5]) + 1 if deltas else 1
+            delta_path = history_path[:-len(".parquet")] + f".delta-{next_part:05d}.parquet"
+            self._replace(delta_path, history.iloc[saved:].to_parquet)
+        self._saved_rows[ticker] = len(history)
+
+        state = self._states[ticker].to_dict()
+
+        def write_state(path: str) -> None:
+            with open(path, "w") as f:
+                json.dump(state, f)
+
+        self._replace(state_path, write_state)
+
+    def reset(self, ticker: str) -> None:
+        with self._lock:
+            self._states.pop(ticker, None)
+            self._history.pop(ticker, None)
+            self._saved_rows.pop(ticker, None)
+
+    def _pending_bars(self, ticker: str, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Returns the bars of `df` the stored state has not consumed yet, rewinding
+        or resetting the state when `df` does not extend what was seen before.
+        """
+        state = self._states.get(ticker)
+        history = self._history.get(ticker)
+        if state is None or history is None or state.last_timestamp is None:
+            return self._start_over(ticker, df)
+
+        last = pd.Timestamp(state.last_timestamp)
+        if last not in df.index:
+            return self._start_over(ticker, df)
+        pos = df.index.get_loc(last)
+        if not isinstance(pos, (int, np.integer)) or pos + 1 != state.n_bars or len(history) != state.n_bars:
+            return self._start_over(ticker, df)
+
+        bar = df.iloc[pos][["Open", "High", "Low", "Close", "Volume"]].to_numpy(dtype=np.float64)
+        if np.array_equal(bar, np.asarray(state.last_bar, dtype=np.float64), equal_nan=True):
+            return df.iloc[pos + 1:]
+
+        if state.checkpoint is None:
+            return self._start_over(ticker, df)
+        # Last bar changed since we saw it: roll back one bar and replay it
+        self._states[ticker] = IndicatorState.from_dict(state.checkpoint)
+        self._history[ticker] = history.iloc[:-1]
+        self._saved_rows[ticker] = min(self._saved_rows.get(ticker, 0), len(history) - 1)
+        return df.iloc[pos:]
+
+    def _start_over(self, ticker: str, df: pd.DataFrame) -> pd.DataFrame:
+        self._states[ticker] = IndicatorState()
+        self._history[ticker] = pd.DataFrame(columns=INDICATOR_COLUMNS, dtype=self.dtype)
+        self._saved_rows[ticker] = 0
+        return df
+
+    def update(self, ticker: str, df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
+        """
+        Same output as `add_indicators(df)`, computing only bars not seen before.
+        With inplace=True the indicator columns are added to `df` itself.
+        """
+        df, ok = prepare_price_columns(df, copy=not inplace)
+        if not ok:
+            return df
+
+        with self._lock:
+            self._load(ticker)
+            new_bars = self._pending_bars(ticker, df)
+            if len(new_bars):
+                values = self._states[ticker].update(new_bars)
+                new_history = pd.DataFrame(
+                    values.astype(self.dtype, copy=False), index=new_bars.index, columns=INDICATOR_COLUMNS
+                )
+                history = self._history[ticker]
+                self._history[ticker] = new_history if history.empty else pd.concat([history, new_history])
+                self.save(ticker)
+            history = self._history[ticker]
+
+        for col in INDICATOR_COLUMNS:
+            df[col] = history[col].to_numpy()
+        return df
+
+
+_engine: Optional[StreamingIndicatorEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_indicator_engine() -> StreamingIndicatorEngine:
+    """
+    Process-wide engine, created on first use. The dashboard and the
+    precompute scheduler share it, so only one engine writes a ticker's
+    files under INDICATOR_STATE_DIR.
+    """
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = StreamingIndicatorEngine()
+        return _engine
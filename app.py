@@ -1,161 +1,348 @@
 import streamlit as st
 import pandas as pd
+import io
 import os
-import yfinance as yf
+import time
 
 from datetime import timedelta
-from analysis.indicators import add_indicators
-from models.lstm_model import forecast_next_days,train_lstm_model
-from models.prophet_model import forecast_prophet,plot_prophet_forecast
-from analysis.sentiment import prepare_sentiment_data_from_news, summarize_sentiment
-from analysis.recommendation import explain_recommendation
-@st.cache_data
+from config.settings import (
+    BAR_SIZES, CHART_CACHE_ENTRIES, CHART_DEFAULT_RANGE, CHART_RANGES, CHART_WIDTH_PX, CRYPTO_TICKERS,
+    INTRADAY_BASE_INTERVAL, INTRADAY_REFRESH_SECONDS, LEAN_MEMORY, LEGACY_CSV_DIR,
+    METRICS_EXPORT_PATH, METRICS_HTTP_PORT, PRECOMPUTE_IN_APP, PREFETCH_ON_START, PREWARM_ON_START,
+    RENDER_ACTIVE_TAB_ONLY, RESULTS_POLL_SECONDS, STOCK_TICKERS
+)
+from data.price_store import (
+    bar_key, migrate_csv, needs_update, read_prices, stored_version, update_intraday_prices, update_prices
+)
+from data.prefetch import PrefetchRun
+from data.forecast_store import read_forecast
+from data.results_store import ResultsStore
+from analysis.forecast import plot_comparison
+from analysis.precompute import Scheduler
+from analysis.resample import IncrementalResampler
+from analysis.streaming_indicators import get_indicator_engine
+from analysis.screener import screen_frames
+from plots.downsample import chart_frame
+from utils.startup import prewarm
+from utils.frame_cache import FrameCache
+from utils.memory import lean_frame, memory, rss_bytes
+from utils.metrics import metrics, span
+@st.cache_resource
+def get_frame_cache():
+    # Bounded by FRAME_CACHE_MAX_MB and shared by every session of this server
+    return FrameCache()
+
 def load_price_data(ticker):
-    path = f"data/{ticker}.csv"
+    # Bars stored since the frame was cached (prefetch, precompute), or a rewritten last bar, make it stale
+    cache = get_frame_cache()
+    df = cache.get(("prices", ticker), last_bar=stored_version(ticker))
+    if df is not None:
+        return df
 
-    if os.path.exists(path):
-        try:
-            # Your CSV has junk headers in the first two rows, skip them
-            df = pd.read_csv(path, header=0, skiprows=[1, 2])
-            # Rename 'Price' to 'Date'
-            if "Price" in df.columns:
-                df.rename(columns={"Price": "Date"}, inplace=True)
-            else:
-                st.warning("Expected 'Price' column for Date not found.")
-                return pd.DataFrame()
-
-            # Convert 'Date' column to datetime and set as index
-            df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
-            df.dropna(subset=["Date"], inplace=True)
-            df.set_index("Date", inplace=True)
-
-            # Ensure numeric types for all required columns
-            required_cols = ["Open", "High", "Low", "Close", "Volume"]
-            for col in required_cols:
-                if col in df.columns:
-                    df[col] = pd.to_numeric(df[col], errors="coerce")
-                else:
-                    st.warning(f"Missing column: {col}")
-                    return pd.DataFrame()
+    df = read_prices(ticker)
 
+    # One-time import of the old per-ticker CSV downloads
+    legacy_path = os.path.join(LEGACY_CSV_DIR, f"{ticker}.csv")
+    if df.empty and os.path.exists(legacy_path):
+        try:
+            df = migrate_csv(legacy_path, ticker)
         except Exception as e:
-            st.error(f"❌ Failed to load or process CSV: {e}")
-            return pd.DataFrame()
+            st.warning(f"Could not migrate {legacy_path}: {e}")
 
-    else:
+    if needs_update(df) and PREFETCH_ON_START:
+        # The startup prefetch is most likely downloading this ticker already; wait for its batch only
+        start_prefetch().wait(ticker)
+        df = read_prices(ticker)
+
+    if needs_update(df):
         try:
-            df = yf.download(ticker, start="2020-01-01")
+            # Only bars after the last stored date are downloaded
+            df = update_prices(ticker)
+        except Exception as e:
             if df.empty:
-                st.error(f"❌ Failed to download data for {ticker}")
-                return pd.DataFrame()
+                st.error(f"❌ Error downloading data for {ticker}: {e}")
+                # Not retried on every rerun, only once the entry expires
+                return cache.put(("prices", ticker), pd.DataFrame(), last_bar=stored_version(ticker))
+            st.warning(f"Using stored prices for {ticker}, refresh failed: {e}")
 
-            os.makedirs("data", exist_ok=True)
-            df.to_csv(path)
-        except Exception as e:
-            st.error(f"❌ Error downloading data for {ticker}: {e}")
-            return pd.DataFrame()
+    if df.empty:
+        st.error(f"❌ Failed to download data for {ticker}")
+        return cache.put(("prices", ticker), pd.DataFrame(), last_bar=stored_version(ticker))
+
+    return cache.put(("prices", ticker), lean_frame(df) if LEAN_MEMORY else df, last_bar=stored_version(ticker))
+
+@st.cache_resource
+def get_resampler():
+    return IncrementalResampler()
+
+def load_intraday_data(ticker, interval):
+    # Base bars are stored compactly; larger bar sizes are aggregated from them
+    cache = get_frame_cache()
+    key = ("prices", bar_key(ticker, interval))
+    base_key = bar_key(ticker, INTRADAY_BASE_INTERVAL)
+    df = cache.get(key, last_bar=stored_version(base_key))
+    if df is not None:
+        return df
 
-    return df
+    try:
+        base = update_intraday_prices(ticker)
+    except Exception as e:
+        base = read_prices(base_key)
+        if base.empty:
+            st.error(f"❌ Error downloading intraday data for {ticker}: {e}")
+            return cache.put(key, pd.DataFrame(), ttl=INTRADAY_REFRESH_SECONDS)
+        st.warning(f"Using stored intraday prices for {ticker}, refresh failed: {e}")
+    if base.empty:
+        return cache.put(key, pd.DataFrame(), ttl=INTRADAY_REFRESH_SECONDS)
+    bars = get_resampler().update(ticker, base, interval)
+    return cache.put(key, bars, last_bar=stored_version(base_key), ttl=INTRADAY_REFRESH_SECONDS)
+
+@st.cache_data(max_entries=CHART_CACHE_ENTRIES)
+def load_chart_data(key, chart_range, width, last_bar, _df):
+    # One downsampled series per (ticker and bar size, range, width); a new or updated last bar is a new entry
+    return chart_frame(_df, ["Close", "SMA_20", "SMA_50"], CHART_RANGES[chart_range], width)
+
+@st.cache_data(max_entries=CHART_CACHE_ENTRIES)
+def load_forecast_image(ticker, generated_at, last_bar, _price_series, _forecast):
+    # Drawn once per stored forecast and latest close; the results polls in between reuse the PNG
+    fig = plot_comparison(_price_series, _forecast)
+    image = io.BytesIO()
+    fig.savefig(image, format="png", dpi=200, bbox_inches="tight")
+    return image.getvalue()
+
+@st.cache_resource
+def get_results_store():
+    return ResultsStore()
+
+@st.cache_resource
+def get_scheduler():
+    # Models, sentiment and recommendations are refreshed off the render path
+    return Scheduler(STOCK_TICKERS + CRYPTO_TICKERS, store=get_results_store())
+
+@st.cache_resource
+def start_precompute():
+    return get_scheduler().start()
+
+@st.cache_resource
+def start_prewarm():
+    # Heavy model libraries load in the background once per server process
+    return prewarm()
+
+@st.cache_resource
+def start_prefetch():
+    # Whole watchlist as grouped downloads, once per server process
+    return PrefetchRun(STOCK_TICKERS + CRYPTO_TICKERS).start()
+
+@st.cache_resource
+def start_metrics_server(port):
+    return metrics.serve(port)
+
+render_start = time.perf_counter()
 
 # Streamlit app config
 st.set_page_config(layout="wide")
 st.title("📊 Stock & Crypto Dashboard with AI Recommendations")
 
-# define separate ticker lists
-stock_tickers = [
-    "AAPL", "MSFT", "GOOGL", "AMZN", "TSLA",
-    "NVDA", "META", "NFLX", "INTC", "CSCO",
-    "CRM", "ADBE", "ORCL", "IBM", "SAP"
-]
-crypto_tickers = [
-    "BTC-USD", "ETH-USD", "ADA-USD", "BNB-USD",
-    "XRP-USD", "SOL-USD", "DOGE-USD", "DOT-USD",
-    "LTC-USD", "AVAX-USD", "MATIC-USD", "LINK-USD"
-]
-
-tabs = st.tabs(["Stocks", "Crypto"])
-
-for tab, market in zip(tabs, ["stocks", "crypto"]):
-    with tab:
-        # pick the right list
-        options = stock_tickers if market == "stocks" else crypto_tickers
-
-        # give each selectbox its own key so Streamlit doesn't mix them up
-        ticker = st.selectbox(
-            f"Select {market.title()} Ticker",
-            options,
-            key=f"{market}_ticker"
-        )
-
-        df = load_price_data(ticker)
-        if df.empty:
-            st.warning("No data available for this ticker.")
-            continue
+# ticker universe comes from config/settings.py
+stock_tickers = STOCK_TICKERS
+crypto_tickers = CRYPTO_TICKERS
 
-        df = add_indicators(df)
+if PREFETCH_ON_START:
+    start_prefetch()
 
-        # Verify necessary columns exist before plotting
-        required_cols = ["Close", "SMA_20", "SMA_50"]
-        if all(col in df.columns for col in required_cols):
-            st.subheader("📈 Price Data with Indicators")
-            st.line_chart(df[required_cols].dropna())
-        else:
-            st.warning(f"Missing one or more columns: {required_cols}")
+def show_refresh_state(ticker, stage):
+    # Stale results stay on screen while a fresher one is computed off-thread;
+    # a failed attempt is retried once the stage's cadence has passed, not on every poll
+    scheduler = get_scheduler()
+    if scheduler.is_stale(ticker, stage):
+        scheduler.refresh(ticker, stage)
+    if scheduler.refreshing(ticker, stage):
+        st.caption("Refreshing in the background, the newer result appears when ready.")
+    else:
+        last = get_results_store().last_attempt(ticker, stage)
+        if last is not None and last[1]:
+            st.caption(f"The last refresh at {last[0]} UTC failed and will be retried later: {last[1]}")
 
-        
-        st.subheader("🔮 Forecasting")
+@st.fragment
+def price_section(ticker, bar_size, chart_range):
+    with span("load", ticker=ticker):
+        df = load_price_data(ticker) if bar_size == "1d" else load_intraday_data(ticker, bar_size)
+    if df.empty:
+        st.warning("No data available for this ticker.")
+        return
+    key = bar_key(ticker, bar_size)
+    memory.record("load", df, ticker=key)
 
-        if 'Close' in df.columns:
-            price_series = df['Close'].dropna()
-            MODEL_PATH = "models/lstm_model.h5"
+    # Cached, else precomputed indicators when they cover the latest bar, else only new bars run through the indicator state
+    with span("indicators", ticker=ticker):
+        cache = get_frame_cache()
+        last_bar = (df.index[-1], float(df["Close"].iloc[-1]))
+        indicators = cache.get(("indicators", key), last_bar=last_bar)
+        if indicators is None:
+            stored = get_results_store().get_frame(key, "indicators")
+            if stored is not None and not stored.empty and stored.index[-1] == df.index[-1]:
+                indicators = lean_frame(stored) if LEAN_MEMORY else stored
+            else:
+                # The loaded frame is a copy-on-write view, adding columns leaves the cached prices as they are
+                indicators = get_indicator_engine().update(key, df, inplace=True)
+            indicators = cache.put(("indicators", key), indicators, last_bar)
+        df = indicators
+    memory.record("indicators", df, ticker=key)
 
-            # Train model only if not saved yet
-            if not os.path.exists(MODEL_PATH):
-                st.info("Training LSTM model...")
-                train_lstm_model(price_series, model_path=MODEL_PATH)
+    # Verify necessary columns exist before plotting
+    required_cols = ["Close", "SMA_20", "SMA_50"]
+    if all(col in df.columns for col in required_cols):
+        st.subheader("📈 Price Data with Indicators")
+        # About one point per pixel of the visible range instead of every bar
+        chart = load_chart_data(key, chart_range, CHART_WIDTH_PX, last_bar, df)
+        memory.record("chart", chart, ticker=key)
+        st.line_chart(chart)
+    else:
+        st.warning(f"Missing one or more columns: {required_cols}")
 
-            try:
-                lstm_forecast = forecast_next_days(price_series, model_path=MODEL_PATH)
+@st.fragment(run_every=RESULTS_POLL_SECONDS)
+def forecast_section(ticker):
+    st.subheader("🔮 Forecasting")
+    daily = load_price_data(ticker)
+    if 'Close' not in daily.columns:
+        st.warning("No 'Close' column found in data.")
+        return
 
-                # Plot with future dates
-                last_date = price_series.index[-1]
-                forecast_index = pd.date_range(start=last_date + pd.Timedelta(days=1), periods=len(lstm_forecast), freq='D')
-                forecast_df = pd.DataFrame({'LSTM Forecast': lstm_forecast}, index=forecast_index)
+    # Models are trained on daily closes whatever bar size is shown; a view, the plot skips NaN bars
+    price_series = daily['Close']
+    try:
+        # LSTM and Prophet run in the precompute job, never on this render
+        forecast = read_forecast(ticker)
+        if forecast.empty:
+            st.info(f"Forecasts for {ticker} have not been computed yet. Refresh later to see them.")
+        else:
+            generated_at = forecast['generated_at'].iloc[0]
+            memory.record("forecast", forecast, ticker=ticker)
+            last_bar = (price_series.index[-1], float(price_series.iloc[-1]))
+            st.image(load_forecast_image(ticker, generated_at, last_bar, price_series, forecast), width="stretch")
+            st.caption(f"Forecast generated at {generated_at} UTC")
+        show_refresh_state(ticker, "forecasts")
+    except Exception as e:
+        st.error(f"Forecast Error: {e}")
 
-                st.line_chart(forecast_df, use_container_width=True)
-            except Exception as e:
-                st.error(f"LSTM Forecast Error: {e}")
+@st.fragment(run_every=RESULTS_POLL_SECONDS)
+def sentiment_section(ticker):
+    st.subheader("📰 News Sentiment")
+    sentiment = get_results_store().get(ticker, "sentiment")
+    if sentiment is None:
+        st.info(f"News sentiment for {ticker} has not been computed yet.")
+    else:
+        st.metric("Sentiment Score", f"{sentiment['score']:.2f}")
+        st.json(sentiment["summary"])
+        st.caption(f"Computed at {sentiment['computed_at']} UTC")
+    show_refresh_state(ticker, "sentiment")
 
-            else:
-                try:
-                    # get the next 30 days of forecast
-                    prophet_forecast = forecast_prophet(price_series, days=30, model_path="models/prophet_model.pkl")
+@st.fragment(run_every=RESULTS_POLL_SECONDS)
+def recommendation_section(ticker):
+    st.subheader("🤖 AI Recommendation")
+    recommendation = get_results_store().get(ticker, "recommendation")
+    if recommendation is None:
+        st.info(f"No recommendation for {ticker} yet.")
+    else:
+        computed_at = recommendation.pop("computed_at")
+        recommendation.pop("sentiment_score", None)
+        st.success(f"Recommendation: {recommendation}")
+        st.caption(f"From daily bars, computed at {computed_at} UTC")
+    show_refresh_state(ticker, "recommendation")
 
-                    # plot using your helper (this draws onto plt)
-                    plot_prophet_forecast(price_series, prophet_forecast)
+@st.fragment
+def market_view(market):
+    # pick the right list
+    options = stock_tickers if market == "stocks" else crypto_tickers
 
-                    # then tell Streamlit to render the current figure
-                    st.pyplot()
-                except Exception as e:
-                    st.error(f"Prophet Forecast Error: {e}")
-        else:
-            st.warning("No 'Close' column found in data.")
-        
+    # give each selectbox its own key so Streamlit doesn't mix them up
+    ticker = st.selectbox(
+        f"Select {market.title()} Ticker",
+        options,
+        key=f"{market}_ticker"
+    )
+    bar_size = st.radio("Bar size", BAR_SIZES, horizontal=True, key=f"{market}_bar_size")
+    chart_range = st.radio(
+        "Range", list(CHART_RANGES), index=list(CHART_RANGES).index(CHART_DEFAULT_RANGE),
+        horizontal=True, key=f"{market}_chart_range"
+    )
 
+    # Each section reruns on its own; changing the ticker only reruns this tab
+    price_section(ticker, bar_size, chart_range)
+    forecast_section(ticker)
+    sentiment_section(ticker)
+    recommendation_section(ticker)
 
-        # Sentiment
-        st.subheader("📰 News Sentiment")
-        try:
-            sentiment_score, sentiment_summary = summarize_sentiment(ticker)
-            st.metric("Sentiment Score", f"{sentiment_score:.2f}")
-            st.json(sentiment_summary)
-        except Exception as e:
-            st.error(f"Sentiment Analysis Error: {e}")
+@st.fragment
+def screener_view():
+    st.subheader("🔎 Universe Screener")
+    markets = st.multiselect("Markets", ["stocks", "crypto"], default=["stocks", "crypto"], key="screener_markets")
+    use_news = st.checkbox("Include news sentiment", key="screener_news")
+
+    if st.button("Run screener", key="screener_run"):
+        universe = (stock_tickers if "stocks" in markets else []) + (crypto_tickers if "crypto" in markets else [])
+        with span("screener_load"):
+            frames = {t: load_price_data(t) for t in universe}
+
+        sentiment = {}
+        if use_news:
+            # Precomputed scores; tickers without one are screened without sentiment
+            stored = {t: get_results_store().get(t, "sentiment") for t in universe}
+            sentiment = {t: s["score"] for t, s in stored.items() if s is not None}
+            if len(sentiment) < len(universe):
+                st.caption(f"No sentiment computed yet for {len(universe) - len(sentiment)} tickers.")
 
-        # Recommendation
-        st.subheader("🤖 AI Recommendation")
         try:
-            recommendation = explain_recommendation(df, sentiment_score)
-            st.success(f"Recommendation: {recommendation}")
+            # All tickers are scored together as one array computation
+            with span("screener"):
+                ranked = screen_frames(frames, sentiment)
+            st.dataframe(ranked, use_container_width=True, hide_index=True)
         except Exception as e:
-            st.error(f"Recommendation Error: {e}")
+            st.error(f"Screener Error: {e}")
+
+# With state tracking on, tab.open tells which tab the user is looking at
+tabs = st.tabs(
+    ["Stocks", "Crypto", "Screener"],
+    key="active_tab",
+    on_change="rerun" if RENDER_ACTIVE_TAB_ONLY else "ignore"
+)
+
+for tab, market in zip(tabs[:2], ["stocks", "crypto"]):
+    with tab:
+        if RENDER_ACTIVE_TAB_ONLY and not tab.open:
+            continue
+        market_view(market)
+
+with tabs[2]:
+    if not RENDER_ACTIVE_TAB_ONLY or tabs[2].open:
+        screener_view()
+
+metrics.observe("render", time.perf_counter() - render_start)
+
+with st.expander("🩺 Diagnostics"):
+    st.caption("Time per stage and per outbound HTTP call since this server started.")
+    st.dataframe(metrics.summary(), use_container_width=True, hide_index=True)
+    st.download_button("Download Prometheus metrics", metrics.to_prometheus(), file_name="metrics.prom")
+    st.caption(
+        f"Frame memory per stage and ticker, {'float32' if LEAN_MEMORY else 'float64'} frames; "
+        f"process resident memory {rss_bytes() / 2**20:,.0f} MB."
+    )
+    st.dataframe(memory.summary(), use_container_width=True, hide_index=True)
+    st.caption("Price and indicator frame cache since this server started.")
+    st.dataframe(pd.DataFrame([get_frame_cache().stats()]), use_container_width=True, hide_index=True)
+    st.caption("Precomputed results: when each ticker and stage was last refreshed.")
+    st.dataframe(get_results_store().status(), use_container_width=True, hide_index=True)
+
+if METRICS_EXPORT_PATH:
+    try:
+        metrics.write_prometheus(METRICS_EXPORT_PATH)
+    except OSError as e:
+        st.warning(f"Could not write metrics to {METRICS_EXPORT_PATH}: {e}")
+if METRICS_HTTP_PORT:
+    start_metrics_server(METRICS_HTTP_PORT)
+
+# After the first render, so the page never waits on it
+if PREWARM_ON_START:
+    start_prewarm()
+if PRECOMPUTE_IN_APP:
+    start_precompute()
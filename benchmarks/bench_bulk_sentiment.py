@@ -0,0 +1,45 @@
+"""
+Measures bulk VADER scoring throughput (texts/second) at different worker counts
+against the one-by-one loop used by analysis.sentiment and utils.twitter_api.
+
+    python -m benchmarks.bench_bulk_sentiment --texts 20000 --workers 0 1 2 4
+
+Scores from every configuration are checked against the serial loop.
+"""
+import argparse
+import sys
+import time
+
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+from analysis.bulk_sentiment import BulkSentimentScorer
+from benchmarks.synthetic import synthetic_headlines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--texts", type=int, default=20000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 1, 2, 4])
+    parser.add_argument("--chunk-size", type=int, default=500)
+    args = parser.parse_args()
+
+    analyzer = SentimentIntensityAnalyzer()
+    start = time.perf_counter()
+    expected = [analyzer.polarity_scores(t)["compound"] for t in synthetic_headlines(args.texts)]
+    baseline = time.perf_counter() - start
+    print(f"{'serial loop':>12} {args.texts / baseline:>10.0f} texts/s")
+
+    for workers in args.workers:
+        with BulkSentimentScorer(workers=workers, chunk_size=args.chunk_size) as scorer:
+            # Pool start-up (spawn + analyzer load) is excluded, as in a long-lived service
+            list(scorer.score(synthetic_headlines(workers * args.chunk_size, seed=1)))
+            start = time.perf_counter()
+            scores = list(scorer.score(synthetic_headlines(args.texts)))
+            elapsed = time.perf_counter() - start
+        if scores != expected:
+            sys.exit(f"workers={workers}: scores differ from the serial loop")
+        print(f"{f'workers={workers}':>12} {args.texts / elapsed:>10.0f} texts/s {baseline / elapsed:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
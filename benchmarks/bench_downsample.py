@@ -0,0 +1,65 @@
+"""
+Times chart downsampling of a long price series to a pixel-width budget:
+
+    lttb    plots.downsample.lttb_indices (shape-preserving)
+    minmax  plots.downsample.minmax_indices (every bucket's high and low)
+
+and reports how many points and JSON bytes a line chart of Close/SMA_20/SMA_50
+would send to the browser before and after, and whether the series' highest
+and lowest close survive.
+
+    python -m benchmarks.bench_downsample --days 365 --freq 1min --width 1200
+"""
+import argparse
+import sys
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic import synthetic_series
+from plots.downsample import downsample
+
+
+def chart_columns(n_bars: int, freq: str) -> pd.DataFrame:
+    close = synthetic_series(n_bars, freq=freq)
+    return pd.DataFrame(
+        {"Close": close, "SMA_20": close.rolling(20).mean(), "SMA_50": close.rolling(50).mean()}
+    )
+
+
+def timed(fn, repeats: int):
+    best, result = float("inf"), None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--freq", default="1min", help="bar frequency (pandas alias)")
+    parser.add_argument("--width", type=int, default=1200, help="point budget (chart width in pixels)")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    n_bars = int(pd.Timedelta(days=args.days) / pd.Timedelta(args.freq))
+    df = chart_columns(n_bars, args.freq)
+    full_kb = len(df.to_json(orient="split")) / 1024
+    print(f"full: {len(df):,} {args.freq} bars, {full_kb:,.0f} KB as JSON")
+    print(f"{'method':<8} {'points':>7} {'ms':>8} {'KB':>8} {'extremes':>9}")
+
+    for method in ["lttb", "minmax"]:
+        seconds, thin = timed(lambda: downsample(df, args.width, method), args.repeats)
+        if thin.index[0] != df.index[0] or thin.index[-1] != df.index[-1]:
+            sys.exit(f"{method}: first and last bar must be kept")
+        extremes = thin["Close"].max() == df["Close"].max() and thin["Close"].min() == df["Close"].min()
+        if method == "minmax" and not extremes:
+            sys.exit("minmax: the highest and lowest close must be kept")
+        kb = len(thin.to_json(orient="split")) / 1024
+        print(f"{method:<8} {len(thin):>7,} {seconds * 1000:>8.1f} {kb:>8.1f} {'kept' if extremes else 'lost':>9}")
+
+
+if __name__ == "__main__":
+    main()
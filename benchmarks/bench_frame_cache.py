@@ -0,0 +1,81 @@
+"""
+Replays skewed (Zipf) ticker lookups against the dashboard's frame cache and
+compares hits with what st.cache_data does on every hit (unpickle a copy of
+the stored frame):
+
+    pickle  pickle.loads of the cached bytes, one full copy per hit
+    frame   utils.frame_cache.FrameCache.get, a copy-on-write view
+
+and reports hit rate, evictions and resident MB against the byte budget.
+A few tickers get a new bar along the way, which must invalidate them.
+
+    python -m benchmarks.bench_frame_cache --tickers 500 --bars 1500 --budget-mb 16 --lookups 20000
+"""
+import argparse
+import pickle
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import synthetic_ohlcv
+from utils.frame_cache import FrameCache
+from utils.memory import frame_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickers", type=int, default=500)
+    parser.add_argument("--bars", type=int, default=1500)
+    parser.add_argument("--budget-mb", type=float, default=16)
+    parser.add_argument("--lookups", type=int, default=20000)
+    parser.add_argument("--new-bar-every", type=int, default=500, help="lookups between new bars for a random ticker")
+    args = parser.parse_args()
+
+    frame = synthetic_ohlcv(args.bars)
+    store = {f"T{i:04d}": frame for i in range(args.tickers)}
+    last_bar = {ticker: df.index[-1] for ticker, df in store.items()}
+    universe_mb = frame_bytes(frame) * args.tickers / 2**20
+    print(f"{args.tickers} tickers x {args.bars:,} bars = {universe_mb:,.0f} MB, budget {args.budget_mb:,.0f} MB")
+
+    # A hit, both ways
+    pickled = pickle.dumps(frame)
+    cache = FrameCache(max_bytes=int(args.budget_mb * 2**20), ttl=3600)
+    cache.put("T0000", frame)
+    for name, fn in [("pickle", lambda: pickle.loads(pickled)), ("frame", lambda: cache.get("T0000"))]:
+        start = time.perf_counter()
+        for _ in range(1000):
+            hit = fn()
+        print(f"{name:<7} hit {(time.perf_counter() - start) * 1000:.3f} ms per 1000 lookups")
+    if not np.shares_memory(hit["Close"].to_numpy(), frame["Close"].to_numpy()):
+        sys.exit("frame cache hit copied the frame")
+    hit["Close"] = 0.0
+    if cache.get("T0000")["Close"].iloc[0] == 0.0:
+        sys.exit("a change to a hit reached the cached frame")
+
+    # Skewed traffic with the occasional new bar
+    rng = np.random.default_rng(0)
+    tickers = list(store)
+    picks = np.minimum(rng.zipf(1.3, args.lookups), args.tickers) - 1
+    resident_max = 0
+    for i, pick in enumerate(picks):
+        ticker = tickers[pick]
+        if args.new_bar_every and i % args.new_bar_every == args.new_bar_every - 1:
+            last_bar[ticker] += pd.Timedelta(days=1)
+        df = cache.get(ticker, last_bar=last_bar[ticker])
+        if df is None:
+            cache.put(ticker, store[ticker], last_bar=last_bar[ticker])
+        resident_max = max(resident_max, cache.stats()["resident_bytes"])
+
+    stats = cache.stats()
+    if resident_max > stats["max_bytes"]:
+        sys.exit("resident bytes exceeded the budget")
+    print(
+        f"hit rate {stats['hit_rate']:.1%}, {stats['evictions']:,} evictions, {stats['invalidated']:,} invalidated, "
+        f"{stats['entries']:,} frames resident, peak {resident_max / 2**20:,.1f} MB of {args.budget_mb:,.0f} MB"
+    )
+
+
+if __name__ == "__main__":
+    main()
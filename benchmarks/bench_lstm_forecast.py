@@ -0,0 +1,84 @@
+"""
+Compares the old per-step LSTM forecast path (load model, predict one step at a
+time with np.append) against the batched engine in models.forecast_engine.
+
+    python -m benchmarks.bench_lstm_forecast --tickers 1 10 50 --days 30
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import MinMaxScaler
+
+from benchmarks.synthetic import synthetic_series
+from models.forecast_engine import forecast_batch, model_registry
+from models.lstm_model import build_lstm_model
+
+
+def legacy_forecast(price_series: pd.Series, model_path: str, days: int = 30, window_size: int = 30):
+    """The forecast_next_days implementation this benchmark replaces."""
+    from tensorflow.keras.models import load_model
+
+    model = load_model(model_path)
+    scaler = joblib.load(model_path.replace(".h5", "_scaler.pkl"))
+
+    scaled_data = scaler.transform(price_series.values.reshape(-1, 1))
+    input_seq = scaled_data[-window_size:].reshape(1, window_size, 1)
+
+    forecasts = []
+    for _ in range(days):
+        pred = model.predict(input_seq, verbose=0)[0, 0]
+        forecasts.append(pred)
+        input_seq = np.append(input_seq[:, 1:, :], [[[pred]]], axis=1)
+
+    return scaler.inverse_transform(np.array(forecasts).reshape(-1, 1)).flatten()
+
+
+def make_model(model_dir: str, window_size: int) -> str:
+    model_path = os.path.join(model_dir, "bench_lstm.h5")
+    model = build_lstm_model((window_size, 1))
+    model.save(model_path)
+    scaler = MinMaxScaler().fit(synthetic_series(500, 0).values.reshape(-1, 1))
+    joblib.dump(scaler, model_path.replace(".h5", "_scaler.pkl"))
+    return model_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickers", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--window-size", type=int, default=30)
+    parser.add_argument("--bars", type=int, default=1500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as model_dir:
+        model_path = make_model(model_dir, args.window_size)
+        # Warm the registry and trace the graph once, as a running dashboard would have
+        forecast_batch([synthetic_series(args.bars, 0)], model_path, args.days, args.window_size)
+
+        print(f"{'tickers':>8} {'legacy s':>10} {'engine s':>10} {'speedup':>8} {'max abs diff':>13}")
+        for n_tickers in args.tickers:
+            series = [synthetic_series(args.bars, seed) for seed in range(n_tickers)]
+
+            start = time.perf_counter()
+            legacy = np.stack([legacy_forecast(s, model_path, args.days, args.window_size) for s in series])
+            legacy_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            batched = forecast_batch(series, model_path, args.days, args.window_size)
+            engine_time = time.perf_counter() - start
+
+            print(
+                f"{n_tickers:>8} {legacy_time:>10.3f} {engine_time:>10.3f} "
+                f"{legacy_time / engine_time:>7.1f}x {np.abs(legacy - batched).max():>13.2e}"
+            )
+
+    model_registry.evict()
+
+
+if __name__ == "__main__":
+    main()
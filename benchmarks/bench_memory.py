@@ -0,0 +1,121 @@
+"""
+Memory per ticker of the dashboard's price render path, stage by stage: the
+bytes still allocated (tracemalloc) after each stage while every ticker's
+frames are kept alive, like a worker serving the whole universe.
+
+    cache       the frame the cache keeps per ticker
+    load        the frame a cache hit hands to the render
+    indicators  indicator columns plus the engine's kept history
+    chart       the frame sent to st.line_chart
+    forecast    the close series passed to the forecast plot
+
+Modes:
+
+    legacy  float64, st.cache_data (a pickled frame, unpickled per hit), indicators
+            on a copy, df[cols].dropna() and df['Close'].dropna()
+    views   float64, FrameCache (copy-on-write hits), indicators in place,
+            downsampled chart, close series as a view
+    lean    views plus float32 frames (LEAN_MEMORY = True)
+
+    python -m benchmarks.bench_memory --tickers 50 --bars 1500
+    python -m benchmarks.bench_memory --tickers 20 --bars 4680 --intraday
+"""
+import argparse
+import pickle
+import sys
+import tracemalloc
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from analysis.indicators import INDICATOR_COLUMNS
+from analysis.streaming_indicators import StreamingIndicatorEngine
+from benchmarks.synthetic import synthetic_universe
+from plots.downsample import chart_frame
+from utils.frame_cache import FrameCache
+from utils.memory import lean_frame
+
+CHART_COLUMNS = ["Close", "SMA_20", "SMA_50"]
+STAGES = ["cache", "load", "indicators", "chart", "forecast"]
+MODES = ["legacy", "views", "lean"]
+
+
+def render(
+    step: Dict, stage: str, mode: str, engine: StreamingIndicatorEngine, cache: FrameCache, ticker: str, width: int
+):
+    if stage == "cache":
+        return pickle.dumps(step["stored"]) if mode == "legacy" else cache.put(ticker, step["stored"])
+    if stage == "load":
+        return pickle.loads(step["cache"]) if mode == "legacy" else cache.get(ticker)
+    if stage == "indicators":
+        return engine.update(ticker, step["load"], inplace=mode != "legacy")
+    if stage == "chart":
+        if mode == "legacy":
+            return step["indicators"][CHART_COLUMNS].dropna()
+        return chart_frame(step["indicators"], CHART_COLUMNS, None, width)
+    if mode == "legacy":
+        return step["indicators"]["Close"].dropna()
+    return step["indicators"]["Close"]
+
+
+def run(frames: Dict[str, pd.DataFrame], mode: str, width: int):
+    """Bytes kept per stage summed over tickers, and each ticker's indicator frame."""
+    engine = StreamingIndicatorEngine(state_dir=None, lean=mode == "lean")
+    cache = FrameCache(max_bytes=2**40)
+    totals = dict.fromkeys(STAGES, 0)
+    held = {}
+
+    tracemalloc.start()
+    for ticker, raw in frames.items():
+        # What the price store read returns; not part of any stage
+        step = {"stored": lean_frame(raw) if mode == "lean" else raw.copy()}
+        for stage in STAGES:
+            mark = tracemalloc.get_traced_memory()[0]
+            step[stage] = render(step, stage, mode, engine, cache, ticker, width)
+            if stage == "load":
+                del step["stored"]
+            totals[stage] += tracemalloc.get_traced_memory()[0] - mark
+        held[ticker] = step
+    tracemalloc.stop()
+    return totals, {ticker: step["indicators"] for ticker, step in held.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickers", type=int, default=50)
+    parser.add_argument("--bars", type=int, default=1500)
+    parser.add_argument("--intraday", action="store_true", help="5-minute bars instead of daily")
+    parser.add_argument("--width", type=int, default=1200, help="chart point budget")
+    parser.add_argument("--budget-gb", type=float, default=1.0, help="memory per worker for the tickers estimate")
+    args = parser.parse_args()
+
+    frames = synthetic_universe(args.tickers, args.bars, intraday=args.intraday)
+    n_bars = len(next(iter(frames.values())))
+    print(f"{args.tickers} tickers x {n_bars:,} bars, MB per ticker kept after each stage")
+    print(f"{'mode':<8} " + " ".join(f"{s:>10}" for s in STAGES) + f" {'total':>9} {'tickers/GB':>11}")
+
+    results = {}
+    for mode in MODES:
+        totals, results[mode] = run(frames, mode, args.width)
+        per_ticker = {stage: totals[stage] / args.tickers / 2**20 for stage in STAGES}
+        total = sum(per_ticker.values())
+        fits = int(args.budget_gb * 1024 / total) if total > 0 else 0
+        print(f"{mode:<8} " + " ".join(f"{per_ticker[s]:>10.3f}" for s in STAGES) + f" {total:>9.3f} {fits:>11,}")
+
+    # Same indicators in every mode; float32 within its precision
+    for ticker, expected in results["legacy"].items():
+        expected = expected[INDICATOR_COLUMNS].to_numpy()
+        if not np.array_equal(expected, results["views"][ticker][INDICATOR_COLUMNS].to_numpy(), equal_nan=True):
+            sys.exit(f"{ticker}: in-place indicators differ from the copying path")
+        lean = results["lean"][ticker][INDICATOR_COLUMNS].to_numpy(dtype=np.float64)
+        scale = np.nanmax(np.abs(expected), axis=0)
+        error = np.nanmax(np.abs(lean - expected), axis=0) / np.where(scale > 0, scale, 1)
+        if np.nanmax(error) > 1e-3:
+            worst = INDICATOR_COLUMNS[int(np.nanargmax(error))]
+            sys.exit(f"{ticker}: float32 {worst} off by {np.nanmax(error):.2e} of its range")
+    print("indicators match across modes (float32 within 1e-3 of each column's range)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Checks analysis.panel_indicators against add_indicators and measures throughput.
+
+    python -m benchmarks.bench_panel_indicators --tickers 1 100 500 --bars 1500
+
+The parity check runs first on a panel of tickers with different start and
+end dates (NaN-padded) and exits non-zero if any indicator drifts past --tol.
+It also screens a mixed universe (weekday stocks next to 7-day crypto) and
+checks each ticker's RSI against add_indicators.
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from analysis.indicators import INDICATOR_COLUMNS, add_indicators
+from analysis.panel_indicators import compute_panel_indicators, frames_to_panel
+from analysis.screener import screen_frames
+from benchmarks.synthetic import synthetic_ohlcv
+
+
+def check_parity(n_tickers: int, n_bars: int, tol: float) -> bool:
+    # Tickers start and end on different dates
+    frames = {
+        f"T{i}": synthetic_ohlcv(n_bars, i).iloc[i * 37 % (n_bars // 2):n_bars - i * 11 % (n_bars // 4)]
+        for i in range(n_tickers)
+    }
+    tickers, index, panel = frames_to_panel(frames)
+    result = compute_panel_indicators(panel["Open"], panel["High"], panel["Low"], panel["Close"], panel["Volume"])
+
+    ok = True
+    for i, ticker in enumerate(tickers):
+        expected = add_indicators(frames[ticker])
+        offset = index.get_loc(frames[ticker].index[0])
+        for col in INDICATOR_COLUMNS:
+            padding = np.delete(result[col][i], np.s_[offset:offset + len(expected)])
+            if not np.isnan(padding).all():
+                print(f"[parity] {ticker} {col}: values outside the ticker's history")
+                ok = False
+            got = result[col][i, offset:offset + len(expected)]
+            want = expected[col].to_numpy()
+            if not np.array_equal(np.isnan(got), np.isnan(want)):
+                print(f"[parity] {ticker} {col}: NaN positions differ")
+                ok = False
+                continue
+            scale = np.maximum(1.0, np.abs(want))
+            err = np.nanmax(np.abs(got - want) / scale) if (~np.isnan(want)).any() else 0.0
+            if err > tol:
+                print(f"[parity] {ticker} {col}: max relative error {err:.2e}")
+                ok = False
+    return ok
+
+
+def check_screener_parity(n_bars: int) -> bool:
+    frames = {}
+    for i in range(4):
+        crypto = synthetic_ohlcv(n_bars, i)
+        frames[f"C{i}"] = crypto.iloc[i * 13:]
+        frames[f"S{i}"] = crypto[crypto.index.dayofweek < 5].iloc[i * 7:] * (1 + i / 10)
+    ranked = screen_frames(frames).set_index("Ticker")
+
+    ok = True
+    for ticker, df in frames.items():
+        want = round(float(add_indicators(df)["RSI"].iloc[-1]), 2)
+        got = ranked.loc[ticker, "RSI Value"]
+        if abs(got - want) > 0.01:
+            print(f"[parity] screener {ticker} RSI: {got} vs add_indicators {want}")
+            ok = False
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickers", type=int, nargs="+", default=[1, 100, 500])
+    parser.add_argument("--bars", type=int, default=1500)
+    parser.add_argument("--tol", type=float, default=1e-8)
+    args = parser.parse_args()
+
+    if not check_parity(n_tickers=8, n_bars=args.bars, tol=args.tol):
+        sys.exit("Panel indicators do not match add_indicators.")
+    if not check_screener_parity(n_bars=args.bars):
+        sys.exit("Screener RSI does not match add_indicators on a mixed-calendar universe.")
+    print("parity: OK")
+
+    single = synthetic_ohlcv(args.bars, 0)
+    start = time.perf_counter()
+    add_indicators(single)
+    baseline = time.perf_counter() - start
+    print(f"add_indicators, 1 ticker x {args.bars} bars: {baseline * 1000:.1f} ms")
+
+    print(f"{'tickers':>8} {'panel ms':>10} {'tickers/s':>10} {'vs 1x add_indicators':>21}")
+    for n_tickers in args.tickers:
+        _, _, panel = frames_to_panel({f"T{i}": synthetic_ohlcv(args.bars, i) for i in range(n_tickers)})
+        start = time.perf_counter()
+        compute_panel_indicators(panel["Open"], panel["High"], panel["Low"], panel["Close"], panel["Volume"])
+        elapsed = time.perf_counter() - start
+        print(f"{n_tickers:>8} {elapsed * 1000:>10.1f} {n_tickers / elapsed:>10.0f} {elapsed / baseline:>20.2f}x")
+
+
+if __name__ == "__main__":
+    main()
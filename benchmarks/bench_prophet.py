@@ -0,0 +1,68 @@
+"""
+Times the Prophet forecast paths on a six-year daily series:
+
+    legacy       fit, then predict history + horizon and keep the tail
+    horizon      fit, then predict the horizon dates only
+    warm refit   refit after new bars arrive, initialised from the previous fit
+
+    python -m benchmarks.bench_prophet --years 6 --new-bars 5 --days 30
+"""
+import argparse
+import logging
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import synthetic_daily_series
+from models.prophet_model import fit_prophet, predict_horizon, prepare_prophet_data, warm_start_params
+
+logging.getLogger("cmdstanpy").setLevel(logging.WARNING)
+
+
+def timed(fn, repeats: int):
+    best, result = float("inf"), None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--years", type=int, default=6)
+    parser.add_argument("--new-bars", type=int, default=5)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    full = synthetic_daily_series(int(args.years * 365.25) + args.new_bars)
+    history, extended = full.iloc[:-args.new_bars], full
+
+    fit_time, model = timed(lambda: fit_prophet(history), args.repeats)
+
+    def legacy_predict():
+        future = model.make_future_dataframe(periods=args.days)
+        return model.predict(future).tail(args.days)
+
+    legacy_time, legacy = timed(legacy_predict, args.repeats)
+    horizon_time, horizon = timed(lambda: predict_horizon(model, args.days), args.repeats)
+    assert np.allclose(legacy["yhat"].to_numpy(), horizon["yhat"].to_numpy())
+
+    cold_time, cold = timed(lambda: fit_prophet(extended), args.repeats)
+    init = warm_start_params(model)
+    warm_time, warm = timed(lambda: fit_prophet(extended, init=init), args.repeats)
+    drift = np.abs(predict_horizon(cold, args.days)["yhat"].to_numpy() - predict_horizon(warm, args.days)["yhat"].to_numpy()).max()
+
+    print(f"series: {len(prepare_prophet_data(history))} daily bars, horizon {args.days} days")
+    print(f"{'step':<28} {'seconds':>8}")
+    print(f"{'predict history + horizon':<28} {legacy_time:>8.3f}")
+    print(f"{'predict horizon only':<28} {horizon_time:>8.3f}  ({legacy_time / horizon_time:.1f}x)")
+    print(f"{'cold fit':<28} {fit_time:>8.3f}")
+    print(f"{f'cold refit (+{args.new_bars} bars)':<28} {cold_time:>8.3f}")
+    print(f"{f'warm refit (+{args.new_bars} bars)':<28} {warm_time:>8.3f}  ({cold_time / warm_time:.1f}x)")
+    print(f"max |yhat| difference, warm vs cold refit: {drift:.4f}")
+
+
+if __name__ == "__main__":
+    main()
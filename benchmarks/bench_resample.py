@@ -0,0 +1,93 @@
+"""
+Times OHLCV resampling of intraday base bars into larger bar sizes:
+
+    pandas       df.resample(rule).agg({...}).dropna()
+    numpy        analysis.resample.resample_ohlcv
+    incremental  IncrementalResampler after a few new base bars
+
+and reports the in-memory size of the base bars stored as float64 vs the
+compact dtypes the intraday store uses.
+
+    python -m benchmarks.bench_resample --days 365 --freq 1min --intervals 5m 15m 1h 1d
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from analysis.resample import IncrementalResampler, interval_to_rule, resample_ohlcv
+from benchmarks.synthetic import synthetic_series
+from data.price_store import normalize_ohlcv
+
+AGG = {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+
+
+def base_bars(n_bars: int, freq: str) -> pd.DataFrame:
+    """Round-the-clock (crypto) OHLCV bars."""
+    rng = np.random.default_rng(0)
+    close = synthetic_series(n_bars, freq=freq).to_numpy()
+    spread = np.abs(rng.normal(0, 0.002, n_bars)) * close
+    return pd.DataFrame(
+        {
+            "Open": close + rng.normal(0, 0.001, n_bars) * close,
+            "High": close + spread,
+            "Low": close - spread,
+            "Close": close,
+            "Volume": rng.integers(1_000, 100_000, n_bars).astype("float64"),
+        },
+        index=pd.date_range("2020-01-01", periods=n_bars, freq=freq, name="Date"),
+    )
+
+
+def timed(fn, repeats: int):
+    best, result = float("inf"), None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--freq", default="1min", help="base bar frequency (pandas alias)")
+    parser.add_argument("--intervals", nargs="+", default=["5m", "15m", "1h", "1d"])
+    parser.add_argument("--new-bars", type=int, default=5)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    n_bars = int(pd.Timedelta(days=args.days) / pd.Timedelta(args.freq))
+    full = base_bars(n_bars + args.new_bars, args.freq)
+    base = full.iloc[:-args.new_bars]
+    compact = normalize_ohlcv(base, compact=True)
+    wide_mb = base.memory_usage(deep=True).sum() / 2**20
+    compact_mb = compact.memory_usage(deep=True).sum() / 2**20
+    print(f"base: {len(base):,} {args.freq} bars, {wide_mb:.1f} MB float64, {compact_mb:.1f} MB compact")
+    print(f"{'interval':<9} {'bars':>9} {'pandas s':>9} {'numpy s':>9} {'speedup':>8} {'incr. ms':>9}")
+
+    for interval in args.intervals:
+        pandas_time, expected = timed(
+            lambda: base.resample(interval_to_rule(interval)).agg(AGG).dropna(subset=["Close"]), args.repeats
+        )
+        numpy_time, result = timed(lambda: resample_ohlcv(base, interval), args.repeats)
+        if not np.allclose(expected.to_numpy(), result.to_numpy()) or not expected.index.equals(result.index):
+            sys.exit(f"{interval}: numpy resampler differs from pandas")
+
+        resampler = IncrementalResampler()
+        resampler.update("BENCH", compact, interval)
+        extended = normalize_ohlcv(full, compact=True)
+        incremental_time, bars = timed(lambda: resampler.update("BENCH", extended, interval), args.repeats)
+        if not bars.equals(resample_ohlcv(extended, interval)):
+            sys.exit(f"{interval}: incremental resampler differs from a full resample")
+
+        print(
+            f"{interval:<9} {len(result):>9,} {pandas_time:>9.3f} {numpy_time:>9.3f} "
+            f"{pandas_time / numpy_time:>7.1f}x {incremental_time * 1000:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Checks analysis.streaming_indicators against add_indicators and times one-bar updates.
+
+    python -m benchmarks.bench_streaming_indicators --bars 1500 --updates 200
+
+Parity cases (the script exits non-zero if any indicator drifts past --tol):
+
+    clean     bars fed one at a time
+    nan       missing closes, a single one and a run, mid-history
+    restart   half the bars, then a new engine reading the saved state
+    revised   the last bar rewritten (a partial bar) before the next one arrives
+"""
+import argparse
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from analysis.indicators import INDICATOR_COLUMNS, add_indicators
+from analysis.streaming_indicators import StreamingIndicatorEngine
+from benchmarks.synthetic import synthetic_ohlcv
+
+
+def compare(case: str, got: pd.DataFrame, df: pd.DataFrame, tol: float) -> bool:
+    expected = add_indicators(df, lean=False)
+    ok = True
+    for col in INDICATOR_COLUMNS:
+        have, want = got[col].to_numpy(dtype=np.float64), expected[col].to_numpy()
+        if not np.array_equal(np.isnan(have), np.isnan(want)):
+            print(f"[parity] {case} {col}: NaN positions differ")
+            ok = False
+            continue
+        scale = np.maximum(1.0, np.abs(want))
+        err = np.nanmax(np.abs(have - want) / scale) if (~np.isnan(want)).any() else 0.0
+        if err > tol:
+            print(f"[parity] {case} {col}: max relative error {err:.2e}")
+            ok = False
+    return ok
+
+
+def feed(engine: StreamingIndicatorEngine, df: pd.DataFrame, start: int = 1) -> pd.DataFrame:
+    for end in range(start, len(df) + 1):
+        result = engine.update("T", df.iloc[:end])
+    return result
+
+
+def check_parity(n_bars: int, tol: float) -> bool:
+    df = synthetic_ohlcv(n_bars)
+    ok = compare("clean", feed(StreamingIndicatorEngine(state_dir=None), df), df, tol)
+
+    gaps = df.copy()
+    gaps.iloc[[n_bars // 3] + list(range(n_bars // 2, n_bars // 2 + 5)), gaps.columns.get_loc("Close")] = np.nan
+    ok &= compare("nan", feed(StreamingIndicatorEngine(state_dir=None), gaps), gaps, tol)
+
+    with tempfile.TemporaryDirectory() as state_dir:
+        feed(StreamingIndicatorEngine(state_dir=state_dir), df.iloc[:n_bars // 2])
+        restarted = feed(StreamingIndicatorEngine(state_dir=state_dir), df, start=n_bars // 2 + 1)
+    ok &= compare("restart", restarted, df, tol)
+
+    engine = StreamingIndicatorEngine(state_dir=None)
+    engine.update("T", df.iloc[:-1])
+    partial = df.iloc[:-1].copy()
+    partial.iloc[-1, partial.columns.get_loc("Close")] *= 1.01
+    engine.update("T", partial)
+    ok &= compare("revised", engine.update("T", df), df, tol)
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bars", type=int, default=1500)
+    parser.add_argument("--updates", type=int, default=200, help="one-bar updates timed after the history")
+    parser.add_argument("--tol", type=float, default=1e-8)
+    args = parser.parse_args()
+
+    if not check_parity(n_bars=min(args.bars, 400), tol=args.tol):
+        sys.exit("Streaming indicators do not match add_indicators.")
+    print("parity: OK")
+
+    df = synthetic_ohlcv(args.bars + args.updates)
+    history = args.bars
+    start = time.perf_counter()
+    add_indicators(df.iloc[:history])
+    baseline = time.perf_counter() - start
+    print(f"add_indicators, {history} bars: {baseline * 1000:.1f} ms")
+
+    for label, state_dir in [("in memory", None), ("saved to disk", tempfile.mkdtemp())]:
+        engine = StreamingIndicatorEngine(state_dir=state_dir)
+        engine.update("T", df.iloc[:history])
+        start = time.perf_counter()
+        for end in range(history + 1, len(df) + 1):
+            engine.update("T", df.iloc[:end])
+        per_update = (time.perf_counter() - start) / args.updates
+        print(f"one-bar update, {label}: {per_update * 1000:.2f} ms ({baseline / per_update:.0f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""
+Local stand-ins for the external APIs, so benchmarks run offline and repeatably.
+
+    with StubServer(latency=0.05) as stub:
+        requests.get(stub.url("/newsapi"), params={"q": "AAPL"})
+
+Routes (shapes follow the real APIs closely enough for our parsers):
+
+    /newsapi                               NewsAPI /v2/everything
+    /gnews                                 GNews /api/v4/search
+    /query                                 Alpha Vantage DIGITAL_CURRENCY_DAILY
+    /v2/aggs/ticker/{symbol}/range/...     Polygon aggregates, paginated with next_url
+    /2/tweets/search/recent                Twitter API v2 recent search
+
+`latency` delays every response and `error_rate` turns that fraction of
+requests into HTTP 500s. Responses are deterministic per query.
+"""
+import asyncio
+import threading
+import zlib
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from aiohttp import web
+
+from benchmarks.synthetic import synthetic_headlines, synthetic_ohlcv
+
+
+# Polygon timespans as pandas frequency aliases
+POLYGON_FREQ = {"second": "s", "minute": "min", "hour": "h", "day": "D", "week": "W", "month": "MS"}
+
+
+def _seed(text: str) -> int:
+    return zlib.crc32(text.encode("utf-8"))
+
+
+def _articles(query: str, n: int):
+    return [
+        {
+            "title": f"{query} {headline}",
+            "url": f"https://news.example/{query}/{i}",
+            "publishedAt": f"2024-01-{i % 28 + 1:02d}T12:00:00Z",
+        }
+        for i, headline in enumerate(synthetic_headlines(n, _seed(query)))
+    ]
+
+
+class StubServer:
+    """Runs the stub aiohttp app on a background thread."""
+
+    def __init__(self, latency: float = 0.0, error_rate: float = 0.0, host: str = "127.0.0.1", port: int = 0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.host = host
+        self.port = port
+        self.requests = 0
+        self._rng = np.random.default_rng(0)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._runner: Optional[web.AppRunner] = None
+        self._thread: Optional[threading.Thread] = None
+        self._started = threading.Event()
+
+    def url(self, path: str = "") -> str:
+        return f"http://{self.host}:{self.port}{path}"
+
+    # --- Handlers ---
+    async def _delay_or_fail(self) -> Optional[web.Response]:
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.error_rate and self._rng.random() < self.error_rate:
+            return web.Response(status=500, text="stub failure")
+        return None
+
+    async def _newsapi(self, request: web.Request) -> web.Response:
+        failure = await self._delay_or_fail()
+        if failure:
+            return failure
+        q = request.query.get("q", "")
+        articles = _articles(q, int(request.query.get("pageSize", 5)))
+        return web.json_response({"status": "ok", "totalResults": len(articles), "articles": articles})
+
+    async def _gnews(self, request: web.Request) -> web.Response:
+        failure = await self._delay_or_fail()
+        if failure:
+            return failure
+        q = request.query.get("q", "")
+        return web.json_response({"totalArticles": 5, "articles": _articles(q, int(request.query.get("max", 5)))})
+
+    async def _alpha_vantage(self, request: web.Request) -> web.Response:
+        failure = await self._delay_or_fail()
+        if failure:
+            return failure
+        symbol = request.query.get("symbol", "BTC")
+        df = synthetic_ohlcv(365, _seed(symbol))
+        series = {
+            date.strftime("%Y-%m-%d"): {
+                "1a. open (USD)": f"{row.Open:.4f}",
+                "2a. high (USD)": f"{row.High:.4f}",
+                "3a. low (USD)": f"{row.Low:.4f}",
+                "4a. close (USD)": f"{row.Close:.4f}",
+                "5. volume": f"{row.Volume:.0f}",
+            }
+            for date, row in df.iterrows()
+        }
+        return web.json_response({"Time Series (Digital Currency Daily)": series})
+
+    async def _polygon(self, request: web.Request) -> web.Response:
+        failure = await self._delay_or_fail()
+        if failure:
+            return failure
+        symbol = request.match_info["symbol"]
+        freq = f"{request.match_info['multiplier']}{POLYGON_FREQ[request.match_info['timespan']]}"
+        start = pd.Timestamp(request.match_info["start"])
+        end = pd.Timestamp(request.match_info["end"]) + pd.Timedelta(days=1)
+        index = pd.date_range(start, end, freq=freq, inclusive="left")
+        limit = int(request.query.get("limit", 5000))
+        offset = int(request.query.get("cursor", 0))
+
+        page = index[offset:offset + limit]
+        df = synthetic_ohlcv(max(1, len(page)), _seed(symbol) + offset).iloc[:len(page)]
+        results = [
+            {"t": int(ts.value // 1_000_000), "o": row.Open, "h": row.High, "l": row.Low, "c": row.Close, "v": row.Volume}
+            for ts, row in zip(page, df.itertuples())
+        ]
+        if request.query.get("sort") == "desc":
+            results.reverse()
+        body = {"ticker": symbol, "resultsCount": len(results), "results": results, "status": "OK"}
+        if offset + limit < len(index):
+            # Like Polygon: the cursor URL repeats the query but not the key
+            query = {k: v for k, v in request.query.items() if k != "apiKey"}
+            body["next_url"] = str(request.url.with_query({**query, "cursor": offset + limit}))
+        return web.json_response(body)
+
+    async def _tweets(self, request: web.Request) -> web.Response:
+        failure = await self._delay_or_fail()
+        if failure:
+            return failure
+        q = request.query.get("query", "")
+        n = int(request.query.get("max_results", 10))
+        data = [
+            {"id": str(_seed(q) + i), "text": text, "created_at": "2024-01-01T12:00:00.000Z"}
+            for i, text in enumerate(synthetic_headlines(n, _seed(q) + 1))
+        ]
+        return web.json_response({"data": data, "meta": {"result_count": n}})
+
+    # --- Lifecycle ---
+    def _app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/newsapi", self._newsapi)
+        app.router.add_get("/gnews", self._gnews)
+        app.router.add_get("/query", self._alpha_vantage)
+        app.router.add_get("/v2/aggs/ticker/{symbol}/range/{multiplier}/{timespan}/{start}/{end}", self._polygon)
+        app.router.add_get("/2/tweets/search/recent", self._tweets)
+        return app
+
+    def _serve(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+
+        async def start():
+            self._runner = web.AppRunner(self._app(), access_log=None)
+            await self._runner.setup()
+            site = web.TCPSite(self._runner, self.host, self.port)
+            await site.start()
+            self.port = site._server.sockets[0].getsockname()[1]
+
+        self._loop.run_until_complete(start())
+        self._started.set()
+        self._loop.run_forever()
+        self._loop.run_until_complete(self._runner.cleanup())
+        self._loop.close()
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self._serve, name="stub-server", daemon=True)
+        self._thread.start()
+        self._started.wait(timeout=10)
+        return self
+
+    def stop(self) -> None:
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=10)
+            self._loop = None
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    with StubServer(args.latency, args.error_rate, port=args.port) as stub:
+        print(f"Stub APIs on {stub.url()} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
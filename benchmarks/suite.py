@@ -0,0 +1,280 @@
+"""
+Offline benchmark suite for the dashboard's hot paths.
+
+    python -m benchmarks.suite --tickers 1 10 100 --out benchmarks/results/run.json
+    python -m benchmarks.suite --tickers 1 10 --compare benchmarks/results/run.json
+
+Every case runs against synthetic data (benchmarks.synthetic) in a temporary
+working directory, and news requests go to a local stub server
+(benchmarks.stub_servers), so results do not depend on the network or on
+local state. Each case reports latency percentiles per call, throughput in
+tickers/s and peak Python heap (tracemalloc) for one call. Results are
+saved as JSON; with --compare, cases whose p50 latency grew by more than
+--threshold are flagged and the exit code is 1.
+
+load_price_data is Streamlit-cached inside app.py, so its storage path
+(read_prices + needs_update) is what gets timed.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from benchmarks.synthetic import synthetic_universe
+
+CASES = [
+    "load_price_data",
+    "add_indicators",
+    "prepare_lstm_data",
+    "forecast_next_days",
+    "forecast_prophet",
+    "summarize_sentiment",
+    "explain_recommendation",
+]
+
+
+class Case(NamedTuple):
+    name: str
+    tickers: int
+    run: Callable[[], None]
+
+
+def measure(case: Case, repeats: int, warmup: int = 1) -> Dict:
+    for _ in range(warmup):
+        case.run()
+
+    latencies = np.empty(repeats)
+    for i in range(repeats):
+        start = time.perf_counter()
+        case.run()
+        latencies[i] = time.perf_counter() - start
+
+    # Separate call: tracing allocations slows everything down
+    tracemalloc.start()
+    case.run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    return {
+        "case": case.name,
+        "tickers": case.tickers,
+        "repeats": repeats,
+        "p50_ms": round(p50 * 1000, 3),
+        "p95_ms": round(p95 * 1000, 3),
+        "p99_ms": round(p99 * 1000, 3),
+        "mean_ms": round(latencies.mean() * 1000, 3),
+        "tickers_per_s": round(case.tickers / p50, 2),
+        "peak_mb": round(peak / 2**20, 3),
+    }
+
+
+def build_cases(names: Sequence[str], n_tickers: int, n_bars: int, intraday: bool, stub_url: str) -> List[Case]:
+    """Sets up the inputs for each requested case on an n-ticker universe."""
+    from analysis.indicators import add_indicators
+    from data.price_store import needs_update, read_prices, write_prices
+
+    frames = synthetic_universe(n_tickers, n_bars, intraday=intraday)
+    tickers = list(frames)
+    cases = []
+
+    if "load_price_data" in names:
+        for ticker, df in frames.items():
+            write_prices(ticker, df)
+
+        def load():
+            for ticker in tickers:
+                needs_update(read_prices(ticker))
+
+        cases.append(Case("load_price_data", n_tickers, load))
+
+    if "add_indicators" in names:
+        cases.append(Case("add_indicators", n_tickers, lambda: [add_indicators(df) for df in frames.values()]))
+
+    if "prepare_lstm_data" in names:
+        from models.lstm_model import prepare_lstm_data
+
+        closes = [df["Close"] for df in frames.values()]
+        cases.append(Case("prepare_lstm_data", n_tickers, lambda: [prepare_lstm_data(c) for c in closes]))
+
+    if "forecast_next_days" in names:
+        from benchmarks.bench_lstm_forecast import make_model
+        from models.lstm_model import forecast_next_days
+
+        model_path = make_model(os.getcwd(), 30)
+        closes = [df["Close"] for df in frames.values()]
+        cases.append(Case(
+            "forecast_next_days", n_tickers,
+            lambda: [forecast_next_days(c, model_path, days=30) for c in closes]
+        ))
+
+    if "forecast_prophet" in names:
+        from models.prophet_model import forecast_prophet
+
+        # Resident per-ticker models: the steady state of a running dashboard
+        series = {ticker: df["Close"] for ticker, df in frames.items()}
+        cases.append(Case(
+            "forecast_prophet", n_tickers,
+            lambda: [forecast_prophet(s, days=30, ticker=t) for t, s in series.items()]
+        ))
+
+    if "summarize_sentiment" in names:
+        import utils.http_client as http_client
+        import utils.news_api as news_api
+        from analysis.sentiment import sentiment_cache, summarize_sentiment
+        from config.settings import HTTP_PROVIDERS
+        from utils.http_client import get_http_client
+
+        news_api.NEWSAPI_URL = stub_url + "/newsapi"
+        news_api.GNEWS_URL = stub_url + "/gnews"
+        # The stub has no rate limit: without the providers' token buckets the case
+        # times fetching and scoring, not the waits a real NewsAPI quota would cause
+        unthrottled = {p: {**HTTP_PROVIDERS[p], "rate": 1e9, "burst": 1e9} for p in ("newsapi", "gnews")}
+        http_client._client = http_client.HttpClient(providers={**HTTP_PROVIDERS, **unthrottled})
+
+        def fetch_and_score():
+            # Both caches, so every iteration really fetches from the stub server
+            sentiment_cache.invalidate()
+            for provider in ("newsapi", "gnews"):
+                get_http_client().cache.clear(provider)
+            for ticker in tickers:
+                summarize_sentiment(ticker)
+
+        cases.append(Case("summarize_sentiment", n_tickers, fetch_and_score))
+        cases.append(Case(
+            "summarize_sentiment_cached", n_tickers,
+            lambda: [summarize_sentiment(ticker) for ticker in tickers]
+        ))
+
+    if "explain_recommendation" in names:
+        from analysis.recommendation import explain_recommendation
+
+        with_indicators = [add_indicators(df) for df in frames.values()]
+        cases.append(Case(
+            "explain_recommendation", n_tickers,
+            lambda: [explain_recommendation(df, 0.1) for df in with_indicators]
+        ))
+
+    return cases
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def run_suite(
+    names: Sequence[str],
+    ticker_counts: Sequence[int],
+    n_bars: int,
+    repeats: int,
+    intraday: bool = False,
+    news_latency: float = 0.0
+) -> Dict:
+    from benchmarks.stub_servers import StubServer
+
+    results = []
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir, StubServer(latency=news_latency) as stub:
+        # Stores and caches resolve relative paths; keep them out of the project
+        os.chdir(workdir)
+        try:
+            for n_tickers in ticker_counts:
+                for case in build_cases(names, n_tickers, n_bars, intraday, stub.url()):
+                    result = measure(case, repeats)
+                    results.append(result)
+                    print(
+                        f"{case.name:<28} {n_tickers:>6} {result['p50_ms']:>10.2f} {result['p95_ms']:>10.2f} "
+                        f"{result['p99_ms']:>10.2f} {result['tickers_per_s']:>10.1f} {result['peak_mb']:>9.2f}",
+                        flush=True,
+                    )
+        finally:
+            os.chdir(cwd)
+
+    return {
+        "meta": {
+            "created_at": datetime.utcnow().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "bars": n_bars,
+            "intraday": intraday,
+            "news_latency": news_latency,
+        },
+        "results": results,
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> bool:
+    """Prints p50 and throughput changes per case; returns False on any regression."""
+    def key(r):
+        return r["case"], r["tickers"]
+
+    old = {key(r): r for r in baseline["results"]}
+    ok = True
+    print(f"\nvs {baseline['meta'].get('commit')} ({baseline['meta'].get('created_at')})")
+    for field in ("bars", "intraday", "news_latency", "cpus"):
+        if baseline["meta"].get(field) != current["meta"].get(field):
+            print(f"warning: {field} differs ({baseline['meta'].get(field)} -> {current['meta'].get(field)})")
+    print(f"{'case':<28} {'tickers':>7} {'p50 old':>10} {'p50 new':>10} {'change':>8}")
+    for r in current["results"]:
+        before = old.get(key(r))
+        if before is None:
+            continue
+        change = r["p50_ms"] / before["p50_ms"] - 1 if before["p50_ms"] else 0.0
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            ok = False
+        print(f"{r['case']:<28} {r['tickers']:>7} {before['p50_ms']:>10.2f} {r['p50_ms']:>10.2f} {change:>+8.0%}{flag}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", nargs="+", choices=CASES, default=CASES)
+    parser.add_argument("--skip", nargs="+", choices=CASES, default=[])
+    parser.add_argument("--tickers", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--bars", type=int, default=1500)
+    parser.add_argument("--intraday", action="store_true", help="5-minute bars instead of daily")
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--news-latency", type=float, default=0.0, help="stub server delay per request, seconds")
+    parser.add_argument("--out", default=os.path.join("benchmarks", "results", "latest.json"))
+    parser.add_argument("--compare", metavar="JSON", help="earlier results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed p50 slowdown before flagging")
+    args = parser.parse_args()
+
+    names = [name for name in args.cases if name not in args.skip]
+    print(f"{'case':<28} {'tickers':>6} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'tickers/s':>10} {'peak MB':>9}")
+    report = run_suite(names, args.tickers, args.bars, args.repeats, args.intraday, args.news_latency)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nresults: {args.out}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if not compare(report, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
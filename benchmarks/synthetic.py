@@ -0,0 +1,80 @@
+"""
+Deterministic synthetic market data and headlines for the benchmarks.
+"""
+from typing import Dict, Iterator
+
+import numpy as np
+import pandas as pd
+
+# Bars per trading day for common intraday frequencies (6.5h US session)
+INTRADAY_BARS_PER_DAY = {"1min": 390, "5min": 78, "15min": 26, "1h": 7}
+
+HEADLINE_WORDS = (
+    "stock shares surge plunge rally slump beat miss earnings guidance upgrade downgrade "
+    "record loss profit growth fears hopes strong weak investors crypto bitcoin market "
+    "lawsuit approval ban soars tumbles great terrible steady outlook not very"
+).split()
+
+
+def synthetic_series(n_bars: int, seed: int = 0, start: str = "2020-01-01", freq: str = "D") -> pd.Series:
+    """Geometric random walk of closing prices."""
+    rng = np.random.default_rng(seed)
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n_bars)))
+    return pd.Series(prices, index=pd.date_range(start, periods=n_bars, freq=freq))
+
+
+def synthetic_daily_series(n_bars: int, seed: int = 0) -> pd.Series:
+    """Daily closes with drift and a yearly cycle, so Prophet has something to fit."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(n_bars)
+    prices = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, n_bars))) + 5 * np.sin(2 * np.pi * t / 365.25)
+    return pd.Series(prices, index=pd.date_range("2019-01-01", periods=n_bars, freq="D"))
+
+
+def _ohlcv(close: np.ndarray, index: pd.DatetimeIndex, rng: np.random.Generator) -> pd.DataFrame:
+    n_bars = len(close)
+    return pd.DataFrame(
+        {
+            "Open": close * (1 + rng.normal(0, 0.005, n_bars)),
+            "High": close * (1 + rng.random(n_bars) * 0.02),
+            "Low": close * (1 - rng.random(n_bars) * 0.02),
+            "Close": close,
+            "Volume": rng.integers(100_000, 1_000_000, n_bars).astype(float),
+        },
+        index=index,
+    )
+
+
+def synthetic_ohlcv(n_bars: int, seed: int = 0) -> pd.DataFrame:
+    """Daily OHLCV bars on a calendar-day index named 'Date'."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n_bars)))
+    return _ohlcv(close, pd.date_range("2020-01-01", periods=n_bars, freq="D", name="Date"), rng)
+
+
+def synthetic_intraday_ohlcv(n_days: int, seed: int = 0, freq: str = "5min") -> pd.DataFrame:
+    """Intraday OHLCV bars for `n_days` weekdays, 09:30-16:00 sessions."""
+    rng = np.random.default_rng(seed)
+    per_day = INTRADAY_BARS_PER_DAY[freq]
+    days = pd.bdate_range("2024-01-02", periods=n_days)
+    offsets = pd.timedelta_range("9h30min", periods=per_day, freq=freq)
+    index = pd.DatetimeIndex((days.values[:, None] + offsets.values[None, :]).ravel(), name="Date")
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, len(index))))
+    return _ohlcv(close, index, rng)
+
+
+def synthetic_universe(n_tickers: int, n_bars: int, intraday: bool = False, freq: str = "5min") -> Dict[str, pd.DataFrame]:
+    """
+    {ticker: OHLCV} for T0000..T{n-1}. Intraday universes interpret n_bars as
+    an approximate bar count and round it to whole sessions.
+    """
+    if intraday:
+        n_days = max(1, n_bars // INTRADAY_BARS_PER_DAY[freq])
+        return {f"T{i:04d}": synthetic_intraday_ohlcv(n_days, i, freq) for i in range(n_tickers)}
+    return {f"T{i:04d}": synthetic_ohlcv(n_bars, i) for i in range(n_tickers)}
+
+
+def synthetic_headlines(n: int, seed: int = 0) -> Iterator[str]:
+    rng = np.random.default_rng(seed)
+    for _ in range(n):
+        yield " ".join(rng.choice(HEADLINE_WORDS, size=rng.integers(6, 16)))
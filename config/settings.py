@@ -0,0 +1,190 @@
+# --- Price store ---
+# Per-ticker columnar price history lives under this directory
+PRICE_STORE_DIR = "data/prices"
+# Legacy per-ticker CSV downloads (data/{ticker}.csv) are migrated from here
+LEGACY_CSV_DIR = "data"
+# First bar to download when a ticker has no stored history yet
+PRICE_HISTORY_START = "2020-01-01"
+# Number of appended part files before a ticker's store is compacted
+PRICE_STORE_MAX_PARTS = 32
+
+# --- Intraday bars ---
+# Finest bars downloaded and stored; larger bar sizes are resampled from them
+INTRADAY_BASE_INTERVAL = "5m"
+# History fetched for a ticker without stored intraday bars (yfinance keeps 60 days of 5m bars)
+INTRADAY_HISTORY_PERIOD = "60d"
+# Bar sizes offered in the dashboard; "1d" uses the daily price store
+BAR_SIZES = ["1d", "4h", "1h", "15m", "5m"]
+# Seconds before the dashboard fetches new intraday bars again
+INTRADAY_REFRESH_SECONDS = 60
+
+# --- Bulk prefetch ---
+# Symbols per grouped yf.download call
+PREFETCH_BATCH_SIZE = 25
+# Grouped downloads in flight at once (each uses yfinance's own download threads)
+PREFETCH_WORKERS = 2
+# Refresh the whole watchlist in the background when the dashboard starts
+PREFETCH_ON_START = True
+
+# --- LSTM model registry ---
+# Per-ticker model versions: {LSTM_REGISTRY_DIR}/{TICKER}/w{window}/v0001.h5 (+ scaler, metadata)
+LSTM_REGISTRY_DIR = "models/registry"
+LSTM_WINDOW_SIZE = 30
+# Retrain once this many new bars have arrived since the model was trained
+LSTM_STALE_AFTER_BARS = 5
+
+# --- Indicators ---
+# Serialized streaming indicator state and computed history per ticker
+INDICATOR_STATE_DIR = "data/indicator_state"
+# Appended history parts per ticker before they are merged back into one file
+INDICATOR_STATE_MAX_PARTS = 32
+
+# --- Ticker universe ---
+STOCK_TICKERS = [
+    "AAPL", "MSFT", "GOOGL", "AMZN", "TSLA",
+    "NVDA", "META", "NFLX", "INTC", "CSCO",
+    "CRM", "ADBE", "ORCL", "IBM", "SAP"
+]
+CRYPTO_TICKERS = [
+    "BTC-USD", "ETH-USD", "ADA-USD", "BNB-USD",
+    "XRP-USD", "SOL-USD", "DOGE-USD", "DOT-USD",
+    "LTC-USD", "AVAX-USD", "MATIC-USD", "LINK-USD"
+]
+# Closes the screener uses as the "forecast" window, same as explain_recommendation's fallback
+SCREENER_LOOKBACK = 30
+
+# --- News providers ---
+NEWSAPI_URL = "https://newsapi.org/v2/everything"
+GNEWS_URL = "https://gnews.io/api/v4/search"
+# Per-request timeout for each provider, in seconds
+NEWS_TIMEOUT_SECONDS = {"newsapi": 5.0, "gnews": 5.0}
+# Start the GNews fallback if NewsAPI has not answered within this many seconds
+NEWS_HEDGE_AFTER_SECONDS = 1.0
+# Pooled connections shared by concurrent news requests
+NEWS_MAX_CONNECTIONS = 20
+
+# --- Sentiment cache ---
+# Fetched and scored articles per ticker are reused for this long
+SENTIMENT_TTL_SECONDS = 15 * 60
+# Headline scores memoized across sessions, keyed by title hash
+SENTIMENT_SCORE_DB = "data/sentiment_scores.sqlite"
+# Bulk scoring: worker processes and texts sent to a worker at a time
+SENTIMENT_WORKERS = 4
+SENTIMENT_CHUNK_SIZE = 500
+
+# --- Sentiment history ---
+SENTIMENT_HISTORY_DB = "data/sentiment_history.sqlite"
+# Buffered summaries are written once this many are waiting or the oldest is this many seconds old
+SENTIMENT_HISTORY_FLUSH_ROWS = 100
+SENTIMENT_HISTORY_FLUSH_SECONDS = 5.0
+# CSV log written by earlier versions of save_sentiment_summary
+LEGACY_SENTIMENT_LOG = "sentiment_log.csv"
+
+# --- Prophet ---
+# Per-ticker Prophet models ({TICKER}.json) and their data fingerprints ({TICKER}.meta.json)
+PROPHET_REGISTRY_DIR = "models/prophet"
+
+# --- Batch forecasts ---
+# Latest forecast per ticker ({TICKER}.parquet) and run reports (runs/*.json)
+FORECAST_STORE_DIR = "data/forecasts"
+FORECAST_DAYS = 30
+# TensorFlow/BLAS threads per batch worker; workers default to cores // this
+FORECAST_THREADS_PER_WORKER = 1
+
+# --- Precompute ---
+# Latest indicators, sentiment and recommendations per ticker, read by the dashboard
+RESULTS_DB = "data/results.sqlite"
+RESULTS_FRAME_DIR = "data/results"
+# Seconds between runs of each precompute stage
+PRECOMPUTE_CADENCE_SECONDS = {
+    "prices": 60,
+    "indicators": 60,
+    "sentiment": 15 * 60,
+    "forecasts": 24 * 60 * 60,
+    "recommendation": 15 * 60,
+}
+# Run the precompute scheduler inside the dashboard server; turn off when
+# `python -m analysis.precompute` runs as its own service
+PRECOMPUTE_IN_APP = True
+# Forecast processes used by the nightly forecasts stage
+PRECOMPUTE_FORECAST_WORKERS = 2
+# Threads for on-demand refreshes of stale results for the ticker on screen
+PRECOMPUTE_REFRESH_WORKERS = 1
+
+# --- Dashboard rendering ---
+# Run only the selected tab's pipeline (hidden tabs render nothing)
+RENDER_ACTIVE_TAB_ONLY = True
+# Seconds between re-reads of the stored forecast, sentiment and recommendation on screen
+RESULTS_POLL_SECONDS = 10
+
+# --- Charts ---
+# Points sent per line: about one per horizontal pixel of the chart
+CHART_WIDTH_PX = 1200
+# "lttb" keeps the visual shape of the line, "minmax" keeps every high and low
+CHART_DOWNSAMPLE = "lttb"
+# Visible date ranges (calendar days, None for the whole history)
+CHART_RANGES = {"1M": 30, "3M": 91, "6M": 182, "1Y": 365, "5Y": 1826, "All": None}
+CHART_DEFAULT_RANGE = "1Y"
+# Downsampled series kept per server process, per (ticker, bar size, range, width)
+CHART_CACHE_ENTRIES = 256
+
+# --- Memory ---
+# Opt-in lean mode: price and indicator frames held as float32 (half the bytes,
+# about 7 significant digits), indicator columns added to the loaded frame in place
+LEAN_MEMORY = False
+
+# --- Frame cache ---
+# Price and indicator frames kept in memory per server process, least recently used evicted first
+FRAME_CACHE_MAX_MB = 512
+# Seconds before a cached daily frame is re-read even if no new bar was stored;
+# intraday frames use INTRADAY_REFRESH_SECONDS
+FRAME_CACHE_TTL_SECONDS = 15 * 60
+
+# --- Start-up ---
+# `python -m utils.startup` fails when app.py's imports take longer than this
+STARTUP_IMPORT_BUDGET_SECONDS = 2.0
+# Imported in the background after the first page render so the first forecast is fast
+PREWARM_ON_START = True
+PREWARM_MODULES = ["sklearn.preprocessing", "keras", "prophet", "matplotlib.pyplot", "yfinance"]
+
+# --- Metrics ---
+# Per-stage and per-HTTP-call timings; spans are no-ops when disabled
+METRICS_ENABLED = True
+METRICS_PREFIX = "dashboard"
+# Histogram bucket upper bounds, in seconds
+METRICS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Recent samples kept per series for the diagnostics panel's percentiles
+METRICS_RECENT_SAMPLES = 256
+# Prometheus text export written after every render (None to disable)
+METRICS_EXPORT_PATH = "data/metrics.prom"
+# Serve /metrics on this local port (None to disable)
+METRICS_HTTP_PORT = None
+
+# --- HTTP client ---
+ALPHA_VANTAGE_URL = "https://www.alphavantage.co/query"
+POLYGON_URL = "https://api.polygon.io"
+# Per provider: token-bucket rate (requests/second) and burst, timeout and
+# retries (seconds), and how long responses stay in the on-disk cache
+HTTP_PROVIDERS = {
+    "default": {"rate": 5.0, "burst": 5, "timeout": 10.0, "retries": 3, "backoff": 0.5, "ttl": 0},
+    # Free tier: 5 requests/minute
+    "alphavantage": {"rate": 5 / 60, "burst": 5, "ttl": 6 * 60 * 60},
+    "polygon": {"rate": 5 / 60, "burst": 5, "ttl": 60 * 60},
+    "newsapi": {"rate": 1.0, "burst": 10, "timeout": NEWS_TIMEOUT_SECONDS["newsapi"], "retries": 1, "ttl": 5 * 60},
+    "gnews": {"rate": 1.0, "burst": 10, "timeout": NEWS_TIMEOUT_SECONDS["gnews"], "retries": 1, "ttl": 5 * 60},
+}
+HTTP_RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Pooled connections per host
+HTTP_POOL_SIZE = 20
+HTTP_CACHE_DB = "data/http_cache.sqlite"
+# Seconds between deletions of a provider's expired responses from the cache
+HTTP_CACHE_PRUNE_SECONDS = 60 * 60
+
+# --- Polygon history ---
+# Bars per aggregates page (Polygon's maximum); long ranges are split into
+# chunks of about this many bars so most chunks are a single page
+POLYGON_PAGE_LIMIT = 50000
+# Chunks fetched concurrently; the provider's token bucket still applies
+POLYGON_WORKERS = 4
+# Range fetched when no start date is given
+POLYGON_DEFAULT_DAYS = 365
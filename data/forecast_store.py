@@ -0,0 +1,71 @@
+import glob
+import json
+import os
+import tempfile
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from config.settings import FORECAST_STORE_DIR
+
+FORECAST_COLUMNS = ["lstm", "prophet", "prophet_lower", "prophet_upper"]
+
+
+def _forecast_path(ticker: str, store_dir: str) -> str:
+    return os.path.join(store_dir, f"{ticker.upper()}.parquet")
+
+
+def write_forecast(ticker: str, forecast: pd.DataFrame, store_dir: str = FORECAST_STORE_DIR) -> str:
+    """
+    Stores the latest forecast for a ticker: one row per future date ('Date'
+    index) with whichever FORECAST_COLUMNS were produced, plus generated_at.
+    Replaces the previous forecast atomically.
+    """
+    os.makedirs(store_dir, exist_ok=True)
+    path = _forecast_path(ticker, store_dir)
+    forecast = forecast.reindex(columns=FORECAST_COLUMNS + ["generated_at"]).astype(
+        {col: "float64" for col in FORECAST_COLUMNS}
+    )
+    forecast.index.name = "Date"
+    # A temp name of its own, so concurrent batches writing one ticker never share it
+    fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=store_dir)
+    os.close(fd)
+    forecast.to_parquet(tmp_path)
+    os.replace(tmp_path, path)
+    return path
+
+
+def read_forecast(ticker: str, store_dir: str = FORECAST_STORE_DIR) -> pd.DataFrame:
+    """
+    Latest stored forecast for a ticker, or an empty frame.
+    """
+    path = _forecast_path(ticker, store_dir)
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=FORECAST_COLUMNS + ["generated_at"])
+    return pd.read_parquet(path)
+
+
+def stored_tickers(store_dir: str = FORECAST_STORE_DIR) -> List[str]:
+    return sorted(os.path.basename(p)[:-len(".parquet")] for p in glob.glob(os.path.join(store_dir, "*.parquet")))
+
+
+def write_run_report(report: Dict, store_dir: str = FORECAST_STORE_DIR) -> str:
+    """
+    Saves a batch run's per-ticker status and timings under {store_dir}/runs/,
+    named by start time plus a unique suffix for runs started in the same second.
+    """
+    runs_dir = os.path.join(store_dir, "runs")
+    os.makedirs(runs_dir, exist_ok=True)
+    stamp = report["started_at"].replace(":", "").replace("-", "")
+    fd, path = tempfile.mkstemp(prefix=f"{stamp}-", suffix=".json", dir=runs_dir)
+    with os.fdopen(fd, "w") as f:
+        json.dump(report, f, indent=2)
+    return path
+
+
+def latest_run_report(store_dir: str = FORECAST_STORE_DIR) -> Optional[Dict]:
+    reports = sorted(glob.glob(os.path.join(store_dir, "runs", "*.json")))
+    if not reports:
+        return None
+    with open(reports[-1]) as f:
+        return json.load(f)
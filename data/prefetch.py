@@ -0,0 +1,233 @@
+"""
+Bulk price prefetch for the whole watchlist.
+
+    python -m data.prefetch --universe all
+    python -m data.prefetch --universe crypto --every 3600
+    python -m data.prefetch --polygon X:BTCUSD --start 2019-01-01 --timespan minute
+
+Tickers are grouped by the date their stored history has to resume from and
+downloaded as multi-symbol yf.download calls of PREFETCH_BATCH_SIZE symbols,
+at most PREFETCH_WORKERS at a time. Each result is split per ticker and
+appended to the price store, so choosing a ticker in the dashboard is a
+local read.
+
+--polygon backfills long Polygon histories (any range and timespan):
+chunks are fetched concurrently and every page is appended to the store
+as it arrives, under the ticker `{symbol}_{multiplier}{timespan}`.
+"""
+import argparse
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from config.settings import (
+    CRYPTO_TICKERS,
+    PREFETCH_BATCH_SIZE,
+    PREFETCH_WORKERS,
+    PRICE_HISTORY_START,
+    PRICE_STORE_DIR,
+    STOCK_TICKERS,
+)
+from data.price_store import append_prices, last_stored_date, stored_needs_update, write_prices
+from utils.market_data import fetch_market_data, iter_polygon_pages
+
+
+def stale_tickers(tickers: Sequence[str], store_dir: str = PRICE_STORE_DIR) -> List[str]:
+    """Tickers whose stored history is missing or older than a day."""
+    return [t for t in tickers if stored_needs_update(t, store_dir)]
+
+
+def plan_batches(
+    tickers: Sequence[str],
+    start: str = PRICE_HISTORY_START,
+    batch_size: int = PREFETCH_BATCH_SIZE,
+    store_dir: str = PRICE_STORE_DIR
+) -> List[Tuple[str, List[str]]]:
+    """
+    Groups tickers by fetch start date (their last stored bar, or `start`)
+    and splits each group into (start, [tickers]) batches.
+    """
+    groups = defaultdict(list)
+    for ticker in dict.fromkeys(t.upper() for t in tickers):
+        last = last_stored_date(ticker, store_dir)
+        groups[start if last is None else last.strftime("%Y-%m-%d")].append(ticker)
+
+    return [
+        (fetch_start, group[i:i + batch_size])
+        for fetch_start, group in sorted(groups.items())
+        for i in range(0, len(group), batch_size)
+    ]
+
+
+def _fetch_batch(fetch_start: str, batch: List[str], store_dir: str) -> Dict[str, int]:
+    frames = fetch_market_data(batch, source="yfinance", start=fetch_start)
+    written = {}
+    for ticker in batch:
+        df = frames.get(ticker)
+        if df is None:
+            print(f"[Prefetch ERROR] {ticker} - no data returned")
+            continue
+        try:
+            written[ticker] = append_prices(ticker, df, store_dir)
+        except Exception as e:
+            print(f"[Prefetch ERROR] {ticker} - {e}")
+    return written
+
+
+def prefetch_prices(
+    tickers: Sequence[str],
+    start: str = PRICE_HISTORY_START,
+    batch_size: int = PREFETCH_BATCH_SIZE,
+    workers: int = PREFETCH_WORKERS,
+    only_stale: bool = True,
+    store_dir: str = PRICE_STORE_DIR,
+    on_done: Optional[Callable[[List[str]], None]] = None
+) -> Dict[str, int]:
+    """
+    Brings the stored history of every ticker up to date with grouped
+    downloads. Returns rows written per ticker that came back with data.
+    `on_done` is called with each group of tickers that is finished: already
+    up to date, or its batch stored (or failed).
+    """
+    on_done = on_done or (lambda finished: None)
+    if only_stale:
+        stale = stale_tickers(tickers, store_dir)
+        on_done([t.upper() for t in tickers if t not in stale])
+        tickers = stale
+    batches = plan_batches(tickers, start, batch_size, store_dir)
+    if not batches:
+        return {}
+
+    written = {}
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="prefetch") as pool:
+        futures = {pool.submit(_fetch_batch, fetch_start, batch, store_dir): batch for fetch_start, batch in batches}
+        for future in as_completed(futures):
+            try:
+                written.update(future.result())
+            finally:
+                on_done(futures[future])
+    return written
+
+
+class PrefetchRun:
+    """
+    prefetch_prices on a background thread. wait(ticker) blocks only until
+    that ticker's batch is stored, not until the whole watchlist is.
+    """
+
+    def __init__(self, tickers: Sequence[str], **kwargs):
+        self.tickers = list(tickers)
+        self.kwargs = kwargs
+        self._done = {t.upper(): threading.Event() for t in self.tickers}
+        self._thread = threading.Thread(target=self._run, name="prefetch", daemon=True)
+
+    def start(self) -> "PrefetchRun":
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        try:
+            prefetch_prices(self.tickers, on_done=self._finish, **self.kwargs)
+        except Exception as e:
+            print(f"[Prefetch ERROR] {e}")
+        finally:
+            self._finish(list(self._done))
+
+    def _finish(self, tickers: List[str]) -> None:
+        for ticker in tickers:
+            self._done[ticker.upper()].set()
+
+    def wait(self, ticker: str, timeout: Optional[float] = None) -> bool:
+        """Waits for one ticker; True at once for tickers outside this run."""
+        done = self._done.get(ticker.upper())
+        return done is None or done.wait(timeout)
+
+    def is_alive(self) -> bool:
+        return self._thread.is_alive()
+
+
+def polygon_ticker(symbol: str, timespan: str = "day", multiplier: int = 1) -> str:
+    """Store key for a Polygon series, e.g. X:BTCUSD minute bars -> X_BTCUSD_1minute."""
+    return f"{symbol.replace(':', '_')}_{multiplier}{timespan}"
+
+
+def backfill_polygon(
+    symbol: str,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    timespan: str = "day",
+    multiplier: int = 1,
+    ticker: Optional[str] = None,
+    replace: bool = False,
+    store_dir: str = PRICE_STORE_DIR
+) -> int:
+    """
+    Streams Polygon aggregates for [start, end] into the price store page by
+    page and returns the number of bars written. Unless `replace` is set, a
+    ticker with stored bars resumes from its last bar, like update_prices.
+    """
+    ticker = ticker or polygon_ticker(symbol, timespan, multiplier)
+    last = None if replace else last_stored_date(ticker, store_dir)
+    if last is not None and (start is None or last > pd.Timestamp(start)):
+        start = last.strftime("%Y-%m-%d")
+
+    written = 0
+    for page in iter_polygon_pages(symbol, start, end, timespan, multiplier):
+        if replace:
+            # The first page replaces whatever was stored, the rest append to it
+            write_prices(ticker, page, store_dir)
+            written += len(page)
+            replace = False
+        else:
+            written += append_prices(ticker, page, store_dir)
+    return written
+
+
+def universe_tickers(universe: str) -> List[str]:
+    tickers = []
+    if universe in ("stocks", "all"):
+        tickers += STOCK_TICKERS
+    if universe in ("crypto", "all"):
+        tickers += CRYPTO_TICKERS
+    return tickers
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--universe", choices=["stocks", "crypto", "all"], default="all")
+    parser.add_argument("--tickers", nargs="*", default=[], metavar="TICKER", help="extra tickers to fetch")
+    parser.add_argument("--batch-size", type=int, default=PREFETCH_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=PREFETCH_WORKERS)
+    parser.add_argument("--all", action="store_true", help="also refetch tickers that are already up to date")
+    parser.add_argument("--every", type=float, metavar="SECONDS", help="keep running, prefetching on this interval")
+    parser.add_argument("--polygon", nargs="+", metavar="SYMBOL", help="backfill Polygon symbols instead, e.g. X:BTCUSD")
+    parser.add_argument("--start", help="first date of the Polygon range (default: resume, or a year back)")
+    parser.add_argument("--end", help="last date of the Polygon range (default: today)")
+    parser.add_argument("--timespan", default="day", choices=["second", "minute", "hour", "day", "week", "month", "quarter", "year"])
+    parser.add_argument("--multiplier", type=int, default=1)
+    parser.add_argument("--replace", action="store_true", help="overwrite stored Polygon history instead of resuming")
+    args = parser.parse_args()
+
+    for symbol in args.polygon or []:
+        start = time.perf_counter()
+        try:
+            bars = backfill_polygon(symbol, args.start, args.end, args.timespan, args.multiplier, replace=args.replace)
+        except Exception as e:
+            print(f"[Prefetch ERROR] {symbol} - {e}")
+            continue
+        print(f"{polygon_ticker(symbol, args.timespan, args.multiplier)}: {bars} bars in {time.perf_counter() - start:.1f}s")
+    if args.polygon:
+        raise SystemExit(0)
+
+    tickers = universe_tickers(args.universe) + args.tickers
+    while True:
+        start = time.perf_counter()
+        written = prefetch_prices(tickers, batch_size=args.batch_size, workers=args.workers, only_stale=not args.all)
+        print(f"Prefetched {len(written)} tickers, {sum(written.values())} new bars in {time.perf_counter() - start:.1f}s")
+        if not args.every:
+            break
+        time.sleep(args.every)
@@ -0,0 +1,318 @@
+import argparse
+import glob
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from config.settings import (
+    INTRADAY_BASE_INTERVAL,
+    INTRADAY_HISTORY_PERIOD,
+    LEGACY_CSV_DIR,
+    PRICE_HISTORY_START,
+    PRICE_STORE_DIR,
+    PRICE_STORE_MAX_PARTS,
+)
+from utils.metrics import http_span
+
+PRICE_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+# Intraday stores hold ~100x more rows than daily ones: half-width prices, integer volume
+COMPACT_DTYPES = {"Open": "float32", "High": "float32", "Low": "float32", "Close": "float32", "Volume": "int64"}
+
+
+def bar_key(ticker: str, interval: str = "1d") -> str:
+    """Store key for a ticker's bars: the ticker itself for daily bars, e.g. BTC-USD_5m otherwise."""
+    return ticker if interval == "1d" else f"{ticker}_{interval}"
+
+
+def _ticker_dir(ticker: str, store_dir: str) -> str:
+    return os.path.join(store_dir, ticker.upper())
+
+
+def _part_paths(ticker: str, store_dir: str) -> List[str]:
+    return sorted(glob.glob(os.path.join(_ticker_dir(ticker, store_dir), "part-*.parquet")))
+
+
+# One lock per stored ticker: the prefetch, precompute and dashboard threads
+# of a process all append to the same stores
+_write_locks: Dict[str, threading.RLock] = {}
+_write_locks_guard = threading.Lock()
+
+
+def _write_lock(ticker: str, store_dir: str) -> threading.RLock:
+    key = os.path.abspath(_ticker_dir(ticker, store_dir))
+    with _write_locks_guard:
+        return _write_locks.setdefault(key, threading.RLock())
+
+
+def _write_part(df: pd.DataFrame, path: str) -> None:
+    # Write to a temp file first so readers never see a half-written part
+    tmp_path = path + ".tmp"
+    df.to_parquet(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def empty_price_frame() -> pd.DataFrame:
+    df = pd.DataFrame({col: pd.Series(dtype="float64") for col in PRICE_COLUMNS})
+    df.index = pd.DatetimeIndex([], name="Date")
+    return df
+
+
+def normalize_ohlcv(df: pd.DataFrame, compact: bool = False) -> pd.DataFrame:
+    """
+    Brings a raw download (e.g. yf.download output) into the store layout:
+    flat OHLCV float64 columns (COMPACT_DTYPES if `compact`) on a sorted,
+    de-duplicated DatetimeIndex named 'Date'.
+    """
+    if df is None or df.empty:
+        return empty_price_frame()
+
+    df = df.copy()
+    # yfinance returns (field, ticker) MultiIndex columns for single downloads too
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = df.columns.get_level_values(0)
+
+    missing = [col for col in PRICE_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"Missing price columns: {missing}")
+
+    df = df[PRICE_COLUMNS].apply(pd.to_numeric, errors="coerce").astype("float64")
+    index = pd.to_datetime(df.index, errors="coerce")
+    if index.tz is not None:
+        index = index.tz_convert("UTC").tz_localize(None)
+    df.index = index
+    df.index.name = "Date"
+    df = df[df.index.notna()]
+    df = df[~df.index.duplicated(keep="last")].sort_index()
+    if compact:
+        df = df.assign(Volume=df["Volume"].fillna(0).round()).astype(COMPACT_DTYPES)
+    return df
+
+
+def read_prices(ticker: str, store_dir: str = PRICE_STORE_DIR) -> pd.DataFrame:
+    """
+    Loads the stored price history for a ticker. Returns an empty frame if nothing is stored.
+    """
+    parts = _part_paths(ticker, store_dir)
+    if not parts:
+        return empty_price_frame()
+
+    frames = [pd.read_parquet(path) for path in parts]
+    if len(frames) == 1:
+        return frames[0]
+
+    # Later parts win: an append may re-deliver the last (possibly partial) bar
+    df = pd.concat(frames)
+    return df[~df.index.duplicated(keep="last")].sort_index()
+
+
+def last_stored_date(ticker: str, store_dir: str = PRICE_STORE_DIR) -> Optional[pd.Timestamp]:
+    """
+    Returns the timestamp of the newest stored bar, or None if nothing is stored.
+    Only the newest part is read since parts are appended in time order.
+    """
+    parts = _part_paths(ticker, store_dir)
+    if not parts:
+        return None
+    tail = pd.read_parquet(parts[-1], columns=["Close"])
+    if tail.empty:
+        return None
+    return tail.index.max()
+
+
+def stored_version(ticker: str, store_dir: str = PRICE_STORE_DIR) -> Optional[Tuple[str, int]]:
+    """
+    Change marker for a ticker's stored bars: the newest part's name and
+    modification time, or None if nothing is stored. Every append writes a
+    new part, so a rewritten last (partial) bar changes it too. Nothing is read.
+    """
+    parts = _part_paths(ticker, store_dir)
+    if not parts:
+        return None
+    try:
+        return os.path.basename(parts[-1]), os.stat(parts[-1]).st_mtime_ns
+    except FileNotFoundError:
+        # Removed by a compaction since the listing
+        return None
+
+
+def write_prices(ticker: str, df: pd.DataFrame, store_dir: str = PRICE_STORE_DIR, compact: bool = False) -> None:
+    """
+    Replaces the stored history for a ticker with `df` as a single part.
+    """
+    df = normalize_ohlcv(df, compact)
+    ticker_dir = _ticker_dir(ticker, store_dir)
+    os.makedirs(ticker_dir, exist_ok=True)
+
+    with _write_lock(ticker, store_dir):
+        old_parts = _part_paths(ticker, store_dir)
+        _write_part(df, os.path.join(ticker_dir, "part-00000.parquet"))
+        for path in old_parts:
+            if os.path.basename(path) != "part-00000.parquet":
+                os.remove(path)
+
+
+def append_prices(ticker: str, new_bars: pd.DataFrame, store_dir: str = PRICE_STORE_DIR, compact: bool = False) -> int:
+    """
+    Appends bars at or after the last stored bar as a new part file.
+    Returns the number of rows written. Writers of one ticker in this
+    process take turns, so concurrent appends never pick the same part.
+    """
+    new_bars = normalize_ohlcv(new_bars, compact)
+    with _write_lock(ticker, store_dir):
+        last = last_stored_date(ticker, store_dir)
+        if last is None:
+            write_prices(ticker, new_bars, store_dir, compact)
+            return len(new_bars)
+
+        # Keep the last stored bar too, it may have been a partial (intraday) bar
+        new_bars = new_bars[new_bars.index >= last]
+        if new_bars.empty:
+            return 0
+
+        parts = _part_paths(ticker, store_dir)
+        next_part = int(os.path.basename(parts[-1])[5:10]) + 1
+        _write_part(new_bars, os.path.join(_ticker_dir(ticker, store_dir), f"part-{next_part:05d}.parquet"))
+
+        if len(parts) + 1 > PRICE_STORE_MAX_PARTS:
+            compact_prices(ticker, store_dir)
+        return len(new_bars)
+
+
+def compact_prices(ticker: str, store_dir: str = PRICE_STORE_DIR) -> None:
+    """
+    Merges all appended parts of a ticker back into a single part.
+    """
+    with _write_lock(ticker, store_dir):
+        df = read_prices(ticker, store_dir)
+        if not df.empty:
+            write_prices(ticker, df, store_dir, compact=df["Close"].dtype == "float32")
+
+
+def _older_than(last: Optional[pd.Timestamp], max_age_days: int) -> bool:
+    if last is None:
+        return True
+    return (pd.Timestamp.today().normalize() - last.normalize()).days >= max_age_days
+
+
+def needs_update(df: pd.DataFrame, max_age_days: int = 1) -> bool:
+    """
+    True if the newest bar in `df` is older than `max_age_days` calendar days.
+    """
+    return _older_than(None if df.empty else df.index[-1], max_age_days)
+
+
+def stored_needs_update(ticker: str, store_dir: str = PRICE_STORE_DIR, max_age_days: int = 1) -> bool:
+    """`needs_update` for a ticker's stored history, reading only its newest part."""
+    return _older_than(last_stored_date(ticker, store_dir), max_age_days)
+
+
+def update_prices(
+    ticker: str,
+    start: str = PRICE_HISTORY_START,
+    store_dir: str = PRICE_STORE_DIR
+) -> pd.DataFrame:
+    """
+    Brings the stored history for a ticker up to date and returns it.
+    A ticker without history is downloaded from `start`; otherwise only bars
+    from the last stored date onward are fetched and appended.
+    """
+    last = last_stored_date(ticker, store_dir)
+    fetch_start = start if last is None else last.strftime("%Y-%m-%d")
+
+    import yfinance as yf
+
+    with http_span("yfinance", ticker=ticker.upper()):
+        bars = yf.download(ticker, start=fetch_start, progress=False)
+    if bars is None or bars.empty:
+        return read_prices(ticker, store_dir)
+
+    append_prices(ticker, bars, store_dir)
+    return read_prices(ticker, store_dir)
+
+
+def update_intraday_prices(
+    ticker: str,
+    interval: str = INTRADAY_BASE_INTERVAL,
+    period: str = INTRADAY_HISTORY_PERIOD,
+    store_dir: str = PRICE_STORE_DIR
+) -> pd.DataFrame:
+    """
+    Brings the compact intraday store (`bar_key(ticker, interval)`) up to date
+    and returns it. The last `period` is downloaded when nothing recent is
+    stored, otherwise bars from the last stored day onward.
+    """
+    key = bar_key(ticker, interval)
+    last = last_stored_date(key, store_dir)
+
+    import yfinance as yf
+
+    with http_span("yfinance", ticker=ticker.upper()):
+        # yfinance only serves intraday bars from the last `period`
+        if last is None or pd.Timestamp.utcnow().tz_localize(None) - last >= pd.Timedelta(period):
+            bars = yf.download(ticker, period=period, interval=interval, progress=False)
+        else:
+            bars = yf.download(ticker, start=last.strftime("%Y-%m-%d"), interval=interval, progress=False)
+    if bars is not None and not bars.empty:
+        append_prices(key, bars, store_dir, compact=True)
+    return read_prices(key, store_dir)
+
+
+def read_legacy_csv(csv_path: str) -> pd.DataFrame:
+    """
+    Parses a CSV written by `yf.download(...).to_csv()`, which has two junk
+    header rows (ticker / 'Date') under the 'Price' header.
+    """
+    df = pd.read_csv(csv_path, header=0, skiprows=[1, 2])
+    if "Price" in df.columns:
+        df.rename(columns={"Price": "Date"}, inplace=True)
+    if "Date" not in df.columns:
+        raise ValueError(f"No date column found in {csv_path}")
+
+    df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
+    df.dropna(subset=["Date"], inplace=True)
+    df.set_index("Date", inplace=True)
+    return normalize_ohlcv(df)
+
+
+def migrate_csv(csv_path: str, ticker: str, store_dir: str = PRICE_STORE_DIR) -> pd.DataFrame:
+    """
+    One-time import of a legacy per-ticker CSV into the price store.
+    """
+    df = read_legacy_csv(csv_path)
+    if not df.empty:
+        write_prices(ticker, df, store_dir)
+    return df
+
+
+def migrate_legacy_csvs(csv_dir: str = LEGACY_CSV_DIR, store_dir: str = PRICE_STORE_DIR) -> List[str]:
+    """
+    Migrates every `{ticker}.csv` in `csv_dir` that has no stored history yet.
+    Returns the migrated tickers.
+    """
+    migrated = []
+    for csv_path in sorted(glob.glob(os.path.join(csv_dir, "*.csv"))):
+        ticker = os.path.splitext(os.path.basename(csv_path))[0]
+        if _part_paths(ticker, store_dir):
+            continue
+        try:
+            if not migrate_csv(csv_path, ticker, store_dir).empty:
+                migrated.append(ticker)
+        except Exception as e:
+            print(f"[PriceStore ERROR] {csv_path} - {e}")
+    return migrated
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the columnar price store.")
+    parser.add_argument("--migrate", action="store_true", help="import legacy data/{ticker}.csv files")
+    parser.add_argument("--update", nargs="*", default=[], metavar="TICKER", help="fetch new bars for tickers")
+    args = parser.parse_args()
+
+    if args.migrate:
+        for ticker in migrate_legacy_csvs():
+            print(f"Migrated {ticker}")
+    for ticker in args.update:
+        df = update_prices(ticker)
+        print(f"{ticker}: {len(df)} bars, last {df.index[-1] if not df.empty else 'n/a'}")
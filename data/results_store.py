@@ -0,0 +1,137 @@
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from config.settings import RESULTS_DB, RESULTS_FRAME_DIR
+
+
+class ResultsStore:
+    """
+    Latest precomputed result per (ticker, stage), written by analysis.precompute
+    and read by the dashboard.
+
+    Small results (sentiment, recommendation) are JSON rows in SQLite; frames
+    (indicators) are Parquet files under {frame_dir}/{stage}/{TICKER}.parquet,
+    replaced atomically. Every write also records when and how long it took,
+    for the dashboard's freshness table. Every attempt, failed or not, is
+    recorded too, so a failing stage is retried on its cadence, not on
+    every dashboard poll. WAL mode lets the dashboard read while the
+    precompute job writes.
+    """
+
+    def __init__(self, db_path: str = RESULTS_DB, frame_dir: str = RESULTS_FRAME_DIR):
+        self.db_path = db_path
+        self.frame_dir = frame_dir
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "ticker TEXT NOT NULL, stage TEXT NOT NULL, computed_at TEXT NOT NULL, "
+            "seconds REAL, value TEXT, PRIMARY KEY (ticker, stage))"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS attempts ("
+            "ticker TEXT NOT NULL, stage TEXT NOT NULL, attempted_at TEXT NOT NULL, "
+            "error TEXT, PRIMARY KEY (ticker, stage))"
+        )
+        self._db.commit()
+
+    def _record(self, ticker: str, stage: str, seconds: Optional[float], value: Optional[str]) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                (ticker.upper(), stage, datetime.utcnow().isoformat(timespec="seconds"), seconds, value),
+            )
+            self._db.commit()
+
+    def put(self, ticker: str, stage: str, value: Dict, seconds: Optional[float] = None) -> None:
+        self._record(ticker, stage, seconds, json.dumps(value))
+
+    def get(self, ticker: str, stage: str) -> Optional[Dict]:
+        """Stored value with its 'computed_at' added, or None."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT computed_at, value FROM results WHERE ticker = ? AND stage = ?", (ticker.upper(), stage)
+            ).fetchone()
+        if row is None or row[1] is None:
+            return None
+        return {**json.loads(row[1]), "computed_at": row[0]}
+
+    def _frame_path(self, ticker: str, stage: str) -> str:
+        return os.path.join(self.frame_dir, stage, f"{ticker.upper()}.parquet")
+
+    def put_frame(self, ticker: str, stage: str, df: pd.DataFrame, seconds: Optional[float] = None) -> None:
+        path = self._frame_path(ticker, stage)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # A temp name of its own: the scheduler and dashboard refreshes can write one frame at once
+        fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(path))
+        os.close(fd)
+        df.to_parquet(tmp_path)
+        os.replace(tmp_path, path)
+        self._record(ticker, stage, seconds, None)
+
+    def get_frame(self, ticker: str, stage: str) -> Optional[pd.DataFrame]:
+        path = self._frame_path(ticker, stage)
+        if not os.path.exists(path):
+            return None
+        return pd.read_parquet(path)
+
+    def record_attempts(self, stage: str, tickers: Sequence[str], errors: Dict[str, str]) -> None:
+        """Records a stage run for `tickers`; `errors` maps failed tickers (or "*" for all) to the error."""
+        now = datetime.utcnow().isoformat(timespec="seconds")
+        rows = [(t.upper(), stage, now, errors.get(t, errors.get("*"))) for t in tickers]
+        with self._lock:
+            self._db.executemany("INSERT OR REPLACE INTO attempts VALUES (?, ?, ?, ?)", rows)
+            self._db.commit()
+
+    def last_attempt(self, ticker: str, stage: str) -> Optional[Tuple[str, Optional[str]]]:
+        """(UTC ISO time, error or None) of the latest result or attempt, or None if never tried."""
+        with self._lock:
+            attempt = self._db.execute(
+                "SELECT attempted_at, error FROM attempts WHERE ticker = ? AND stage = ?", (ticker.upper(), stage)
+            ).fetchone()
+            result = self._db.execute(
+                "SELECT computed_at FROM results WHERE ticker = ? AND stage = ?", (ticker.upper(), stage)
+            ).fetchone()
+        if result is not None and (attempt is None or result[0] > attempt[0]):
+            return result[0], None
+        return tuple(attempt) if attempt is not None else None
+
+    def oldest_attempt(self, stage: str, tickers: Sequence[str]) -> Optional[datetime]:
+        """
+        Oldest of the tickers' latest results or attempts for a stage (UTC), or
+        None if any of them was never tried.
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT ticker, MAX(at) FROM ("
+                "SELECT ticker, computed_at AS at FROM results WHERE stage = ? "
+                "UNION ALL SELECT ticker, attempted_at FROM attempts WHERE stage = ?"
+                ") GROUP BY ticker",
+                (stage, stage),
+            ).fetchall()
+        latest = dict(rows)
+        times = [latest.get(t.upper()) for t in tickers]
+        if not times or None in times:
+            return None
+        return datetime.fromisoformat(min(times)).replace(tzinfo=timezone.utc)
+
+    def status(self) -> pd.DataFrame:
+        """When each (ticker, stage) was last computed and how long it took."""
+        with self._lock:
+            return pd.read_sql_query(
+                "SELECT ticker, stage, computed_at, seconds FROM results ORDER BY stage, ticker", self._db
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
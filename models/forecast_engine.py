@@ -0,0 +1,163 @@
+import os
+import threading
+from typing import Callable, Dict, NamedTuple, Sequence, Tuple
+
+import joblib
+import numpy as np
+import pandas as pd
+
+
+def scaler_path_for(model_path: str) -> str:
+    return model_path.replace(".h5", "_scaler.pkl")
+
+
+class LoadedModel(NamedTuple):
+    model: object
+    scaler: object
+    predict: Callable[[np.ndarray], np.ndarray]
+
+
+def _compile_predict(model) -> Callable[[np.ndarray], np.ndarray]:
+    """
+    Wraps the model in a traced tf.function so each step is a single graph call
+    instead of going through Keras' predict() loop (data adapters, callbacks, batching).
+    """
+    import tensorflow as tf
+
+    @tf.function(reduce_retracing=True)
+    def step(x):
+        return model(x, training=False)
+
+    def predict(x: np.ndarray) -> np.ndarray:
+        return step(tf.convert_to_tensor(x, dtype=tf.float32)).numpy()
+
+    return predict
+
+
+class ModelRegistry:
+    """
+    Keeps loaded LSTM models and their scalers resident, keyed by model path.
+    A model file that is replaced on disk (new mtime) is reloaded on next access.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[float, LoadedModel]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, model_path: str) -> LoadedModel:
+        key = os.path.abspath(model_path)
+        mtime = os.path.getmtime(model_path)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+
+            from tensorflow.keras.models import load_model
+
+            model = load_model(model_path, compile=False)
+            scaler = joblib.load(scaler_path_for(model_path))
+            loaded = LoadedModel(model, scaler, _compile_predict(model))
+            self._entries[key] = (mtime, loaded)
+            return loaded
+
+    def evict(self, model_path: str = None) -> None:
+        with self._lock:
+            if model_path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(os.path.abspath(model_path), None)
+
+    def __contains__(self, model_path: str) -> bool:
+        return os.path.abspath(model_path) in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+model_registry = ModelRegistry()
+
+
+def recursive_forecast(loaded: LoadedModel, windows: np.ndarray, days: int) -> np.ndarray:
+    """
+    Rolls `days` one-step predictions forward for a batch of scaled input
+    windows of shape (batch, window_size). Returns scaled forecasts of shape (batch, days).
+    """
+    batch, window_size = windows.shape
+    # Inputs and predictions share one buffer; each step reads a shifted view of it
+    buf = np.empty((batch, window_size + days), dtype=np.float32)
+    buf[:, :window_size] = windows
+
+    for step in range(days):
+        x = buf[:, step:step + window_size, np.newaxis]
+        buf[:, window_size + step] = loaded.predict(x)[:, 0]
+
+    return buf[:, window_size:]
+
+
+def _scale(loaded: LoadedModel, values: np.ndarray) -> np.ndarray:
+    return loaded.scaler.transform(values.reshape(-1, 1)).ravel()
+
+
+def _unscale(loaded: LoadedModel, scaled: np.ndarray) -> np.ndarray:
+    return loaded.scaler.inverse_transform(scaled.reshape(-1, 1)).reshape(scaled.shape)
+
+
+def forecast_batch(
+    price_series_list: Sequence[pd.Series],
+    model_path: str,
+    days: int = 30,
+    window_size: int = 30
+) -> np.ndarray:
+    """
+    Forecasts the next `days` values for several series that share one model.
+    Returns an array of shape (len(price_series_list), days).
+    """
+    loaded = model_registry.get(model_path)
+    windows = np.stack([
+        _scale(loaded, np.asarray(series, dtype=np.float64)[-window_size:])
+        for series in price_series_list
+    ])
+    return _unscale(loaded, recursive_forecast(loaded, windows, days))
+
+
+def forecast_rolling_origins(
+    price_series: pd.Series,
+    model_path: str,
+    origins: Sequence[int],
+    days: int = 30,
+    window_size: int = 30
+) -> np.ndarray:
+    """
+    Forecasts `days` ahead from several points in one series (e.g. for backtests).
+    Each origin is the position of the first forecasted bar; the input window
+    is the `window_size` bars before it. Returns shape (len(origins), days).
+    """
+    loaded = model_registry.get(model_path)
+    scaled = _scale(loaded, np.asarray(price_series, dtype=np.float64))
+    origins = np.asarray(origins)
+    if (origins < window_size).any() or (origins > len(scaled)).any():
+        raise ValueError(f"Origins must lie in [{window_size}, {len(scaled)}].")
+
+    windows = scaled[origins[:, np.newaxis] - window_size + np.arange(window_size)]
+    return _unscale(loaded, recursive_forecast(loaded, windows, days))
+
+
+def forecast_universe(
+    jobs: Dict[str, Tuple[pd.Series, str]],
+    days: int = 30,
+    window_size: int = 30
+) -> Dict[str, np.ndarray]:
+    """
+    Forecasts many tickers at once. `jobs` maps ticker -> (price_series, model_path);
+    tickers that share a model are run through the same batched loop.
+    """
+    by_model: Dict[str, list] = {}
+    for ticker, (series, model_path) in jobs.items():
+        by_model.setdefault(model_path, []).append((ticker, series))
+
+    results = {}
+    for model_path, items in by_model.items():
+        forecasts = forecast_batch([series for _, series in items], model_path, days, window_size)
+        for (ticker, _), forecast in zip(items, forecasts):
+            results[ticker] = forecast
+    return results
@@ -1,30 +1,54 @@
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 import pandas as pd
-import matplotlib.pyplot as plt
-from sklearn.preprocessing import MinMaxScaler
-from keras.models import Sequential
-from keras.layers import LSTM, Dense, Dropout
-from keras.callbacks import EarlyStopping
 import os
 import joblib
 
-def prepare_lstm_data(data: pd.Series, window_size: int = 30):
+from models.forecast_engine import forecast_batch
+
+# Keras, scikit-learn and matplotlib are imported where they are used: they
+# cost seconds at import time and the dashboard only needs them for training
+# or plotting.
+
+def prepare_lstm_data(
+    data: pd.Series,
+    window_size: int = 30,
+    horizon: int = 1,
+    stride: int = 1,
+    dtype=np.float64
+):
     """
     Prepare data for LSTM: scales and windowed sequences.
+
+    X has shape (samples, window_size, 1) and y has shape (samples,) for
+    horizon=1 or (samples, horizon) otherwise. Both are read-only strided
+    views over a single scaled buffer of `dtype`, so no window is copied.
     """
+    from sklearn.preprocessing import MinMaxScaler
+
     scaler = MinMaxScaler()
-    scaled_data = scaler.fit_transform(data.values.reshape(-1, 1))
+    scaled = scaler.fit_transform(np.asarray(data, dtype=np.float64).reshape(-1, 1))
+    scaled = scaled.astype(dtype, copy=False).ravel()
+
+    n_samples = len(scaled) - window_size - horizon + 1
+    if n_samples <= 0:
+        raise ValueError(
+            f"Need more than {window_size + horizon - 1} values for window_size={window_size}, horizon={horizon}."
+        )
 
-    X, y = [], []
-    for i in range(window_size, len(scaled_data)):
-        X.append(scaled_data[i - window_size:i, 0])
-        y.append(scaled_data[i, 0])
+    X = sliding_window_view(scaled[:n_samples + window_size - 1], window_size)[::stride]
+    if horizon == 1:
+        y = scaled[window_size::stride]
+    else:
+        y = sliding_window_view(scaled[window_size:], horizon)[::stride]
 
-    X, y = np.array(X), np.array(y)
-    X = np.reshape(X, (X.shape[0], X.shape[1], 1))
+    X = X[:, :, np.newaxis]
     return X, y, scaler
 
 def build_lstm_model(input_shape):
+    from keras.models import Sequential
+    from keras.layers import LSTM, Dense, Dropout
+
     model = Sequential()
     model.add(LSTM(units=50, return_sequences=True, input_shape=input_shape))
     model.add(Dropout(0.2))
@@ -35,7 +59,10 @@ def build_lstm_model(input_shape):
     return model
 
 def train_lstm_model(price_series: pd.Series, model_path: str = "models/lstm_model.h5", window_size: int = 30):
-    X, y, scaler = prepare_lstm_data(price_series, window_size)
+    from keras.callbacks import EarlyStopping
+
+    # Keras trains in float32; windows in that dtype save it a converted copy
+    X, y, scaler = prepare_lstm_data(price_series, window_size, dtype=np.float32)
     model = build_lstm_model((X.shape[1], 1))
 
     es = EarlyStopping(monitor='loss', patience=10, restore_best_weights=True)
@@ -46,24 +73,12 @@ def train_lstm_model(price_series: pd.Series, model_path: str = "models/lstm_mod
     print(f"LSTM model and scaler saved to {model_path}")
 
 def forecast_next_days(price_series: pd.Series, model_path: str, days: int = 30, window_size: int = 30):
-    from tensorflow.keras.models import load_model
-
-    model = load_model(model_path)
-    scaler = joblib.load(model_path.replace(".h5", "_scaler.pkl"))
-    
-    scaled_data = scaler.transform(price_series.values.reshape(-1, 1))
-    input_seq = scaled_data[-window_size:].reshape(1, window_size, 1)
-    
-    forecasts = []
-    for _ in range(days):
-        pred = model.predict(input_seq)[0, 0]
-        forecasts.append(pred)
-        input_seq = np.append(input_seq[:, 1:, :], [[[pred]]], axis=1)
-
-    forecasts = scaler.inverse_transform(np.array(forecasts).reshape(-1, 1)).flatten()
-    return forecasts
+    # Model and scaler stay loaded in the engine's registry between calls
+    return forecast_batch([price_series], model_path, days=days, window_size=window_size)[0]
 
 def plot_forecast(price_series: pd.Series, forecasted: np.ndarray):
+    import matplotlib.pyplot as plt
+
     forecast_index = pd.date_range(start=price_series.index[-1], periods=len(forecasted)+1, freq='D')[1:]
     forecast_series = pd.Series(forecasted, index=forecast_index)
     
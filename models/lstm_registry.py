@@ -0,0 +1,178 @@
+import glob
+import hashlib
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterator, List, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+from config.settings import (
+    LSTM_REGISTRY_DIR,
+    LSTM_STALE_AFTER_BARS,
+    LSTM_WINDOW_SIZE,
+)
+
+
+class ModelVersion(NamedTuple):
+    ticker: str
+    window_size: int
+    version: int
+    fingerprint: str
+    n_bars: int
+    last_bar: str
+    trained_at: str
+    model_path: str
+
+
+def data_fingerprint(price_series: pd.Series) -> str:
+    """
+    Short content hash of a price series (values and timestamps).
+    """
+    digest = hashlib.sha1()
+    digest.update(np.ascontiguousarray(price_series.values, dtype=np.float64).tobytes())
+    digest.update(pd.DatetimeIndex(price_series.index).asi8.tobytes())
+    return digest.hexdigest()[:16]
+
+
+def _version_dir(ticker: str, window_size: int, registry_dir: str) -> str:
+    return os.path.join(registry_dir, ticker.upper(), f"w{window_size}")
+
+
+@contextmanager
+def _ticker_lock(version_dir: str) -> Iterator[None]:
+    """
+    Exclusive lock on one ticker/window's versions, held across processes
+    (forecast workers of concurrent batches) and released if the holder dies.
+    """
+    os.makedirs(version_dir, exist_ok=True)
+    with open(os.path.join(version_dir, ".lock"), "a+") as f:
+        if os.name == "nt":
+            import msvcrt
+
+            # Locks the file's first byte
+            f.seek(0)
+            while True:
+                try:
+                    # Retries for about 10 seconds before raising
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+        else:
+            import fcntl
+
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if os.name == "nt":
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def list_versions(
+    ticker: str,
+    window_size: int = LSTM_WINDOW_SIZE,
+    registry_dir: str = LSTM_REGISTRY_DIR
+) -> List[ModelVersion]:
+    """
+    All trained versions for a ticker/window, oldest first.
+    """
+    versions = []
+    for meta_path in sorted(glob.glob(os.path.join(_version_dir(ticker, window_size, registry_dir), "v*.json"))):
+        with open(meta_path) as f:
+            versions.append(ModelVersion(**json.load(f)))
+    return sorted(versions, key=lambda v: v.version)
+
+
+def latest_version(
+    ticker: str,
+    window_size: int = LSTM_WINDOW_SIZE,
+    registry_dir: str = LSTM_REGISTRY_DIR
+) -> Optional[ModelVersion]:
+    versions = list_versions(ticker, window_size, registry_dir)
+    return versions[-1] if versions else None
+
+
+def bars_behind(model_version: ModelVersion, price_series: pd.Series) -> int:
+    """
+    Number of bars in `price_series` newer than the model's training data.
+    """
+    return int((price_series.index > pd.Timestamp(model_version.last_bar)).sum())
+
+
+def is_stale(
+    model_version: Optional[ModelVersion],
+    price_series: pd.Series,
+    threshold: int = LSTM_STALE_AFTER_BARS
+) -> bool:
+    if model_version is None:
+        return True
+    if model_version.fingerprint == data_fingerprint(price_series):
+        return False
+    return bars_behind(model_version, price_series) >= threshold
+
+
+def train_version(
+    ticker: str,
+    price_series: pd.Series,
+    window_size: int = LSTM_WINDOW_SIZE,
+    registry_dir: str = LSTM_REGISTRY_DIR
+) -> ModelVersion:
+    """
+    Trains and registers a new model version. Metadata is written last, so a
+    version only becomes visible once its model and scaler are on disk.
+    """
+    version_dir = _version_dir(ticker, window_size, registry_dir)
+    with _ticker_lock(version_dir):
+        return _train_locked(ticker, price_series, window_size, registry_dir)
+
+
+def fresh_version(
+    ticker: str,
+    price_series: pd.Series,
+    window_size: int = LSTM_WINDOW_SIZE,
+    registry_dir: str = LSTM_REGISTRY_DIR
+) -> ModelVersion:
+    """
+    Latest version, retrained first if it is stale for `price_series`. A
+    caller that waited on another process's training reuses that version.
+    """
+    with _ticker_lock(_version_dir(ticker, window_size, registry_dir)):
+        version = latest_version(ticker, window_size, registry_dir)
+        if is_stale(version, price_series):
+            version = _train_locked(ticker, price_series, window_size, registry_dir)
+        return version
+
+
+def _train_locked(ticker: str, price_series: pd.Series, window_size: int, registry_dir: str) -> ModelVersion:
+    from models.lstm_model import train_lstm_model
+
+    version_dir = _version_dir(ticker, window_size, registry_dir)
+    previous = latest_version(ticker, window_size, registry_dir)
+    version = previous.version + 1 if previous else 1
+    model_path = os.path.join(version_dir, f"v{version:04d}.h5")
+
+    train_lstm_model(price_series, model_path=model_path, window_size=window_size)
+
+    model_version = ModelVersion(
+        ticker=ticker.upper(),
+        window_size=window_size,
+        version=version,
+        fingerprint=data_fingerprint(price_series),
+        n_bars=len(price_series),
+        last_bar=str(price_series.index[-1]),
+        trained_at=datetime.utcnow().isoformat(),
+        model_path=model_path,
+    )
+    meta_path = model_path.replace(".h5", ".json")
+    fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=version_dir)
+    with os.fdopen(fd, "w") as f:
+        json.dump(model_version._asdict(), f, indent=2)
+    os.replace(tmp_path, meta_path)
+    return model_version
@@ -1,15 +1,35 @@
-import pandas as pd
-from prophet import Prophet
-import matplotlib.pyplot as plt
+import json
 import os
+import tempfile
+import threading
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
 import joblib
 
+from config.settings import PROPHET_REGISTRY_DIR
+from models.lstm_registry import data_fingerprint
+
+if TYPE_CHECKING:
+    from prophet import Prophet
+
+# prophet (and cmdstanpy) and matplotlib are imported on first use to keep
+# dashboard start-up fast
+
+# Fitted per-ticker models kept in memory: ticker -> (data fingerprint, model)
+_resident: Dict[str, Tuple[str, "Prophet"]] = {}
+_resident_lock = threading.Lock()
+
 def prepare_prophet_data(price_series: pd.Series) -> pd.DataFrame:
     df = price_series.reset_index()
     df.columns = ['ds', 'y']
     return df
 
-def train_prophet_model(price_series: pd.Series, model_path: str = "models/prophet_model.pkl") -> Prophet:
+def train_prophet_model(price_series: pd.Series, model_path: str = "models/prophet_model.pkl") -> "Prophet":
+    from prophet import Prophet
+
     df = prepare_prophet_data(price_series)
     model = Prophet()
     model.fit(df)
@@ -17,20 +37,129 @@ def train_prophet_model(price_series: pd.Series, model_path: str = "models/proph
     print(f"Prophet model saved to {model_path}")
     return model
 
-def forecast_prophet(price_series: pd.Series, days: int = 30, model_path: str = "models/prophet_model.pkl") -> pd.DataFrame:
-    if os.path.exists(model_path):
+def warm_start_params(model: "Prophet") -> Dict[str, object]:
+    """
+    Fitted parameters of a model in the form Prophet.fit(init=...) expects,
+    so a refit on extended data starts from the previous optimum.
+    """
+    params = {}
+    for name in ["k", "m", "sigma_obs"]:
+        values = model.params[name]
+        params[name] = values[0][0] if model.mcmc_samples == 0 else np.mean(values)
+    for name in ["delta", "beta"]:
+        values = model.params[name]
+        params[name] = values[0] if model.mcmc_samples == 0 else np.mean(values, axis=0)
+    return params
+
+
+def fit_prophet(price_series: pd.Series, init: Optional[Dict[str, object]] = None) -> "Prophet":
+    from prophet import Prophet
+
+    model = Prophet()
+    # Prophet treats any init kwarg, even None, as custom inits
+    kwargs = {"init": init} if init is not None else {}
+    model.fit(prepare_prophet_data(price_series), **kwargs)
+    return model
+
+
+def predict_horizon(model: "Prophet", days: int = 30) -> pd.DataFrame:
+    """
+    Forecast for the `days` dates after the training data only; the history
+    is not re-predicted.
+    """
+    future = model.make_future_dataframe(periods=days, include_history=False)
+    return model.predict(future)[['ds', 'yhat', 'yhat_lower', 'yhat_upper']]
+
+
+def _ticker_paths(ticker: str, registry_dir: str) -> Tuple[str, str]:
+    base = os.path.join(registry_dir, ticker.upper())
+    return base + ".json", base + ".meta.json"
+
+
+def get_prophet_model(ticker: str, price_series: pd.Series, registry_dir: str = PROPHET_REGISTRY_DIR) -> "Prophet":
+    """
+    Prophet model for a ticker fitted on exactly `price_series`.
+
+    Models are keyed by the series' data fingerprint: an unchanged series
+    reuses the resident (or stored) model, and a changed one is refitted,
+    warm-started from the ticker's previous parameters when there are any.
+    """
+    ticker = ticker.upper()
+    fingerprint = data_fingerprint(price_series)
+    with _resident_lock:
+        cached = _resident.get(ticker)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+
+    model_path, meta_path = _ticker_paths(ticker, registry_dir)
+    previous = cached[1] if cached is not None else None
+    if previous is None and os.path.exists(model_path):
+        from prophet.serialize import model_from_json
+
+        with open(model_path) as f:
+            previous = model_from_json(f.read())
+        stored_fingerprint = None
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                stored_fingerprint = json.load(f)["fingerprint"]
+        if stored_fingerprint == fingerprint:
+            with _resident_lock:
+                _resident[ticker] = (fingerprint, previous)
+            return previous
+
+    model = fit_prophet(price_series, init=warm_start_params(previous) if previous is not None else None)
+
+    from prophet.serialize import model_to_json
+
+    os.makedirs(registry_dir, exist_ok=True)
+    # Temp names of their own, so two processes fitting one ticker never share one
+    fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=registry_dir)
+    with os.fdopen(fd, "w") as f:
+        f.write(model_to_json(model))
+    os.replace(tmp_path, model_path)
+    # Metadata last, so the fingerprint never describes a half-written model
+    fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=registry_dir)
+    with os.fdopen(fd, "w") as f:
+        json.dump({
+            "ticker": ticker,
+            "fingerprint": fingerprint,
+            "n_bars": len(price_series),
+            "last_bar": str(price_series.index[-1]),
+            "fitted_at": datetime.utcnow().isoformat(),
+            "warm_start": previous is not None,
+        }, f, indent=2)
+    os.replace(tmp_path, meta_path)
+
+    with _resident_lock:
+        _resident[ticker] = (fingerprint, model)
+    return model
+
+
+def forecast_prophet(
+    price_series: pd.Series,
+    days: int = 30,
+    model_path: str = "models/prophet_model.pkl",
+    ticker: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    With a ticker, uses that ticker's model from get_prophet_model. Without
+    one, falls back to the single pickled model at `model_path`.
+    """
+    if ticker is not None:
+        model = get_prophet_model(ticker, price_series)
+    elif os.path.exists(model_path):
         model = joblib.load(model_path)
     else:
         model = train_prophet_model(price_series, model_path)
 
-    last_date = price_series.index[-1]
-    df = prepare_prophet_data(price_series)
-    future = model.make_future_dataframe(periods=days)
-    forecast = model.predict(future)
-    return forecast.tail(days)[['ds', 'yhat', 'yhat_lower', 'yhat_upper']]
+    return predict_horizon(model, days)
 
 def plot_prophet_forecast(price_series: pd.Series, forecast_df: pd.DataFrame):
+    import matplotlib.pyplot as plt
+    from plots.downsample import downsample, figure_width_px
+
     fig, ax = plt.subplots(figsize=(12, 5))
+    price_series = downsample(price_series, figure_width_px(fig))
     ax.plot(price_series.index, price_series.values, label='Historical')
     ax.plot(forecast_df['ds'], forecast_df['yhat'], linestyle='--', label='Forecast')
     ax.fill_between(
@@ -0,0 +1,111 @@
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from config.settings import CHART_DOWNSAMPLE, CHART_WIDTH_PX
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: picks `n_out` of the points (x, y) that
+    keep the visual shape of the line. The first and last points are always kept.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # n_out - 2 buckets between the fixed first and last point
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = x[end:next_end].mean(), y[end:next_end].mean()
+        # Twice the area of the triangle (point a, candidate, next bucket's average)
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        out[i + 1] = a
+    return out
+
+
+def minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Keeps the lowest and highest point of each of n_out / 2 equal buckets, so
+    every spike survives. Cheaper than LTTB; returns at most n_out + 2 indices.
+    """
+    n = len(y)
+    buckets = n_out // 2
+    if n <= n_out or buckets < 1:
+        return np.arange(n)
+
+    size = -(-n // buckets)
+    rows = -(-n // size)
+    padded = np.full(rows * size, np.nan)
+    padded[:n] = y
+    padded = padded.reshape(rows, size)
+    # Padding only ever fills part of the last row, so no row is all NaN
+    starts = np.arange(len(padded)) * size
+    lows = starts + np.nanargmin(padded, axis=1)
+    highs = starts + np.nanargmax(padded, axis=1)
+    return np.unique(np.concatenate([lows, highs, [0, n - 1]]))
+
+
+def downsample(
+    df: pd.DataFrame,
+    n_out: int,
+    method: str = CHART_DOWNSAMPLE,
+    by: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    At most about `n_out` rows of a time-indexed frame. Rows are chosen on
+    column `by` (the first column by default) and kept whole, so every series
+    of a chart stays on the same x values. Rows with a NaN in `by` are dropped.
+    """
+    if isinstance(df, pd.Series):
+        return downsample(df.to_frame(), n_out, method).iloc[:, 0]
+
+    column = df[by or df.columns[0]]
+    if column.hasnans:
+        df = df[column.notna().to_numpy()]
+    if len(df) <= n_out:
+        return df
+
+    y = df[by or df.columns[0]].to_numpy(dtype=np.float64)
+    if method == "lttb":
+        x = df.index.asi8.astype(np.float64) if isinstance(df.index, pd.DatetimeIndex) else np.arange(len(df), dtype=np.float64)
+        indices = lttb_indices(x, y, n_out)
+    elif method == "minmax":
+        indices = minmax_indices(y, n_out)
+    else:
+        raise ValueError(f"Unknown downsampling method: {method}")
+    return df.iloc[indices]
+
+
+def visible_range(df: pd.DataFrame, days: Optional[int]) -> pd.DataFrame:
+    """The last `days` calendar days of a time-indexed frame (all of it if None)."""
+    if days is None or df.empty:
+        return df
+    start = df.index[-1] - pd.Timedelta(days=days)
+    return df.iloc[df.index.searchsorted(start):]
+
+
+def chart_frame(
+    df: pd.DataFrame,
+    columns: Sequence[str],
+    days: Optional[int] = None,
+    width_px: int = CHART_WIDTH_PX,
+    method: str = CHART_DOWNSAMPLE
+) -> pd.DataFrame:
+    """
+    What a line chart of `columns` over the last `days` needs: about one
+    point per horizontal pixel, however many bars the range spans.
+    """
+    return downsample(visible_range(df, days)[list(columns)], width_px, method)
+
+
+def figure_width_px(fig) -> int:
+    """Horizontal pixels of a matplotlib figure, the point budget for its lines."""
+    return int(fig.get_figwidth() * fig.dpi)
@@ -1,7 +1,12 @@
 import matplotlib.pyplot as plt
 
+from plots.downsample import downsample, figure_width_px
+
 def plot_price_and_moving_averages(df, title="Price + SMA/EMA"):
-    plt.figure(figsize=(12, 5))
+    fig = plt.figure(figsize=(12, 5))
+    # No more points per line than the figure has pixels across
+    columns = [c for c in ["Close", "SMA_20", "SMA_50", "EMA_20"] if c in df]
+    df = downsample(df[columns], figure_width_px(fig))
     plt.plot(df["Close"], label="Close Price", color="black")
     if "SMA_20" in df:
         plt.plot(df["SMA_20"], label="SMA 20", linestyle="--")
@@ -21,8 +26,8 @@ def plot_rsi(df):
     if "RSI" not in df:
         print("[INFO] RSI not found in DataFrame.")
         return
-    plt.figure(figsize=(12, 3))
-    plt.plot(df["RSI"], label="RSI", color="purple")
+    fig = plt.figure(figsize=(12, 3))
+    plt.plot(downsample(df["RSI"], figure_width_px(fig)), label="RSI", color="purple")
     plt.axhline(70, color="red", linestyle="--")
     plt.axhline(30, color="green", linestyle="--")
     plt.title("Relative Strength Index (RSI)")
@@ -36,8 +41,8 @@ def plot_macd(df):
     if "MACD" not in df:
         print("[INFO] MACD not found in DataFrame.")
         return
-    plt.figure(figsize=(12, 3))
-    plt.plot(df["MACD"], label="MACD", color="blue")
+    fig = plt.figure(figsize=(12, 3))
+    plt.plot(downsample(df["MACD"], figure_width_px(fig)), label="MACD", color="blue")
     plt.axhline(0, color="black", linestyle="--")
     plt.title("MACD")
     plt.xlabel("Date")
@@ -0,0 +1,128 @@
+import asyncio
+from typing import Dict, Iterable, List, Optional
+
+import aiohttp
+
+from config.settings import (
+    GNEWS_URL,
+    NEWSAPI_URL,
+    NEWS_HEDGE_AFTER_SECONDS,
+    NEWS_MAX_CONNECTIONS,
+    NEWS_TIMEOUT_SECONDS,
+)
+from utils.http_client import HttpClient, get_http_client
+from utils.metrics import http_span
+from utils.news_api import gnews_params, newsapi_params, parse_articles
+
+
+class AsyncNewsClient:
+    """
+    Concurrent news fetcher over one pooled aiohttp session.
+
+    Each query asks NewsAPI first. If NewsAPI has not answered after
+    `hedge_after` seconds (or answers with nothing), GNews is started as
+    well and whichever provider returns articles first wins. Worst-case
+    latency is bounded by the slower provider's timeout instead of the sum
+    of both. Provider URLs can be pointed at a local stub server.
+
+    Requests take tokens from the same per-provider buckets as the
+    synchronous fetchers (`http_client`, default get_http_client()), so
+    HTTP_PROVIDERS[...]["rate"] holds across both, hedged requests included.
+
+        async with AsyncNewsClient() as client:
+            results = await client.fetch_many(["AAPL", "MSFT"])
+    """
+
+    def __init__(
+        self,
+        newsapi_url: str = NEWSAPI_URL,
+        gnews_url: str = GNEWS_URL,
+        timeouts: Optional[Dict[str, float]] = None,
+        hedge_after: float = NEWS_HEDGE_AFTER_SECONDS,
+        max_connections: int = NEWS_MAX_CONNECTIONS,
+        http_client: Optional[HttpClient] = None
+    ):
+        self.newsapi_url = newsapi_url
+        self.gnews_url = gnews_url
+        self.timeouts = {**NEWS_TIMEOUT_SECONDS, **(timeouts or {})}
+        self.hedge_after = hedge_after
+        self.max_connections = max_connections
+        self.http_client = http_client if http_client is not None else get_http_client()
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self) -> "AsyncNewsClient":
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.max_connections)
+        )
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self._session.close()
+        self._session = None
+
+    async def _get_articles(self, provider: str, url: str, params: Dict, query: str) -> List[Dict]:
+        try:
+            timeout = aiohttp.ClientTimeout(total=self.timeouts[provider])
+            # requests silently drops None params (e.g. a missing API key); aiohttp rejects them
+            params = {k: v for k, v in params.items() if v is not None}
+            wait = self.http_client.bucket(provider).reserve()
+            if wait:
+                self.http_client.stats["throttled_seconds"] += wait
+                await asyncio.sleep(wait)
+            # A hedged request that loses the race is cancelled and counted as an error
+            with http_span(provider, ticker=query):
+                async with self._session.get(url, params=params, timeout=timeout) as response:
+                    response.raise_for_status()
+                    return parse_articles(await response.json(content_type=None))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[{provider} ERROR] {query} - {e!r}")
+            return []
+
+    async def fetch_newsapi(self, query: str, language: str = "en", limit: int = 5) -> List[Dict]:
+        return await self._get_articles("newsapi", self.newsapi_url, newsapi_params(query, language, limit), query)
+
+    async def fetch_gnews(self, query: str, language: str = "en", limit: int = 5) -> List[Dict]:
+        return await self._get_articles("gnews", self.gnews_url, gnews_params(query, language, limit), query)
+
+    async def fetch(self, query: str, language: str = "en", limit: int = 5) -> List[Dict]:
+        """
+        Articles for one query from whichever provider answers first with results.
+        """
+        primary = asyncio.create_task(self.fetch_newsapi(query, language, limit))
+        done, _ = await asyncio.wait({primary}, timeout=self.hedge_after)
+        if done and primary.result():
+            return primary.result()
+
+        # NewsAPI is slow or came back empty: race it against GNews
+        pending = {primary, asyncio.create_task(self.fetch_gnews(query, language, limit))}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.result():
+                        return task.result()
+            return []
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def fetch_many(self, queries: Iterable[str], language: str = "en", limit: int = 5) -> Dict[str, List[Dict]]:
+        """
+        Fetches all queries concurrently; connection reuse is capped by the session pool.
+        """
+        queries = list(dict.fromkeys(queries))
+        results = await asyncio.gather(*(self.fetch(q, language, limit) for q in queries))
+        return dict(zip(queries, results))
+
+
+def fetch_news_many(queries: Iterable[str], language: str = "en", limit: int = 5, **client_kwargs) -> Dict[str, List[Dict]]:
+    """
+    Synchronous entry point: fetches news for many tickers concurrently.
+    """
+    async def run():
+        async with AsyncNewsClient(**client_kwargs) as client:
+            return await client.fetch_many(queries, language, limit)
+
+    return asyncio.run(run())
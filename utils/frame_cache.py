@@ -0,0 +1,117 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, NamedTuple, Optional
+
+import pandas as pd
+
+from config.settings import FRAME_CACHE_MAX_MB, FRAME_CACHE_TTL_SECONDS
+from utils.memory import frame_bytes
+
+
+class _Entry(NamedTuple):
+    frame: pd.DataFrame
+    nbytes: int
+    expires_at: float
+    last_bar: Hashable
+
+
+class FrameCache:
+    """
+    In-memory LRU cache of price and indicator frames with a byte budget.
+
+    - put() stores a frame with a TTL and a `last_bar` marker (by default the
+      timestamp of its last row). get() with the caller's current marker
+      treats a different one as stale, so new bars are noticed on the next
+      read, not when the TTL runs out.
+    - Least recently used frames are evicted once the resident frames
+      exceed `max_bytes`; a frame bigger than the whole budget is not kept.
+    - Hits are zero-copy and read-only: the caller gets a shallow copy that
+      shares the cached data, and pandas copy-on-write keeps any change the
+      caller makes (new columns included) out of the cached frame. This
+      relies on copy-on-write being always on, hence pandas>=3.
+    """
+
+    def __init__(self, max_bytes: int = FRAME_CACHE_MAX_MB * 2**20, ttl: float = FRAME_CACHE_TTL_SECONDS):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expired": 0, "invalidated": 0, "rejected": 0}
+
+    def get(self, key: Hashable, last_bar: Optional[Hashable] = None) -> Optional[pd.DataFrame]:
+        """
+        The cached frame, or None if missing, expired, or (when `last_bar` is
+        given) cached for a different last bar.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            if time.monotonic() >= entry.expires_at:
+                self._drop(key)
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return None
+            if last_bar is not None and last_bar != entry.last_bar:
+                self._drop(key)
+                self._stats["invalidated"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry.frame.copy(deep=False)
+
+    def put(
+        self,
+        key: Hashable,
+        df: pd.DataFrame,
+        last_bar: Optional[Hashable] = None,
+        ttl: Optional[float] = None
+    ) -> pd.DataFrame:
+        """Caches `df` and returns a read-only view of it for the caller to use."""
+        if last_bar is None and len(df):
+            last_bar = df.index[-1]
+        nbytes = frame_bytes(df)
+        # The cache keeps its own shallow copy, so later changes to `df` stay out of it
+        entry = _Entry(df.copy(deep=False), nbytes, time.monotonic() + (self.ttl if ttl is None else ttl), last_bar)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            if nbytes > self.max_bytes:
+                self._stats["rejected"] += 1
+                return df
+            self._entries[key] = entry
+            self._bytes += nbytes
+            while self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self._stats["evictions"] += 1
+        return entry.frame.copy(deep=False)
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drops one key, or everything."""
+        with self._lock:
+            for k in [key] if key is not None else list(self._entries):
+                if k in self._entries:
+                    self._drop(k)
+
+    def _drop(self, key: Hashable) -> None:
+        self._bytes -= self._entries.pop(key).nbytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict:
+        """Hit rate, eviction counts and resident bytes since this cache was created."""
+        with self._lock:
+            stats = dict(self._stats)
+            lookups = stats["hits"] + stats["misses"]
+            stats.update(
+                hit_rate=round(stats["hits"] / lookups, 4) if lookups else 0.0,
+                entries=len(self._entries),
+                resident_bytes=self._bytes,
+                max_bytes=self.max_bytes,
+            )
+        return stats
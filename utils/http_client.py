@@ -0,0 +1,247 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config.settings import (
+    HTTP_CACHE_DB,
+    HTTP_CACHE_PRUNE_SECONDS,
+    HTTP_POOL_SIZE,
+    HTTP_PROVIDERS,
+    HTTP_RETRY_STATUSES,
+)
+from utils.metrics import http_span
+
+# Query parameters that carry credentials: never part of a cache key
+SECRET_PARAMS = {"apikey", "api_key", "token", "access_token"}
+# Top-level keys of error and rate-limit bodies sent with HTTP 200
+# (Alpha Vantage: Note/Information/Error Message, Polygon: error, GNews: errors)
+ERROR_KEYS = ("Note", "Information", "Error Message", "error", "errors")
+
+
+def is_error_body(data: Any) -> bool:
+    """True for a provider's error or rate-limit reply, which must not be cached."""
+    if not isinstance(data, dict):
+        return False
+    # NewsAPI and Polygon also flag errors in "status"
+    return any(key in data for key in ERROR_KEYS) or str(data.get("status", "")).lower() in ("error", "not_authorized")
+
+
+class TokenBucket:
+    """
+    Allows `rate` requests per second on average with bursts of up to
+    `capacity`. acquire() blocks until a token is available.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Takes one token; returns how long the caller waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def reserve(self) -> float:
+        """
+        Takes one token without blocking, borrowing against future refills if
+        none is left; returns how long the caller must wait before using it.
+        For asyncio callers, which sleep on their own.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+
+class ResponseCache:
+    """JSON responses on disk (SQLite), keyed by provider + URL + non-secret params."""
+
+    def __init__(self, db_path: str = HTTP_CACHE_DB):
+        self.db_path = db_path
+        self._db = None
+        self._lock = threading.Lock()
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, provider TEXT, stored_at REAL, body TEXT)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_responses_age ON responses (provider, stored_at)")
+            self._db.commit()
+        return self._db
+
+    @staticmethod
+    def key(provider: str, url: str, params: Optional[Dict]) -> str:
+        public = sorted((k, str(v)) for k, v in (params or {}).items() if k.lower() not in SECRET_PARAMS)
+        return hashlib.sha1(json.dumps([provider, url, public]).encode("utf-8")).hexdigest()
+
+    def get(self, key: str, ttl: float):
+        with self._lock:
+            row = self._conn().execute("SELECT stored_at, body FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None or time.time() - row[0] > ttl:
+            return None
+        return json.loads(row[1])
+
+    def put(self, key: str, provider: str, data) -> None:
+        with self._lock:
+            db = self._conn()
+            db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)", (key, provider, time.time(), json.dumps(data)))
+            db.commit()
+
+    def prune(self, provider: str, max_age: float) -> int:
+        """Deletes a provider's responses older than `max_age` seconds; returns how many."""
+        with self._lock:
+            db = self._conn()
+            deleted = db.execute(
+                "DELETE FROM responses WHERE provider = ? AND stored_at < ?", (provider, time.time() - max_age)
+            ).rowcount
+            db.commit()
+        return deleted
+
+    def clear(self, provider: Optional[str] = None) -> None:
+        with self._lock:
+            db = self._conn()
+            if provider is None:
+                db.execute("DELETE FROM responses")
+            else:
+                db.execute("DELETE FROM responses WHERE provider = ?", (provider,))
+            db.commit()
+
+
+class HttpClient:
+    """
+    Shared HTTP layer for the market data and news providers:
+
+    - one pooled requests.Session for every provider
+    - a token bucket per provider (HTTP_PROVIDERS[...]["rate"], ["burst"])
+    - retries with exponential backoff on connection errors, timeouts and
+      HTTP_RETRY_STATUSES, honouring Retry-After
+    - an on-disk JSON response cache with a per-provider TTL, so the same
+      symbol/range is fetched once per TTL no matter how often the
+      dashboard reruns; error and rate-limit bodies are never cached, and
+      expired rows are deleted every HTTP_CACHE_PRUNE_SECONDS
+
+    Unknown providers get HTTP_PROVIDERS["default"].
+    """
+
+    def __init__(self, providers: Dict[str, Dict] = HTTP_PROVIDERS, cache: Optional[ResponseCache] = None):
+        self.providers = providers
+        self.cache = cache if cache is not None else ResponseCache()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._pruned_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.stats = {"cache_hits": 0, "requests": 0, "retries": 0, "throttled_seconds": 0.0}
+
+    def config(self, provider: str) -> Dict:
+        return {**self.providers["default"], **self.providers.get(provider, {})}
+
+    def bucket(self, provider: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(provider)
+            if bucket is None:
+                config = self.config(provider)
+                bucket = self._buckets[provider] = TokenBucket(config["rate"], config["burst"])
+            return bucket
+
+    def get(self, provider: str, url: str, params: Optional[Dict] = None, **labels) -> requests.Response:
+        """GET with the provider's rate limit, timeout and retry policy (no caching)."""
+        config = self.config(provider)
+        params = {k: v for k, v in (params or {}).items() if v is not None}
+        attempts = config["retries"] + 1
+        for attempt in range(attempts):
+            self.stats["throttled_seconds"] += self.bucket(provider).acquire()
+            self.stats["requests"] += 1
+            retry_after = None
+            try:
+                with http_span(provider, **labels):
+                    response = self.session.get(url, params=params, timeout=config["timeout"])
+                if response.status_code not in HTTP_RETRY_STATUSES or attempt == attempts - 1:
+                    response.raise_for_status()
+                    return response
+                retry_after = response.headers.get("Retry-After")
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == attempts - 1:
+                    raise
+            self.stats["retries"] += 1
+            delay = config["backoff"] * 2 ** attempt
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, float(retry_after))
+            time.sleep(delay)
+        raise RuntimeError("unreachable")
+
+    def get_json(
+        self,
+        provider: str,
+        url: str,
+        params: Optional[Dict] = None,
+        ttl: Optional[float] = None,
+        cache_if: Optional[Callable[[Any], bool]] = None,
+        **labels
+    ):
+        """
+        Decoded JSON body, served from the on-disk cache when a response for
+        the same request is younger than `ttl` (default: the provider's TTL).
+        Only bodies passing `cache_if` (default: not `is_error_body`) are cached.
+        """
+        ttl = self.config(provider)["ttl"] if ttl is None else ttl
+        key = ResponseCache.key(provider, url, params)
+        if ttl > 0:
+            cached = self.cache.get(key, ttl)
+            if cached is not None:
+                self.stats["cache_hits"] += 1
+                return cached
+
+        data = self.get(provider, url, params, **labels).json()
+        if ttl > 0 and (cache_if(data) if cache_if is not None else not is_error_body(data)):
+            self.cache.put(key, provider, data)
+            self._prune(provider, ttl)
+        return data
+
+    def _prune(self, provider: str, ttl: float) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if now - self._pruned_at.get(provider, float("-inf")) < HTTP_CACHE_PRUNE_SECONDS:
+                return
+            self._pruned_at[provider] = now
+        self.cache.prune(provider, max(ttl, self.config(provider)["ttl"]))
+
+
+_client: Optional[HttpClient] = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Process-wide client, created on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
@@ -1,8 +1,11 @@
 import os
-import requests
-import yfinance as yf
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
-from data.env_loader import load_env_keys
+from data.data_loader import load_env_keys
+from config.settings import ALPHA_VANTAGE_URL, POLYGON_DEFAULT_DAYS, POLYGON_PAGE_LIMIT, POLYGON_URL, POLYGON_WORKERS
+from utils.http_client import get_http_client
+from utils.metrics import http_span
 
 load_env_keys()
 
@@ -12,6 +15,8 @@ POLYGON_API_KEY = os.getenv("POLYGON_API_KEY")
 # --- YFinance: Stocks & Crypto ---
 def fetch_yfinance_data(symbol, period="1y", interval="1d"):
     try:
+        import yfinance as yf
+
         data = yf.download(symbol, period=period, interval=interval, progress=False)
         if data.empty:
             raise ValueError(f"No data from yfinance for {symbol}")
@@ -20,15 +25,56 @@ def fetch_yfinance_data(symbol, period="1y", interval="1d"):
         print(f"[YFinance ERROR] {symbol} - {e}")
         return pd.DataFrame()
 
+def fetch_yfinance_many(symbols, start=None, period="1y", interval="1d", threads=True):
+    """
+    One grouped yf.download for several symbols, split into a frame per symbol.
+    Symbols yfinance returned nothing for are left out.
+    """
+    symbols = [symbol.strip().upper() for symbol in symbols]
+    try:
+        import yfinance as yf
+
+        with http_span("yfinance_bulk"):
+            data = yf.download(
+                symbols,
+                start=start,
+                period=None if start else period,
+                interval=interval,
+                group_by="ticker",
+                threads=threads,
+                progress=False,
+            )
+    except Exception as e:
+        print(f"[YFinance ERROR] {', '.join(symbols)} - {e}")
+        return {}
+
+    if data is None or data.empty:
+        return {}
+    if not isinstance(data.columns, pd.MultiIndex):
+        return {symbols[0]: data}
+
+    frames = {}
+    for symbol in data.columns.get_level_values(0).unique():
+        df = data[symbol].dropna(how="all")
+        if not df.empty:
+            frames[symbol] = df
+    return frames
+
 # --- Alpha Vantage: Crypto ---
 def fetch_alpha_vantage_crypto(symbol="BTC", market="USD"):
     try:
-        url = (
-            f"https://www.alphavantage.co/query?function=DIGITAL_CURRENCY_DAILY"
-            f"&symbol={symbol}&market={market}&apikey={ALPHA_VANTAGE_API_KEY}"
+        # Pooled, rate-limited and cached: a refresh within the TTL never hits the API
+        data = get_http_client().get_json(
+            "alphavantage",
+            ALPHA_VANTAGE_URL,
+            params={
+                "function": "DIGITAL_CURRENCY_DAILY",
+                "symbol": symbol,
+                "market": market,
+                "apikey": ALPHA_VANTAGE_API_KEY,
+            },
+            ticker=symbol,
         )
-        response = requests.get(url)
-        data = response.json()
         key = "Time Series (Digital Currency Daily)"
         if key not in data:
             raise ValueError(f"Invalid data for {symbol}: {data}")
@@ -46,27 +92,90 @@ def fetch_alpha_vantage_crypto(symbol="BTC", market="USD"):
         return pd.DataFrame()
 
 # --- Polygon.io: Crypto ---
-def fetch_polygon_crypto(symbol="X:BTCUSD", timespan="day", limit=365):
+POLYGON_COLUMNS = {"t": "Date", "o": "Open", "h": "High", "l": "Low", "c": "Close", "v": "Volume"}
+# Bars per day for each Polygon timespan at multiplier 1 (crypto trades around the clock)
+POLYGON_BARS_PER_DAY = {
+    "second": 86400, "minute": 1440, "hour": 24, "day": 1,
+    "week": 1 / 7, "month": 1 / 30, "quarter": 1 / 91, "year": 1 / 365,
+}
+
+
+def polygon_chunks(start, end, timespan="day", multiplier=1, bars_per_chunk=POLYGON_PAGE_LIMIT):
+    """
+    Splits [start, end] into consecutive (start, end) date ranges of about
+    `bars_per_chunk` bars each.
+    """
+    start, end = pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize()
+    days = max(1, int(bars_per_chunk * multiplier / POLYGON_BARS_PER_DAY[timespan]))
+    chunks = []
+    while start <= end:
+        chunk_end = min(end, start + pd.Timedelta(days=days - 1))
+        chunks.append((start.strftime("%Y-%m-%d"), chunk_end.strftime("%Y-%m-%d")))
+        start = chunk_end + pd.Timedelta(days=1)
+    return chunks
+
+
+def _polygon_page_frame(results):
+    df = pd.DataFrame.from_records(results, columns=list(POLYGON_COLUMNS)).rename(columns=POLYGON_COLUMNS)
+    df["Date"] = pd.to_datetime(df["Date"], unit="ms")
+    return df.set_index("Date").sort_index()
+
+
+def _fetch_polygon_chunk(symbol, start, end, timespan, multiplier, limit):
+    """Every page of one chunk, following next_url; each page is kept as a frame, not JSON."""
+    client = get_http_client()
+    url = f"{POLYGON_URL}/v2/aggs/ticker/{symbol}/range/{multiplier}/{timespan}/{start}/{end}"
+    params = {"adjusted": "true", "sort": "asc", "limit": limit, "apiKey": POLYGON_API_KEY}
+    frames = []
+    while url:
+        # ttl=0: pages go straight into the price store, caching their JSON would only duplicate it on disk
+        data = client.get_json("polygon", url, params=params, ttl=0, ticker=symbol)
+        if data.get("results"):
+            frames.append(_polygon_page_frame(data["results"]))
+        # next_url carries the cursor and the query, but not the key
+        url = data.get("next_url")
+        params = {"apiKey": POLYGON_API_KEY}
+    return frames
+
+
+def iter_polygon_pages(
+    symbol="X:BTCUSD", start=None, end=None, timespan="day", multiplier=1,
+    limit=POLYGON_PAGE_LIMIT, workers=POLYGON_WORKERS
+):
+    """
+    Yields Polygon aggregates for [start, end] as OHLCV frames in time order,
+    one per page. The range is split into chunks fetched on `workers` threads
+    under the provider's rate limit; at most 2 * workers chunks are held at once.
+    """
+    end = pd.Timestamp(end) if end is not None else pd.Timestamp.today()
+    start = pd.Timestamp(start) if start is not None else end - pd.Timedelta(days=POLYGON_DEFAULT_DAYS)
+    chunks = polygon_chunks(start, end, timespan, multiplier, limit)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="polygon") as pool:
+        pending = deque()
+        for chunk_start, chunk_end in chunks:
+            pending.append(pool.submit(_fetch_polygon_chunk, symbol, chunk_start, chunk_end, timespan, multiplier, limit))
+            if len(pending) >= 2 * max(1, workers):
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def fetch_polygon_crypto(symbol="X:BTCUSD", timespan="day", start=None, end=None, multiplier=1, limit=POLYGON_PAGE_LIMIT):
     try:
-        url = (
-            f"https://api.polygon.io/v2/aggs/ticker/{symbol}/range/1/{timespan}/2023-01-01/2023-12-31"
-            f"?adjusted=true&sort=desc&limit={limit}&apiKey={POLYGON_API_KEY}"
-        )
-        response = requests.get(url)
-        data = response.json().get("results", [])
-        if not data:
+        frames = list(iter_polygon_pages(symbol, start, end, timespan, multiplier, limit))
+        if not frames:
             raise ValueError("No results returned from Polygon API")
-        df = pd.DataFrame(data)
-        df["t"] = pd.to_datetime(df["t"], unit="ms")
-        df.set_index("t", inplace=True)
-        return df.rename(columns={"o": "Open", "h": "High", "l": "Low", "c": "Close", "v": "Volume"})
+        df = pd.concat(frames)
+        return df[~df.index.duplicated(keep="last")]
     except Exception as e:
         print(f"[Polygon ERROR] {symbol} - {e}")
         return pd.DataFrame()
 
 # --- Unified Dispatcher ---
 def fetch_market_data(symbol, source="yfinance", type="stock", **kwargs):
-    symbol = symbol.strip().upper()
+    if isinstance(symbol, str):
+        symbol = symbol.strip().upper()
 
     # Smart detection for crypto ticker cleanup
     crypto_symbols_map = {
@@ -79,6 +188,10 @@ def fetch_market_data(symbol, source="yfinance", type="stock", **kwargs):
         "BNB-USD": "BNB",
     }
 
+    # A list of symbols is fetched as one grouped download, {symbol: frame}
+    if isinstance(symbol, (list, tuple)) and source == "yfinance":
+        return fetch_yfinance_many(symbol, **kwargs)
+
     if type == "stock":
         if source == "yfinance":
             return fetch_yfinance_data(symbol, **kwargs)
@@ -92,6 +205,6 @@ def fetch_market_data(symbol, source="yfinance", type="stock", **kwargs):
             return fetch_alpha_vantage_crypto(base_symbol, market="USD")
         elif source == "polygon":
             polygon_symbol = f"X:{symbol.replace('-USD', 'USD')}"
-            return fetch_polygon_crypto(symbol=polygon_symbol, timespan=kwargs.get("timespan", "day"))
+            return fetch_polygon_crypto(symbol=polygon_symbol, **kwargs)
 
     raise ValueError(f"[Market Data ERROR] Unsupported combination: {type}/{source}")
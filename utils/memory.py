@@ -0,0 +1,110 @@
+import os
+import threading
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config.settings import METRICS_ENABLED
+
+
+def frame_bytes(obj) -> int:
+    """Bytes held by a frame, series, array, or a dict/list of them (index included)."""
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True, deep=True).sum())
+    if isinstance(obj, pd.Series):
+        return int(obj.memory_usage(index=True, deep=True))
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    if isinstance(obj, dict):
+        return sum(frame_bytes(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return sum(frame_bytes(v) for v in obj)
+    return 0
+
+
+def lean_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    `df` with its float64 columns as float32. Other columns are not copied;
+    the float64 originals are freed once the caller drops `df`.
+    """
+    wide = [col for col, dtype in df.dtypes.items() if dtype == np.float64]
+    if not wide:
+        return df
+    return df.astype(dict.fromkeys(wide, np.float32))
+
+
+def rss_bytes() -> int:
+    """Resident set size of this process (0 where it cannot be read)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+
+        # Peak rather than current RSS; kilobytes on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if os.uname().sysname == "Darwin" else peak * 1024
+    except (ImportError, OSError, AttributeError):
+        return 0
+
+
+class MemoryReport:
+    """
+    Bytes of the frames each stage holds, per ticker:
+
+        memory.record("indicators", df, ticker="AAPL")
+
+    Only the latest size per (stage, ticker) is kept, so summary() shows what
+    one ticker costs at each stage and what the current tickers cost in total.
+    """
+
+    def __init__(self, enabled: bool = METRICS_ENABLED):
+        self.enabled = enabled
+        self._sizes: Dict[Tuple[str, str], int] = {}
+        self._peaks: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, obj, ticker: str = "") -> int:
+        if not self.enabled:
+            return 0
+        size = frame_bytes(obj)
+        with self._lock:
+            self._sizes[(stage, ticker.upper())] = size
+            self._peaks[stage] = max(self._peaks.get(stage, 0), size)
+        return size
+
+    def reset(self) -> None:
+        with self._lock:
+            self._sizes.clear()
+            self._peaks.clear()
+
+    def summary(self) -> pd.DataFrame:
+        """One row per stage: tickers seen, total, mean and largest MB per ticker."""
+        with self._lock:
+            sizes = dict(self._sizes)
+            peaks = dict(self._peaks)
+        columns = ["stage", "tickers", "total_mb", "mean_mb", "max_mb"]
+        if not sizes:
+            return pd.DataFrame(columns=columns)
+
+        by_stage: Dict[str, list] = {}
+        for (stage, _), size in sizes.items():
+            by_stage.setdefault(stage, []).append(size)
+        rows = [
+            {
+                "stage": stage,
+                "tickers": len(values),
+                "total_mb": round(sum(values) / 2**20, 2),
+                "mean_mb": round(sum(values) / len(values) / 2**20, 3),
+                "max_mb": round(peaks[stage] / 2**20, 3),
+            }
+            for stage, values in by_stage.items()
+        ]
+        return pd.DataFrame(rows, columns=columns).sort_values("stage").reset_index(drop=True)
+
+
+# Process-wide instance used by the dashboard
+memory = MemoryReport()
@@ -0,0 +1,198 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config.settings import METRICS_BUCKETS, METRICS_ENABLED, METRICS_PREFIX, METRICS_RECENT_SAMPLES
+
+LabelSet = Tuple[Tuple[str, str], ...]
+
+# Returned by span() while metrics are disabled: entering it does nothing
+_NO_SPAN = nullcontext()
+
+
+class _Series:
+    """One histogram series: Prometheus-style buckets plus a window of recent samples."""
+
+    __slots__ = ("buckets", "count", "total", "max", "errors", "recent")
+
+    def __init__(self, n_buckets: int, recent: int):
+        self.buckets = [0] * (n_buckets + 1)  # last slot is +Inf
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.errors = 0
+        self.recent = deque(maxlen=recent)
+
+
+class Metrics:
+    """
+    Span timings aggregated into histograms per (family, stage, labels).
+
+        with metrics.span("lstm", ticker="AAPL"):
+            ...
+        with metrics.span("newsapi", family="http", ticker="AAPL"):
+            requests.get(...)
+
+    Families become Prometheus metrics named {prefix}_{family}_seconds. When
+    disabled, span() hands back a shared no-op context manager.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = METRICS_ENABLED,
+        buckets: Tuple[float, ...] = METRICS_BUCKETS,
+        prefix: str = METRICS_PREFIX,
+        recent: int = METRICS_RECENT_SAMPLES
+    ):
+        self.enabled = enabled
+        self.buckets = tuple(sorted(buckets))
+        self.prefix = prefix
+        self.recent = recent
+        self._series: Dict[Tuple[str, str, LabelSet], _Series] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, seconds: float, family: str = "stage", error: bool = False, **labels) -> None:
+        key = (family, stage, tuple(sorted((k, str(v)) for k, v in labels.items())))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series(len(self.buckets), self.recent)
+            series.buckets[bisect_left(self.buckets, seconds)] += 1
+            series.count += 1
+            series.total += seconds
+            series.max = max(series.max, seconds)
+            series.errors += error
+            series.recent.append(seconds)
+
+    @contextmanager
+    def _span(self, stage: str, family: str, labels: Dict) -> Iterator[None]:
+        start = time.perf_counter()
+        error = False
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            self.observe(stage, time.perf_counter() - start, family, error, **labels)
+
+    def span(self, stage: str, family: str = "stage", **labels):
+        if not self.enabled:
+            return _NO_SPAN
+        return self._span(stage, family, labels)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    # --- Reporting ---
+    def summary(self) -> pd.DataFrame:
+        """One row per series with count, errors, mean and recent p50/p95/max in milliseconds."""
+        with self._lock:
+            items = [(key, s.count, s.errors, s.total, s.max, list(s.recent)) for key, s in self._series.items()]
+        rows = []
+        for (family, stage, labels), count, errors, total, max_seconds, recent in items:
+            p50, p95 = np.percentile(recent, [50, 95]) if recent else (np.nan, np.nan)
+            rows.append({
+                "family": family,
+                "stage": stage,
+                **dict(labels),
+                "count": count,
+                "errors": errors,
+                "mean_ms": round(total / count * 1000, 2),
+                "p50_ms": round(p50 * 1000, 2),
+                "p95_ms": round(p95 * 1000, 2),
+                "max_ms": round(max_seconds * 1000, 2),
+            })
+        if not rows:
+            return pd.DataFrame(columns=["family", "stage", "count", "errors", "mean_ms", "p50_ms", "p95_ms", "max_ms"])
+        return pd.DataFrame(rows).sort_values(["family", "stage"]).reset_index(drop=True)
+
+    def to_prometheus(self) -> str:
+        """All series in the Prometheus text exposition format."""
+        with self._lock:
+            items = sorted(
+                ((key, list(s.buckets), s.count, s.total, s.errors) for key, s in self._series.items()),
+                key=lambda item: item[0]
+            )
+
+        lines: List[str] = []
+        families = sorted({key[0] for key, *_ in items})
+        for family in families:
+            name = f"{self.prefix}_{family}_seconds"
+            lines.append(f"# HELP {name} Time spent per {family} span.")
+            lines.append(f"# TYPE {name} histogram")
+            errors: List[str] = []
+            for (fam, stage, labels), buckets, count, total, n_errors in items:
+                if fam != family:
+                    continue
+                label_text = ",".join(
+                    f'{k}="{_escape(v)}"' for k, v in (("stage", stage),) + labels
+                )
+                cumulative = 0
+                for bound, n in zip(self.buckets + (float("inf"),), buckets):
+                    cumulative += n
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{name}_bucket{{{label_text},le="{le}"}} {cumulative}')
+                lines.append(f"{name}_sum{{{label_text}}} {total!r}")
+                lines.append(f"{name}_count{{{label_text}}} {count}")
+                errors.append(f"{self.prefix}_{family}_errors_total{{{label_text}}} {n_errors}")
+            lines.append(f"# HELP {self.prefix}_{family}_errors_total Spans that raised, per {family}.")
+            lines.append(f"# TYPE {self.prefix}_{family}_errors_total counter")
+            lines.extend(errors)
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        """Writes the exposition text to a file, e.g. for node_exporter's textfile collector."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path + ".tmp", "w") as f:
+            f.write(self.to_prometheus())
+        os.replace(path + ".tmp", path)
+
+    def serve(self, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """Serves /metrics on a daemon thread and returns the server."""
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip("/") != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.to_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+        return server
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Process-wide instance used by the dashboard and the HTTP clients
+metrics = Metrics()
+
+
+def span(stage: str, family: str = "stage", **labels):
+    return metrics.span(stage, family, **labels)
+
+
+def http_span(provider: str, **labels):
+    """Span for one outbound HTTP call."""
+    return metrics.span(provider, "http", **labels)
@@ -1,30 +1,36 @@
 import os
-import requests
 from data.data_loader import load_env_keys
+from config.settings import GNEWS_URL, NEWSAPI_URL
+from utils.http_client import get_http_client
 
 load_env_keys()
 
 NEWS_API_KEY = os.getenv("NEWS_API_KEY")
 GNEWS_API_KEY = os.getenv("GNEWS_API_KEY")
 
+def newsapi_params(query, language="en", page_size=5):
+    return {"q": query, "language": language, "sortBy": "publishedAt", "pageSize": page_size, "apiKey": NEWS_API_KEY}
+
+def gnews_params(query, lang="en", max_articles=5):
+    return {"q": query, "lang": lang, "max": max_articles, "token": GNEWS_API_KEY}
+
+def parse_articles(data):
+    return [
+        {
+            "title": article["title"],
+            "url": article["url"],
+            "publishedAt": article["publishedAt"]
+        }
+        for article in data.get("articles", [])
+    ]
+
 # --- NewsAPI ---
 def fetch_newsapi_articles(query, language="en", page_size=5):
     try:
-        url = (
-            f"https://newsapi.org/v2/everything?q={query}&language={language}"
-            f"&sortBy=publishedAt&pageSize={page_size}&apiKey={NEWS_API_KEY}"
+        data = get_http_client().get_json(
+            "newsapi", NEWSAPI_URL, params=newsapi_params(query, language, page_size), ticker=query
         )
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
-        return [
-            {
-                "title": article["title"],
-                "url": article["url"],
-                "publishedAt": article["publishedAt"]
-            }
-            for article in data.get("articles", [])
-        ]
+        return parse_articles(data)
     except Exception as e:
         print(f"[NewsAPI ERROR] {query} - {e}")
         return []
@@ -32,21 +38,10 @@ def fetch_newsapi_articles(query, language="en", page_size=5):
 # --- GNews (Fallback) ---
 def fetch_gnews_articles(query, lang="en", max_articles=5):
     try:
-        url = (
-            f"https://gnews.io/api/v4/search?q={query}&lang={lang}"
-            f"&max={max_articles}&token={GNEWS_API_KEY}"
+        data = get_http_client().get_json(
+            "gnews", GNEWS_URL, params=gnews_params(query, lang, max_articles), ticker=query
         )
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
-        return [
-            {
-                "title": article["title"],
-                "url": article["url"],
-                "publishedAt": article["publishedAt"]
-            }
-            for article in data.get("articles", [])
-        ]
+        return parse_articles(data)
     except Exception as e:
         print(f"[GNews ERROR] {query} - {e}")
         return []
@@ -0,0 +1,111 @@
+"""
+Dashboard cold-start tooling.
+
+    python -m utils.startup                # per-package import cost of app.py's imports
+    python -m utils.startup --budget 2.0   # exit 1 if the imports take longer
+
+Heavy libraries (TensorFlow/Keras, Prophet, scikit-learn, matplotlib,
+yfinance, tweepy) are imported where they are first used. prewarm() can load
+them in a background thread once the first page has rendered, so the first
+forecast does not pay for them either.
+"""
+import argparse
+import ast
+import os
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config.settings import PREWARM_MODULES, STARTUP_IMPORT_BUDGET_SECONDS
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+# Seconds spent importing each module by prewarm()
+prewarm_timings: Dict[str, float] = {}
+
+
+def prewarm(modules: Iterable[str] = PREWARM_MODULES) -> threading.Thread:
+    """
+    Imports `modules` on a daemon thread and returns it. Failures are printed
+    and skipped; the module is then imported (and fails) at first real use.
+    """
+    def run():
+        import importlib
+
+        for name in modules:
+            start = time.perf_counter()
+            try:
+                importlib.import_module(name)
+            except Exception as e:
+                print(f"[Prewarm ERROR] {name} - {e}")
+                continue
+            prewarm_timings[name] = round(time.perf_counter() - start, 3)
+
+    thread = threading.Thread(target=run, name="prewarm", daemon=True)
+    thread.start()
+    return thread
+
+
+def app_imports(path: str = APP_PATH) -> List[str]:
+    """Modules app.py imports at top level, in order."""
+    with open(path) as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+            modules.append(node.module)
+    return list(dict.fromkeys(modules))
+
+
+def measure_imports(modules: Iterable[str], cwd: Optional[str] = None) -> Tuple[float, Dict[str, float]]:
+    """
+    Imports `modules` in a fresh interpreter with -X importtime.
+    Returns (total seconds, self time per top-level package in seconds).
+    """
+    modules = list(modules)
+    code = "; ".join(f"import {name}" for name in modules)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=cwd or os.path.dirname(APP_PATH),
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+
+    per_package: Dict[str, float] = defaultdict(float)
+    total = 0.0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        package = name.strip().split(".")[0]
+        per_package[package] += int(self_us) / 1e6
+        # One leading space is the column separator; deeper imports are indented further
+        if not name[1:].startswith(" "):
+            total += int(cumulative_us) / 1e6
+    return total, dict(per_package)
+
+
+def startup_report(budget: float = STARTUP_IMPORT_BUDGET_SECONDS, top: int = 15) -> bool:
+    """Prints the import cost breakdown for app.py and returns whether it is within budget."""
+    modules = app_imports()
+    total, per_package = measure_imports(modules)
+    print(f"app.py imports {len(modules)} modules in {total:.2f}s (budget {budget:.2f}s)")
+    print(f"{'package':<24} {'seconds':>8} {'share':>6}")
+    for package, seconds in sorted(per_package.items(), key=lambda item: -item[1])[:top]:
+        print(f"{package:<24} {seconds:>8.3f} {seconds / total:>6.0%}")
+    return total <= budget
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget", type=float, default=STARTUP_IMPORT_BUDGET_SECONDS)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+    sys.exit(0 if startup_report(args.budget, args.top) else 1)
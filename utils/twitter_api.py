@@ -1,6 +1,5 @@
 import os
-import tweepy
-from data.env_loader import load_env_keys
+from data.data_loader import load_env_keys
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 
 load_env_keys()
@@ -8,11 +7,21 @@ load_env_keys()
 TWITTER_BEARER_TOKEN = os.getenv("TWITTER_BEARER_TOKEN")
 
 # --- Tweepy client setup ---
-try:
-    twitter_client = tweepy.Client(bearer_token=TWITTER_BEARER_TOKEN)
-except Exception as e:
-    print(f"[Twitter AUTH ERROR] {e}")
-    twitter_client = None
+# Built on first use so importing this module stays cheap
+_twitter_client = None
+_twitter_client_ready = False
+
+def get_twitter_client():
+    global _twitter_client, _twitter_client_ready
+    if not _twitter_client_ready:
+        try:
+            import tweepy
+            _twitter_client = tweepy.Client(bearer_token=TWITTER_BEARER_TOKEN)
+        except Exception as e:
+            print(f"[Twitter AUTH ERROR] {e}")
+            _twitter_client = None
+        _twitter_client_ready = True
+    return _twitter_client
 
 # --- Sentiment Analyzer ---
 sentiment_analyzer = SentimentIntensityAnalyzer()
@@ -23,6 +32,7 @@ def analyze_sentiment(text):
 
 # --- Tweet Search ---
 def fetch_recent_tweets(query, max_results=5):
+    twitter_client = get_twitter_client()
     if not twitter_client:
         return []
     try:
@@ -46,6 +56,7 @@ def fetch_recent_tweets(query, max_results=5):
 
 # --- User Tweet Fetcher ---
 def fetch_user_tweets(username, max_results=5):
+    twitter_client = get_twitter_client()
     if not twitter_client:
         return []
     try: